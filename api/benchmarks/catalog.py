@@ -0,0 +1,163 @@
+"""Catalog reads from SQLite vs the memory-mapped snapshot, and memory per worker as workers are added.
+
+Seeds a database file with `--products` products, builds the snapshot once, then:
+- times find_by_id and find_all through the repositories, with and without the snapshot;
+- starts N worker processes that each either keep their own copy of the catalog (a
+  per-worker cache) or map the snapshot and read every row, and reports the memory that
+  costs per worker (private) and in total (proportional set size, shared pages split
+  between the processes mapping them).
+
+Usage: python -m benchmarks.catalog [--products 100000] [--workers 1,2,4,8]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from src.db import catalog
+from src.db.connection import DatabaseConnection, connect
+from src.db.migrate import MigrationRunner
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    conn = connect(path)
+    conn.row_factory = sqlite3.Row
+    DatabaseConnection.use_connection(conn)
+    return conn
+
+
+def seed(path: str, products: int) -> None:
+    conn = open_database(path)
+    MigrationRunner().run_migrations()
+    rng = random.Random(50)
+    conn.executemany(
+        "INSERT INTO suppliers (supplier_id, name, contact_person, email) VALUES (?, ?, ?, ?)",
+        ((i, f"Supplier {i}", f"Contact {i}", f"s{i}@example.com") for i in range(1, 501)),
+    )
+    conn.executemany(
+        "INSERT INTO products (supplier_id, name, description, price, sku, unit, img_name, discount) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                rng.randint(1, 500), f"Product {i}", "Smart cat gadget " * rng.randint(2, 12),
+                round(rng.uniform(1, 500), 2), f"SKU-{i:07d}", "piece", f"product-{i}.png", rng.choice((0.0, 0.1, None)),
+            )
+            for i in range(products)
+        ),
+    )
+    conn.commit()
+
+
+def memory_kib() -> dict[str, int]:
+    """Private and proportional memory of this process (Linux /proc/self/smaps_rollup)."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Pss", "Private_Clean", "Private_Dirty"):
+                values[key] = int(rest.split()[0])
+    return {"private": values["Private_Clean"] + values["Private_Dirty"], "pss": values["Pss"]}
+
+
+def worker(mode: str, database: str, snapshot_path: str, barrier, results) -> None:
+    open_database(database)
+    from src.repositories.products_repo import get_products_repository
+
+    before = memory_kib()
+    repo = get_products_repository()
+    if mode == "cache":
+        kept = repo.find_all()
+    else:
+        catalog.enable_catalog(snapshot_path)
+        table = catalog.catalog_table("products")
+        # Read every row once so all of the snapshot's pages are mapped into this process
+        for id_value in range(1, table.size + 1):
+            table.get(id_value)
+        kept = table
+    # Measure while every worker holds its catalog, so shared pages are split between them
+    barrier.wait()
+    after = memory_kib()
+    barrier.wait()
+    results.put({key: after[key] - before[key] for key in after})
+    del kept
+
+
+def measure_workers(mode: str, workers: int, database: str, snapshot_path: str) -> dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, database, snapshot_path, barrier, results)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "private_mib": statistics.fmean(r["private"] for r in reports) / 1024,
+        "total_pss_mib": sum(r["pss"] for r in reports) / 1024,
+    }
+
+
+def per_call_us(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = parser.parse_args()
+    worker_counts = [int(count) for count in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        snapshot_path = os.path.join(directory, "bench.catalog")
+        seed(database, args.products)
+
+        from src.repositories.products_repo import get_products_repository
+
+        repo = get_products_repository()
+        ids = [random.randint(1, args.products) for _ in range(20_000)]
+        lookups = iter(ids * 10)
+        sql_by_id = per_call_us(lambda: repo.find_by_id(next(lookups)), len(ids))
+        sql_all = per_call_us(repo.find_all, 5) / 1000
+
+        store = catalog.enable_catalog(snapshot_path)
+        started = time.perf_counter()
+        store.rebuild()
+        build = time.perf_counter() - started
+        size = os.path.getsize(snapshot_path) / 2**20
+        snapshot_by_id = per_call_us(lambda: repo.find_by_id(next(lookups)), len(ids))
+        snapshot_all = per_call_us(repo.find_all, 5) / 1000
+        catalog.disable_catalog()
+        DatabaseConnection.close()
+
+        print(f"{args.products} products: snapshot {size:.1f} MiB, built in {build:.2f}s")
+        print(f"  {'':<10} {'find_by_id µs':>14} {'find_all ms':>12}")
+        print(f"  {'sqlite':<10} {sql_by_id:14.1f} {sql_all:12.0f}")
+        print(f"  {'snapshot':<10} {snapshot_by_id:14.1f} {snapshot_all:12.0f}")
+        print()
+
+        print("Catalog memory per worker / total across workers (MiB):")
+        print(f"  {'workers':>7} {'own copy':>18} {'mapped snapshot':>18}")
+        for workers in worker_counts:
+            cache = measure_workers("cache", workers, database, snapshot_path)
+            mapped = measure_workers("snapshot", workers, database, snapshot_path)
+            print(
+                f"  {workers:>7} {cache['private_mib']:8.1f} / {cache['total_pss_mib']:7.1f}"
+                f" {mapped['private_mib']:8.1f} / {mapped['total_pss_mib']:7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
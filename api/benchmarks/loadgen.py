@@ -0,0 +1,351 @@
+"""Mixed-workload load generator and capacity report for the supply-chain API.
+
+Replays whole user flows rather than single endpoints: `browse` reads the catalogue, `order`
+places an order with its details, books a delivery, links the two and moves both statuses
+along. Sessions arrive open-loop (Poisson) at each rate of a sweep, so a slow server does not
+slow the arrivals down; sessions that would exceed --concurrency are dropped and counted.
+
+For each step the report gives achieved request throughput, p50/p99 latency, error and 503
+rates, and the write-lock wait and queue scraped from /metrics. The capacity is the highest
+throughput whose p99 stays under --slo-ms with errors under --max-error-rate.
+
+Usage:
+    python -m benchmarks.loadgen [--rates 5,10,20,40] [--duration 10] [--mix browse=8,order=2]
+    python -m benchmarks.loadgen --url http://127.0.0.1:3000 --rates 20,40,80
+
+Without --url the app runs in this process against a fresh seeded database file; the
+generator then shares the event loop with the server, so prefer --url for absolute numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+
+import httpx
+
+# Mean write-lock wait above which a step counts as lock-saturated
+LOCK_SATURATION_WAIT_MS = 5.0
+METRICS_POLL_SECONDS = 0.25
+
+
+@dataclass
+class Catalogue:
+    """Ids the flows pick from, read from the API before the sweep."""
+
+    product_ids: list[int]
+    branch_ids: list[int]
+    supplier_ids: list[int]
+
+
+@dataclass
+class StepResult:
+    rate: float
+    elapsed: float = 0.0
+    sessions: int = 0
+    dropped: int = 0
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Counter = field(default_factory=Counter)
+    lock_wait_ms: float = 0.0
+    peak_waiting_writers: float = 0.0
+    shed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float, label: str | None = None) -> float:
+        values = self.latencies[label] if label else [v for vs in self.latencies.values() for v in vs]
+        if len(values) < 2:
+            return values[0] if values else 0.0
+        return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+    @property
+    def error_rate(self) -> float:
+        errors = sum(count for status, count in self.statuses.items() if status >= 400)
+        return errors / self.requests if self.requests else 0.0
+
+    @property
+    def unavailable_rate(self) -> float:
+        return self.statuses[503] / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rate": self.rate,
+            "sessions": self.sessions,
+            "dropped": self.dropped,
+            "requests": self.requests,
+            "rps": round(self.rps, 1),
+            "p50Ms": round(self.percentile(50), 1),
+            "p99Ms": round(self.percentile(99), 1),
+            "errorRate": round(self.error_rate, 4),
+            "unavailableRate": round(self.unavailable_rate, 4),
+            "lockWaitMs": round(self.lock_wait_ms, 2),
+            "peakWaitingWriters": self.peak_waiting_writers,
+            "shed": self.shed,
+            "statuses": dict(self.statuses),
+            "p99MsByRequest": {label: round(self.percentile(99, label), 1) for label in sorted(self.latencies)},
+        }
+
+
+class Session:
+    """One simulated user; records every response of its flow into the step."""
+
+    def __init__(self, client: httpx.AsyncClient, step: StepResult):
+        self.client = client
+        self.step = step
+
+    async def call(self, label: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.step.statuses[599] += 1
+            return None
+        self.step.latencies[label].append((time.perf_counter() - started) * 1000)
+        self.step.statuses[response.status_code] += 1
+        return response if response.is_success else None
+
+
+async def browse(session: Session, catalogue: Catalogue) -> None:
+    await session.call("GET /products", "GET", "/api/products")
+    for product_id in random.sample(catalogue.product_ids, k=min(3, len(catalogue.product_ids))):
+        await session.call("GET /products/{id}", "GET", f"/api/products/{product_id}")
+    await session.call("GET /suppliers/{id}", "GET", f"/api/suppliers/{random.choice(catalogue.supplier_ids)}")
+
+
+async def order(session: Session, catalogue: Catalogue) -> None:
+    today = time.strftime("%Y-%m-%d")
+    await session.call("GET /products", "GET", "/api/products")
+    created = await session.call(
+        "POST /orders", "POST", "/api/orders",
+        json={"branchId": random.choice(catalogue.branch_ids), "orderDate": today, "name": "Load test order"},
+    )
+    if created is None:
+        return
+    order_id = created.json()["orderId"]
+
+    detail_ids = []
+    for product_id in random.sample(catalogue.product_ids, k=min(random.randint(1, 4), len(catalogue.product_ids))):
+        detail = await session.call(
+            "POST /order-details", "POST", "/api/order-details",
+            json={"orderId": order_id, "productId": product_id, "quantity": random.randint(1, 20), "unitPrice": 9.99},
+        )
+        if detail is None:
+            return
+        detail_ids.append(detail.json()["orderDetailId"])
+
+    delivery = await session.call(
+        "POST /deliveries", "POST", "/api/deliveries",
+        json={"supplierId": random.choice(catalogue.supplier_ids), "deliveryDate": today, "name": "Load test delivery"},
+    )
+    if delivery is None:
+        return
+    delivery_id = delivery.json()["deliveryId"]
+
+    for detail_id in detail_ids:
+        await session.call(
+            "POST /order-detail-deliveries", "POST", "/api/order-detail-deliveries",
+            json={"orderDetailId": detail_id, "deliveryId": delivery_id, "quantity": 1},
+        )
+
+    await session.call("POST /orders/status", "POST", "/api/orders/status", json={"status": "processing", "ids": [order_id]})
+    await session.call(
+        "POST /deliveries/status", "POST", "/api/deliveries/status", json={"status": "in_transit", "ids": [delivery_id]}
+    )
+    await session.call("GET /orders/{id}", "GET", f"/api/orders/{order_id}")
+
+
+SCENARIOS: dict[str, Callable[[Session, Catalogue], Awaitable[None]]] = {"browse": browse, "order": order}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+_METRIC_LINE = re.compile(r"^(\w+)(?:\{[^}]*\})? ([0-9.eE+-]+)$")
+
+
+async def scrape(client: httpx.AsyncClient) -> dict[str, float]:
+    """Sum each metric across its labels; missing metrics read as 0."""
+    values: dict[str, float] = defaultdict(float)
+    try:
+        response = await client.get("/metrics")
+    except httpx.HTTPError:
+        return values
+    for line in response.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            values[match[1]] += float(match[2])
+    return values
+
+
+async def load_catalogue(client: httpx.AsyncClient) -> Catalogue:
+    async def ids(path: str, key: str) -> list[int]:
+        response = await client.get(path)
+        response.raise_for_status()
+        found = [item[key] for item in response.json()]
+        if not found:
+            raise SystemExit(f"{path} returned no rows; seed the database first")
+        return found
+
+    return Catalogue(
+        product_ids=await ids("/api/products", "productId"),
+        branch_ids=await ids("/api/branches", "branchId"),
+        supplier_ids=await ids("/api/suppliers", "supplierId"),
+    )
+
+
+async def run_step(
+    client: httpx.AsyncClient, catalogue: Catalogue, rate: float, duration: float, mix: dict[str, float], concurrency: int
+) -> StepResult:
+    step = StepResult(rate=rate)
+    scenarios, weights = zip(*mix.items(), strict=True)
+    in_flight: set[asyncio.Task] = set()
+    before = await scrape(client)
+
+    async def poll_queue() -> None:
+        while True:
+            waiting = (await scrape(client))["db_waiting_writers"]
+            step.peak_waiting_writers = max(step.peak_waiting_writers, waiting)
+            await asyncio.sleep(METRICS_POLL_SECONDS)
+
+    poller = asyncio.create_task(poll_queue())
+    started = time.perf_counter()
+    next_arrival = started
+    while next_arrival < started + duration:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        if len(in_flight) >= concurrency:
+            step.dropped += 1
+        else:
+            scenario = SCENARIOS[random.choices(scenarios, weights)[0]]
+            task = asyncio.create_task(scenario(Session(client, step), catalogue))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            step.sessions += 1
+        next_arrival += random.expovariate(rate)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    step.elapsed = time.perf_counter() - started
+    poller.cancel()
+
+    after = await scrape(client)
+    waits = after["db_write_lock_wait_seconds_count"] - before["db_write_lock_wait_seconds_count"]
+    if waits:
+        wait_sum = after["db_write_lock_wait_seconds_sum"] - before["db_write_lock_wait_seconds_sum"]
+        step.lock_wait_ms = wait_sum / waits * 1000
+    step.shed = after["admission_shed_total"] - before["admission_shed_total"]
+    return step
+
+
+def capacity(steps: list[StepResult], slo_ms: float, max_error_rate: float) -> dict:
+    sustainable = [
+        step for step in steps if step.percentile(99) <= slo_ms and step.error_rate <= max_error_rate and not step.dropped
+    ]
+    saturated = next((step for step in steps if step.lock_wait_ms >= LOCK_SATURATION_WAIT_MS), None)
+    return {
+        "sloP99Ms": slo_ms,
+        "maxSustainableRps": round(max((step.rps for step in sustainable), default=0.0), 1),
+        "maxSustainableSessionRate": max((step.rate for step in sustainable), default=0.0),
+        "writeLockSaturatesAtRate": saturated.rate if saturated else None,
+    }
+
+
+def print_report(steps: list[StepResult], summary: dict) -> None:
+    print(
+        f"{'rate/s':>7} {'sessions':>8} {'dropped':>7} {'req/s':>7} {'p50 ms':>7} {'p99 ms':>7} "
+        f"{'errors':>7} {'503':>6} {'lock ms':>8} {'queue':>6}"
+    )
+    for step in steps:
+        print(
+            f"{step.rate:>7g} {step.sessions:>8} {step.dropped:>7} {step.rps:>7.1f} {step.percentile(50):>7.1f} "
+            f"{step.percentile(99):>7.1f} {step.error_rate:>7.2%} {step.unavailable_rate:>6.2%} "
+            f"{step.lock_wait_ms:>8.2f} {step.peak_waiting_writers:>6g}"
+        )
+
+    worst = steps[-1]
+    print("\nSlowest requests (p99 ms) at the last step:")
+    for label in sorted(worst.latencies, key=lambda label: -worst.percentile(99, label))[:5]:
+        print(f"  {label:<32} {worst.percentile(99, label):8.1f}")
+
+    print(f"\nMax sustainable throughput at p99 <= {summary['sloP99Ms']:g} ms: {summary['maxSustainableRps']} req/s "
+          f"({summary['maxSustainableSessionRate']:g} sessions/s)")
+    saturated = summary["writeLockSaturatesAtRate"]
+    print(
+        f"Write lock saturates at: {f'{saturated:g} sessions/s' if saturated else 'not reached'}"
+        f" (mean wait >= {LOCK_SATURATION_WAIT_MS:g} ms)"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with AsyncExitStack() as stack:
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        else:
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            os.environ["DATABASE_PATH"] = os.path.join(directory, "loadgen.db")
+            from src.main import create_app
+
+            app = create_app()
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=30)
+        await stack.enter_async_context(client)
+
+        catalogue = await load_catalogue(client)
+        steps = []
+        for rate in args.rates:
+            step = await run_step(client, catalogue, rate, args.duration, args.mix, args.concurrency)
+            steps.append(step)
+            print(f"  {rate:g} sessions/s: {step.rps:.1f} req/s, p99 {step.percentile(99):.1f} ms", flush=True)
+            if step.dropped and step.percentile(99) > args.slo_ms:
+                # Past the knee: higher rates only queue more
+                break
+
+    summary = capacity(steps, args.slo_ms, args.max_error_rate)
+    print()
+    print_report(steps, summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({**summary, "steps": [step.as_dict() for step in steps]}, f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server; default runs the app in-process")
+    parser.add_argument("--rates", type=lambda v: [float(r) for r in v.split(",")], default=[5, 10, 20, 40],
+                        help="session arrival rates per second to sweep")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per rate")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("browse=8,order=2"))
+    parser.add_argument("--concurrency", type=int, default=64, help="max sessions in flight")
+    parser.add_argument("--slo-ms", type=float, default=250.0, help="p99 latency objective")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
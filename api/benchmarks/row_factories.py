@@ -0,0 +1,105 @@
+"""Memory and time per 100k rows for each way of shaping query results.
+
+Usage: python -m benchmarks.row_factories [--rows 100000]
+"""
+
+import argparse
+import gc
+import sqlite3
+import time
+import tracemalloc
+
+from src.db.connection import connect
+from src.db.rows import build_rows
+
+SUPPLIER_COLUMNS = (
+    "supplier_id, name, description, contact_person, email, phone, "
+    'active AS "active [bool]", verified AS "verified [bool]"'
+)
+
+
+def create_database(rows: int) -> sqlite3.Connection:
+    conn = connect(":memory:")
+    conn.execute(
+        "CREATE TABLE suppliers (supplier_id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT, "
+        "contact_person TEXT, email TEXT, phone TEXT, active INTEGER NOT NULL DEFAULT 1, "
+        "verified INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.executemany(
+        "INSERT INTO suppliers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (i, f"Supplier {i}", f"Description {i}", f"Contact {i}", f"s{i}@example.com", f"555-{i:05d}", i % 2, i % 3 == 0)
+            for i in range(1, rows + 1)
+        ),
+    )
+    conn.commit()
+    return conn
+
+
+def legacy_dicts(conn: sqlite3.Connection) -> list[dict]:
+    # Previous path: sqlite3.Row -> dict in fetch_all, then a second dict in SuppliersRepository._row_to_dict
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    rows = [dict(row) for row in cursor.execute("SELECT * FROM suppliers").fetchall()]
+    result = []
+    for row in rows:
+        copy = dict(row)
+        copy["active"] = bool(copy["active"])
+        copy["verified"] = bool(copy["verified"])
+        result.append(copy)
+    return result
+
+
+def shaped(row_format: str):
+    def run(conn: sqlite3.Connection):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {SUPPLIER_COLUMNS} FROM suppliers")
+        return build_rows(cursor, cursor.fetchall(), row_format, "suppliers")
+
+    return run
+
+
+STRATEGIES = {
+    "legacy (Row -> dict -> dict)": legacy_dicts,
+    "dict": shaped("dict"),
+    "tuple (shared index)": shaped("tuple"),
+    "record (namedtuple)": shaped("record"),
+}
+
+
+def measure(conn: sqlite3.Connection, strategy) -> tuple[int, int, float]:
+    # Timed without tracemalloc, which slows allocation-heavy code several times over
+    gc.collect()
+    started = time.perf_counter()
+    result = strategy(conn)
+    elapsed = time.perf_counter() - started
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = strategy(conn)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    conn = create_database(args.rows)
+    scale = 100_000 / args.rows
+
+    print(f"{'strategy':<30} {'retained MiB':>13} {'peak MiB':>10} {'ms':>8}   (per 100k rows)")
+    for name, strategy in STRATEGIES.items():
+        retained, peak, elapsed = measure(conn, strategy)
+        print(
+            f"{name:<30} {retained * scale / 2**20:>13.1f} {peak * scale / 2**20:>10.1f} {elapsed * scale * 1000:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Latency of /api/search queries (exact, misspelled, contact, no match) over a large directory.
+
+Builds a migrated in-memory database with `--rows` synthetic suppliers, headquarters and
+branches (a third each) and times SearchRepository.search, the same call the route makes.
+
+Usage: python -m benchmarks.search [--rows 60000] [--repeat 200]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+
+from src.db.connection import DatabaseConnection, connect
+from src.db.migrate import MigrationRunner
+from src.repositories.search_repo import get_search_repository
+
+# Pronounceable made-up words, so names share trigrams about as much as real company names do
+SYLLABLES = tuple(c + v for c in "bcdfghklmnprstvwz" for v in "aeiou") + ("purr", "whisk", "paw", "meow", "tabby")
+SUFFIXES = ("Systems", "Supplies", "Labs", "Works", "Trading", "Branch", "Group", "Outlet")
+FIRST_NAMES = (
+    "Felix", "Tabitha", "Chloe", "Oscar", "Luna", "Milo", "Nala", "Simba", "Cleo", "Jasper",
+    "Ada", "Grace", "Linus", "Margaret", "Ken", "Barbara", "Dennis", "Frances", "Guido", "Radia",
+)
+
+QUERIES = {
+    "exact name": "Meowtown Kibble Works",
+    "misspelled name": "meowtonw kibbel",
+    "contact": "tabitha pawson",
+    "short": "tun",
+    "no match": "xylophone",
+}
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _name(rng: random.Random) -> str:
+    return f"{_word(rng)} {rng.choice(SUFFIXES)}"
+
+
+def create_database(rows: int) -> sqlite3.Connection:
+    conn = connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    DatabaseConnection.use_connection(conn)
+    MigrationRunner().run_migrations()
+
+    rng = random.Random(49)
+    per_table = rows // 3
+
+    def contact() -> tuple[str, str]:
+        first = rng.choice(FIRST_NAMES)
+        last = _word(rng)
+        return f"{first} {last}", f"{first.lower()}.{last.lower()}@example.com"
+
+    conn.executemany(
+        "INSERT INTO suppliers (name, contact_person, email) VALUES (?, ?, ?)",
+        ((_name(rng), *contact()) for i in range(per_table)),
+    )
+    conn.executemany(
+        "INSERT INTO headquarters (name, contact_person, email) VALUES (?, ?, ?)",
+        ((_name(rng) + " HQ", *contact()) for i in range(per_table)),
+    )
+    conn.executemany(
+        "INSERT INTO branches (headquarters_id, name, contact_person, email) VALUES (?, ?, ?, ?)",
+        ((1 + i % per_table, _name(rng), *contact()) for i in range(per_table)),
+    )
+    conn.execute("INSERT INTO suppliers (name, contact_person) VALUES ('Meowtown Kibble Works', 'Tabitha Pawson')")
+    conn.commit()
+    return conn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=60_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    create_database(args.rows)
+    print(f"Indexed {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    repo = get_search_repository()
+    print(f"  {'query':<16} {'q':<24} {'results':>7} {'p50 ms':>7} {'p99 ms':>7}  top result")
+    for label, q in QUERIES.items():
+        timings = []
+        for _ in range(args.repeat):
+            query_started = time.perf_counter()
+            results = repo.search(q)
+            timings.append(time.perf_counter() - query_started)
+        p50 = statistics.median(timings) * 1e3
+        p99 = statistics.quantiles(timings, n=100)[98] * 1e3
+        top = results[0]["name"] if results else "-"
+        print(f"  {label:<16} {q:<24} {len(results):>7} {p50:7.2f} {p99:7.2f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
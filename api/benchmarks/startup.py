@@ -0,0 +1,73 @@
+"""Import and boot cost of one worker process, measured in fresh interpreters.
+
+Usage: python -m benchmarks.startup [--runs 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def measure_child() -> dict[str, float]:
+    started = time.perf_counter()
+    from src.main import create_app
+
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+
+    async def boot() -> float:
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+
+    booted = asyncio.run(boot())
+    return {
+        "import_ms": (imported - started) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+        "lifespan_ms": (booted - created) * 1000,
+        "rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_child(database_path: str) -> dict[str, float]:
+    env = {**os.environ, "DATABASE_PATH": database_path, "SEED_DATABASE": "false"}
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_child()))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "startup.db")
+        # First run applies migrations; later runs see an up-to-date database like a real worker
+        run_child(database_path)
+        results = [run_child(database_path) for _ in range(args.runs)]
+
+    print(f"Median of {args.runs} fresh worker processes:")
+    for key in ("import_ms", "create_app_ms", "lifespan_ms", "process_ms", "rss_mib"):
+        print(f"  {key:<14} {statistics.median(r[key] for r in results):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Per-request cost of tracing: off, instrumented but unsampled, and sampled with the file exporter.
+
+Each run is a fresh interpreter (instrumentation is process-wide) replaying the same
+read/update mix in-process against one seeded database file; modes are interleaved so
+drift on the machine hits all of them alike.
+
+In-process request timings on a shared machine vary by more than the overhead itself, so
+the per-call cost of an instrumented function (and of recording its span) is reported too.
+
+Usage: python -m benchmarks.tracing [--requests 2000] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "off": {"TRACE_EXPORTER": "none"},
+    "unsampled": {"TRACE_EXPORTER": "file", "TRACE_SAMPLE_RATE": "0"},
+    "sampled": {"TRACE_EXPORTER": "file", "TRACE_SAMPLE_RATE": "1"},
+}
+
+# One product read, one list, one update (find, UPDATE, find)
+REQUESTS = (
+    ("GET", "/api/products/1", None),
+    ("GET", "/api/suppliers", None),
+    ("PUT", "/api/products/2", {"discount": 0.1}),
+)
+
+
+def measure_child(requests: int) -> dict[str, float]:
+    import httpx
+
+    from src.main import create_app
+    from src.utils import tracing
+
+    app = create_app()
+
+    async def run() -> list[float]:
+        timings = []
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for index in range(requests):
+                    method, path, body = REQUESTS[index % len(REQUESTS)]
+                    started = time.perf_counter()
+                    response = await client.request(method, path, json=body)
+                    timings.append(time.perf_counter() - started)
+                    response.raise_for_status()
+        return timings
+
+    timings = asyncio.run(run())[len(REQUESTS) * 10:]
+    if tracing.exporter is not None:
+        tracing.exporter.flush()
+    return {
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": statistics.median(timings) * 1e6,
+        "p99_us": statistics.quantiles(timings, n=100)[98] * 1e6,
+    }
+
+
+def measure_spans(calls: int = 200_000) -> dict[str, float]:
+    """Cost of one instrumented call: untraced, outside a trace, and recording a span."""
+    from src.utils import tracing
+
+    def plain() -> None:
+        pass
+
+    wrapped = tracing.traced("bench")(plain)
+    tracing.exporter = tracing.SpanExporter(tracing.FileSink(os.devnull), max_queue=calls)
+
+    def per_call_ns(func) -> float:
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        return (time.perf_counter() - started) / calls * 1e9
+
+    results = {"plain": per_call_ns(plain), "outside trace": per_call_ns(wrapped)}
+    with tracing.root_span("bench"):
+        results["span recorded"] = per_call_ns(wrapped)
+    tracing.exporter = None
+    return results
+
+
+def run_child(mode: str, requests: int, directory: str) -> dict[str, float]:
+    env = {
+        **os.environ,
+        **MODES[mode],
+        "DATABASE_PATH": os.path.join(directory, "bench.db"),
+        "TRACE_OUTPUT_PATH": os.path.join(directory, f"{mode}.jsonl"),
+        "BACKGROUND_JOBS": "false",
+    }
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.tracing", "--child", "--requests", str(requests)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per mode, interleaved; the median is reported")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_child(args.requests)))
+        return
+
+    runs: dict[str, list[dict[str, float]]] = {mode: [] for mode in MODES}
+    with tempfile.TemporaryDirectory() as directory:
+        # Warm-up run migrates and seeds the shared database
+        run_child("off", len(REQUESTS) * 20, directory)
+        modes = list(MODES)
+        for round_index in range(args.rounds):
+            # Rotate the order so no mode always runs first after the previous round's writes
+            for mode in modes[round_index % len(modes):] + modes[:round_index % len(modes)]:
+                runs[mode].append(run_child(mode, args.requests, directory))
+    results = {
+        mode: {key: statistics.median(run[key] for run in mode_runs) for key in mode_runs[0]}
+        for mode, mode_runs in runs.items()
+    }
+
+    print("Per instrumented call (ns):")
+    for name, ns in measure_spans().items():
+        print(f"  {name:<14} {ns:8.0f}")
+    print()
+
+    baseline = results["off"]["mean_us"]
+    print(f"{args.requests} requests per mode (GET one, GET list, PUT), in-process, median of {args.rounds}:")
+    print(f"  {'mode':<10} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'overhead':>9}")
+    for mode, result in results.items():
+        overhead = (result["mean_us"] / baseline - 1) * 100
+        print(f"  {mode:<10} {result['mean_us']:9.0f} {result['p50_us']:9.0f} {result['p99_us']:9.0f} {overhead:8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
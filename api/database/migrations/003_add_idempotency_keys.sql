@@ -0,0 +1,19 @@
+-- Migration 003: Idempotency keys for replay-safe POST requests
+-- A row is reserved (status_code NULL) before the handler runs and completed with the
+-- stored response afterwards, so retries with the same key replay without re-executing.
+
+CREATE TABLE idempotency_keys (
+    idempotency_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    request_hash TEXT NOT NULL,
+    status_code INTEGER,
+    content_type TEXT,
+    response_body BLOB,
+    created_at TEXT NOT NULL,
+    expires_at INTEGER NOT NULL,
+    PRIMARY KEY (idempotency_key, method, path)
+);
+
+-- Incremental pruning walks expired keys oldest first
+CREATE INDEX idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
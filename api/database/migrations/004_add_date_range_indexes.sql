@@ -0,0 +1,8 @@
+-- Migration 004: Indexes matching the date-range repository queries
+-- find_by_date_range filters on the date column and orders by (date, id). SQLite appends the
+-- rowid (order_id / delivery_id) to every index entry, so a single-column index on the date
+-- serves both the range and the ORDER BY without a temp B-tree sort. The same property means
+-- the existing status and foreign-key indexes already satisfy "WHERE col = ? ORDER BY id".
+
+CREATE INDEX idx_orders_order_date ON orders(order_date);
+CREATE INDEX idx_deliveries_delivery_date ON deliveries(delivery_date);
@@ -0,0 +1,20 @@
+-- Migration 005: Background jobs
+-- Long-running operations (exports, reseeding, ...) are tracked here so clients can poll
+-- their progress through /api/jobs/{id} instead of holding a request open.
+
+CREATE TABLE jobs (
+    job_id INTEGER PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+
+CREATE INDEX idx_jobs_status ON jobs(status);
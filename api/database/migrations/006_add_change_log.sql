@@ -0,0 +1,150 @@
+-- Migration 006: Change-data-capture log
+-- Every insert/update/delete on the core tables appends (table, row id, operation) here.
+-- seq is AUTOINCREMENT so cursors handed to consumers are never reused after compaction.
+
+CREATE TABLE change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+-- Age-based retention deletes oldest-first through this index
+CREATE INDEX idx_change_log_changed_at ON change_log(changed_at);
+
+-- suppliers
+CREATE TRIGGER trg_suppliers_change_insert AFTER INSERT ON suppliers
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('suppliers', NEW.supplier_id, 'insert');
+END;
+
+CREATE TRIGGER trg_suppliers_change_update AFTER UPDATE ON suppliers
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('suppliers', NEW.supplier_id, 'update');
+END;
+
+CREATE TRIGGER trg_suppliers_change_delete AFTER DELETE ON suppliers
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('suppliers', OLD.supplier_id, 'delete');
+END;
+
+-- headquarters
+CREATE TRIGGER trg_headquarters_change_insert AFTER INSERT ON headquarters
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('headquarters', NEW.headquarters_id, 'insert');
+END;
+
+CREATE TRIGGER trg_headquarters_change_update AFTER UPDATE ON headquarters
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('headquarters', NEW.headquarters_id, 'update');
+END;
+
+CREATE TRIGGER trg_headquarters_change_delete AFTER DELETE ON headquarters
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('headquarters', OLD.headquarters_id, 'delete');
+END;
+
+-- branches
+CREATE TRIGGER trg_branches_change_insert AFTER INSERT ON branches
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('branches', NEW.branch_id, 'insert');
+END;
+
+CREATE TRIGGER trg_branches_change_update AFTER UPDATE ON branches
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('branches', NEW.branch_id, 'update');
+END;
+
+CREATE TRIGGER trg_branches_change_delete AFTER DELETE ON branches
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('branches', OLD.branch_id, 'delete');
+END;
+
+-- products
+CREATE TRIGGER trg_products_change_insert AFTER INSERT ON products
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', NEW.product_id, 'insert');
+END;
+
+CREATE TRIGGER trg_products_change_update AFTER UPDATE ON products
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', NEW.product_id, 'update');
+END;
+
+CREATE TRIGGER trg_products_change_delete AFTER DELETE ON products
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', OLD.product_id, 'delete');
+END;
+
+-- orders
+CREATE TRIGGER trg_orders_change_insert AFTER INSERT ON orders
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', NEW.order_id, 'insert');
+END;
+
+CREATE TRIGGER trg_orders_change_update AFTER UPDATE ON orders
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', NEW.order_id, 'update');
+END;
+
+CREATE TRIGGER trg_orders_change_delete AFTER DELETE ON orders
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', OLD.order_id, 'delete');
+END;
+
+-- order_details
+CREATE TRIGGER trg_order_details_change_insert AFTER INSERT ON order_details
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_details', NEW.order_detail_id, 'insert');
+END;
+
+CREATE TRIGGER trg_order_details_change_update AFTER UPDATE ON order_details
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_details', NEW.order_detail_id, 'update');
+END;
+
+CREATE TRIGGER trg_order_details_change_delete AFTER DELETE ON order_details
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_details', OLD.order_detail_id, 'delete');
+END;
+
+-- deliveries
+CREATE TRIGGER trg_deliveries_change_insert AFTER INSERT ON deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('deliveries', NEW.delivery_id, 'insert');
+END;
+
+CREATE TRIGGER trg_deliveries_change_update AFTER UPDATE ON deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('deliveries', NEW.delivery_id, 'update');
+END;
+
+CREATE TRIGGER trg_deliveries_change_delete AFTER DELETE ON deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('deliveries', OLD.delivery_id, 'delete');
+END;
+
+-- order_detail_deliveries
+CREATE TRIGGER trg_order_detail_deliveries_change_insert AFTER INSERT ON order_detail_deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_detail_deliveries', NEW.order_detail_delivery_id, 'insert');
+END;
+
+CREATE TRIGGER trg_order_detail_deliveries_change_update AFTER UPDATE ON order_detail_deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_detail_deliveries', NEW.order_detail_delivery_id, 'update');
+END;
+
+CREATE TRIGGER trg_order_detail_deliveries_change_delete AFTER DELETE ON order_detail_deliveries
+BEGIN
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_detail_deliveries', OLD.order_detail_delivery_id, 'delete');
+END;
+
+-- Highest seq removed by compaction; cursors below it can no longer be served
+CREATE TABLE change_log_compaction (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    compacted_through INTEGER NOT NULL
+);
+
+INSERT INTO change_log_compaction (id, compacted_through) VALUES (1, 0);
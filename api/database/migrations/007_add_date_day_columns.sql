@@ -0,0 +1,28 @@
+-- Migration 007: Integer day and month columns derived from the date text
+-- order_date / delivery_date stay TEXT (ISO-8601 dates or date-times, checked by the models).
+-- *_day is days since 1970-01-01 (UTC) and *_month is YYYYMM, both NULL for unparseable text.
+-- They are VIRTUAL (ALTER TABLE cannot add STORED columns): computed on read and kept only in
+-- the indexes below, so range filters are integer index range scans and per-day / per-month
+-- counts group in index order without a sort.
+-- src/utils/dates.py converts bound parameters with the same expressions.
+
+ALTER TABLE orders ADD COLUMN order_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(order_date)) - 2440587.5 AS INTEGER)) VIRTUAL;
+ALTER TABLE orders ADD COLUMN order_month INTEGER
+    GENERATED ALWAYS AS (CAST(strftime('%Y%m', order_date) AS INTEGER)) VIRTUAL;
+
+ALTER TABLE deliveries ADD COLUMN delivery_day INTEGER
+    GENERATED ALWAYS AS (CAST(julianday(date(delivery_date)) - 2440587.5 AS INTEGER)) VIRTUAL;
+ALTER TABLE deliveries ADD COLUMN delivery_month INTEGER
+    GENERATED ALWAYS AS (CAST(strftime('%Y%m', delivery_date) AS INTEGER)) VIRTUAL;
+
+-- Replace the text-date indexes from migration 004; the rowid suffix still serves ORDER BY day, id
+DROP INDEX IF EXISTS idx_orders_order_date;
+DROP INDEX IF EXISTS idx_deliveries_delivery_date;
+
+CREATE INDEX idx_orders_order_day ON orders(order_day);
+CREATE INDEX idx_deliveries_delivery_day ON deliveries(delivery_day);
+
+-- Month buckets: a month range, narrowed to exact days, grouped in index order
+CREATE INDEX idx_orders_order_month ON orders(order_month, order_day);
+CREATE INDEX idx_deliveries_delivery_month ON deliveries(delivery_month, delivery_day);
@@ -0,0 +1,16 @@
+-- Migration 008: Partial status indexes covering only open work
+-- Operational queries (open-work lists and counts, bulk status changes) only ask for statuses
+-- that can still change, a small set next to the delivered/cancelled history. These indexes
+-- hold just those rows, so their size and the cost of reading them follow the working set.
+-- Queries use them by repeating the WHERE term verbatim (StatusRepository.open_condition),
+-- in the order of the transition tables in src/models/status.py.
+-- Lookups by a final status are history queries; they read the table (orders: the hot table
+-- only, older closed orders live in the archive).
+
+DROP INDEX IF EXISTS idx_orders_status;
+DROP INDEX IF EXISTS idx_deliveries_status;
+
+CREATE INDEX idx_orders_open_status ON orders(status)
+    WHERE status IN ('pending', 'processing', 'shipped');
+CREATE INDEX idx_deliveries_open_status ON deliveries(status)
+    WHERE status IN ('pending', 'in_transit');
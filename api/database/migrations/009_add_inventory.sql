@@ -0,0 +1,44 @@
+-- Migration 009: Per-branch inventory
+-- stock_movements is an append-only ledger of signed quantity changes per (branch, product):
+-- receipts of delivered order lines add stock, consumption removes it. stock_balances holds the
+-- running total per pair, updated by the same transaction that appends a movement, so reading
+-- stock on hand is one primary-key lookup however long the ledger grows.
+
+CREATE TABLE stock_movements (
+    movement_id INTEGER PRIMARY KEY,
+    branch_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL CHECK (quantity <> 0),
+    kind TEXT NOT NULL CHECK (kind IN ('receipt', 'consumption')),
+    -- The delivered order line a receipt books; no foreign key, the ledger outlives archived lines
+    order_detail_delivery_id INTEGER,
+    notes TEXT,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (branch_id) REFERENCES branches(branch_id) ON DELETE CASCADE,
+    FOREIGN KEY (product_id) REFERENCES products(product_id) ON DELETE CASCADE
+);
+
+-- History of one pair in movement order (the rowid suffix), and the product foreign key
+CREATE INDEX idx_stock_movements_branch_product ON stock_movements(branch_id, product_id);
+CREATE INDEX idx_stock_movements_product_id ON stock_movements(product_id);
+-- Each delivered line is received once
+CREATE UNIQUE INDEX idx_stock_movements_receipt ON stock_movements(order_detail_delivery_id)
+    WHERE order_detail_delivery_id IS NOT NULL;
+
+-- A rowid table (not WITHOUT ROWID) so chunked cascade deletes can page through it by rowid
+CREATE TABLE stock_balances (
+    branch_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    reorder_level INTEGER NOT NULL DEFAULT 0 CHECK (reorder_level >= 0),
+    last_movement_id INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (branch_id, product_id),
+    FOREIGN KEY (branch_id) REFERENCES branches(branch_id) ON DELETE CASCADE,
+    FOREIGN KEY (product_id) REFERENCES products(product_id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_stock_balances_product_id ON stock_balances(product_id);
+-- Low stock: only the pairs at or below their reorder level are in this index
+CREATE INDEX idx_stock_balances_low ON stock_balances(branch_id, product_id)
+    WHERE quantity <= reorder_level;
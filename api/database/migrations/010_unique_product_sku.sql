@@ -0,0 +1,7 @@
+-- Migration 010: One product per SKU
+-- Catalog imports upsert products with INSERT ... ON CONFLICT(sku), which needs a unique index
+-- on the conflict target. It replaces the plain SKU lookup index from 001. A database that
+-- already holds duplicate SKUs fails here; merge or rename the duplicates, then migrate again.
+
+DROP INDEX IF EXISTS idx_products_sku;
+CREATE UNIQUE INDEX idx_products_sku ON products(sku);
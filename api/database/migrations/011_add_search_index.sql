@@ -0,0 +1,72 @@
+-- Migration 011: Trigram search index over supplier, headquarters and branch names and contacts
+-- One FTS5 table with the trigram tokenizer serves all three tables. Its rowid encodes the
+-- source row as id * 4 + kind (1 = suppliers, 2 = headquarters, 3 = branches), so the
+-- triggers below replace or remove a row's entry by rowid instead of searching for it.
+
+CREATE VIRTUAL TABLE search_index USING fts5(name, contact_person, email, tokenize = 'trigram');
+
+INSERT INTO search_index (rowid, name, contact_person, email)
+SELECT supplier_id * 4 + 1, name, contact_person, email FROM suppliers;
+
+INSERT INTO search_index (rowid, name, contact_person, email)
+SELECT headquarters_id * 4 + 2, name, contact_person, email FROM headquarters;
+
+INSERT INTO search_index (rowid, name, contact_person, email)
+SELECT branch_id * 4 + 3, name, contact_person, email FROM branches;
+
+-- suppliers
+CREATE TRIGGER trg_suppliers_search_insert AFTER INSERT ON suppliers
+BEGIN
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.supplier_id * 4 + 1, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_suppliers_search_update AFTER UPDATE OF supplier_id, name, contact_person, email ON suppliers
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.supplier_id * 4 + 1;
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.supplier_id * 4 + 1, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_suppliers_search_delete AFTER DELETE ON suppliers
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.supplier_id * 4 + 1;
+END;
+
+-- headquarters
+CREATE TRIGGER trg_headquarters_search_insert AFTER INSERT ON headquarters
+BEGIN
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.headquarters_id * 4 + 2, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_headquarters_search_update AFTER UPDATE OF headquarters_id, name, contact_person, email ON headquarters
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.headquarters_id * 4 + 2;
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.headquarters_id * 4 + 2, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_headquarters_search_delete AFTER DELETE ON headquarters
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.headquarters_id * 4 + 2;
+END;
+
+-- branches
+CREATE TRIGGER trg_branches_search_insert AFTER INSERT ON branches
+BEGIN
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.branch_id * 4 + 3, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_branches_search_update AFTER UPDATE OF branch_id, name, contact_person, email ON branches
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.branch_id * 4 + 3;
+    INSERT INTO search_index (rowid, name, contact_person, email)
+    VALUES (NEW.branch_id * 4 + 3, NEW.name, NEW.contact_person, NEW.email);
+END;
+
+CREATE TRIGGER trg_branches_search_delete AFTER DELETE ON branches
+BEGIN
+    DELETE FROM search_index WHERE rowid = OLD.branch_id * 4 + 3;
+END;
@@ -0,0 +1,6 @@
+-- Migration 012: Latest change per table
+-- The catalog snapshot (src.db.catalog) is current while no product or supplier change has
+-- been logged since it was built. This index answers MAX(seq) for one table with a single
+-- B-tree probe instead of a scan of the whole log.
+
+CREATE INDEX idx_change_log_table_seq ON change_log(table_name, seq);
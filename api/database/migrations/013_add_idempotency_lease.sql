@@ -0,0 +1,6 @@
+-- Migration 013: Lease on in-progress idempotency keys
+-- A reservation holds its key only until locked_until. If the worker running the request
+-- dies, a retry takes the key over once the lease runs out instead of getting 409 until
+-- the key expires. Rows reserved before this migration have no lease and can be taken over.
+
+ALTER TABLE idempotency_keys ADD COLUMN locked_until INTEGER;
@@ -0,0 +1,17 @@
+-- Migration 014: Normalize order and delivery statuses
+-- Create and PUT used to accept any text, so rows may hold spellings like 'Shipped' or
+-- 'in transit'. The bulk status endpoints and the open-status partial indexes (migration
+-- 008) only match the exact vocabulary of src/models/status.py. Rows whose status only
+-- differs in case, spacing or separators are rewritten to it. Anything else is left alone.
+
+UPDATE orders
+SET status = replace(replace(lower(trim(status)), ' ', '_'), '-', '_')
+WHERE status NOT IN ('pending', 'processing', 'shipped', 'delivered', 'cancelled')
+  AND replace(replace(lower(trim(status)), ' ', '_'), '-', '_')
+      IN ('pending', 'processing', 'shipped', 'delivered', 'cancelled');
+
+UPDATE deliveries
+SET status = replace(replace(lower(trim(status)), ' ', '_'), '-', '_')
+WHERE status NOT IN ('pending', 'in_transit', 'delivered', 'cancelled')
+  AND replace(replace(lower(trim(status)), ' ', '_'), '-', '_')
+      IN ('pending', 'in_transit', 'delivered', 'cancelled');
@@ -0,0 +1,6 @@
+-- Migration 015: Owner of an idempotency key's lease
+-- Once a lease runs out and a retry takes the key over, the original request may still
+-- finish. complete() and release() match on lease_token so that late finisher can neither
+-- overwrite the new owner's response nor delete the row it is still working on.
+
+ALTER TABLE idempotency_keys ADD COLUMN lease_token TEXT;
@@ -0,0 +1,55 @@
+import argparse
+import sys
+
+from src.db.query_audit import run_audit
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run EXPLAIN QUERY PLAN over every repository query and fail on full scans or temp B-tree sorts"
+    )
+    parser.add_argument("--database", help="Audit a copy of this database file (uses its statistics)")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan for every statement")
+    return parser.parse_args(argv)
+
+
+def print_finding(finding, verbose: bool) -> None:
+    if finding.problems and finding.allowed_reason:
+        print(f"~ {finding.source}: allowed ({finding.allowed_reason})")
+    elif finding.problems:
+        print(f"✗ {finding.source}: {finding.sql}")
+        for problem in finding.problems:
+            print(f"    {problem}")
+    elif verbose:
+        print(f"✓ {finding.source}: {finding.sql}")
+
+    if verbose:
+        for detail in finding.plan:
+            print(f"    | {detail}")
+
+
+def print_report(report, verbose: bool) -> None:
+    for finding in report.findings:
+        print_finding(finding, verbose)
+
+    for source in report.skipped:
+        print(f"- {source}: skipped (cannot synthesize arguments)")
+
+    for fk in report.unindexed_foreign_keys:
+        print(f"✗ unindexed foreign key: {fk}")
+
+    failures = sum(1 for f in report.findings if not f.ok) + len(report.unindexed_foreign_keys)
+    print(f"{'✓' if report.ok else '✗'} Audited {len(report.findings)} statements, {failures} problem(s)")
+
+
+def main():
+    args = parse_args()
+    report = run_audit(args.database)
+    print_report(report, args.verbose)
+
+    if not report.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
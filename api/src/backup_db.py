@@ -0,0 +1,60 @@
+import argparse
+import sys
+from pathlib import Path
+
+from src.db.backup import create_snapshot, find_snapshot, list_snapshots, restore_snapshot
+from src.utils.errors import DatabaseError
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online backups of the database and restores into fresh files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="Snapshot the live database without stopping the API")
+    create.add_argument("--output", type=Path, help="Directory for the snapshot (default: BACKUP_DIR)")
+    create.add_argument("--pages", type=int, help="Pages copied per step (default: BACKUP_PAGES_PER_STEP)")
+
+    commands.add_parser("list", help="List snapshots in BACKUP_DIR")
+
+    restore = commands.add_parser("restore", help="Restore a snapshot into a new database file")
+    restore.add_argument("snapshot", help="Snapshot name from `list`, or a path to a .db.gz file")
+    restore.add_argument("target", type=Path, help="Database file to create")
+    restore.add_argument("--force", action="store_true", help="Replace the target if it exists")
+    restore.add_argument("--archive-target", type=Path, help="Archive file to create (default: <target>.archive.db)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "create":
+            def on_progress(done: int, total: int) -> None:
+                print(f"\r  copied {done}/{total} pages", end="", flush=True)
+
+            options = {"pages_per_step": args.pages} if args.pages else {}
+            manifest = create_snapshot(args.output, on_progress=on_progress, **options)
+            print()
+            print(f"✓ {manifest['file']}: {manifest['sizeBytes']} bytes -> {manifest['compressedBytes']} compressed")
+            if manifest["archive"]:
+                archive = manifest["archive"]
+                print(f"✓ {archive['file']}: {archive['sizeBytes']} bytes -> {archive['compressedBytes']} compressed")
+            print(f"  copied in {manifest['copySeconds']}s ({manifest['copyMiBPerSecond']} MiB/s), sha256 {manifest['sha256']}")
+
+        elif args.command == "list":
+            for manifest in list_snapshots():
+                print(f"{manifest['name']}  {manifest['createdAt']}  {manifest['sizeBytes']:>12} bytes  {manifest['compressedBytes']:>12} gz")
+
+        elif args.command == "restore":
+            snapshot = Path(args.snapshot)
+            if not snapshot.is_file():
+                snapshot = find_snapshot(args.snapshot)
+
+            result = restore_snapshot(snapshot, args.target, overwrite=args.force, archive_target=args.archive_target)
+            print(f"✓ Restored {result['snapshot']} to {result['target']} in {result['seconds']}s ({result['MiBPerSecond']} MiB/s)")
+            if result["archiveTarget"]:
+                print(f"  archive restored to {result['archiveTarget']}")
+    except DatabaseError as e:
+        print(f"✗ {e.message}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
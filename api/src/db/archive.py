@@ -0,0 +1,166 @@
+import json
+import os
+import re
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from src.db.connection import attach_archive, execute, fetch_all, fetch_one, get_db, transaction, write_slot
+from src.utils.dates import DAY_OF_PARAM
+from src.utils.errors import ConflictError
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_STATUSES = tuple(s.strip() for s in os.getenv("ARCHIVE_STATUSES", "delivered,cancelled").split(",") if s.strip())
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", "20"))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+# The order aggregate, parents first: (table, id column, filter selecting the rows of a JSON array of order ids)
+ARCHIVED_TABLES: tuple[tuple[str, str, str], ...] = (
+    ("orders", "order_id", "order_id IN (SELECT value FROM json_each(?))"),
+    ("order_details", "order_detail_id", "order_id IN (SELECT value FROM json_each(?))"),
+    (
+        "order_detail_deliveries",
+        "order_detail_delivery_id",
+        "order_detail_id IN (SELECT order_detail_id FROM main.order_details WHERE order_id IN (SELECT value FROM json_each(?)))",
+    ),
+)
+
+_CREATE_INDEX = re.compile(r"^CREATE\s+(UNIQUE\s+)?INDEX\s+(IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+
+def _generated_expression(table_sql: str, column: str) -> str:
+    """The `AS (...)` expression of a generated column in a table's CREATE TABLE statement."""
+    match = re.search(rf"\b{column}\b[^,]*?\bAS\s*\(", table_sql, re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"No generated expression for {column}")
+    depth, start = 1, match.end()
+    for position in range(start, len(table_sql)):
+        depth += {"(": 1, ")": -1}.get(table_sql[position], 0)
+        if depth == 0:
+            return table_sql[start:position]
+    raise ValueError(f"Unbalanced generated expression for {column}")
+
+
+def sync_archive_schema() -> None:
+    """Create or extend the archive copies of the order tables to match the hot schema.
+
+    Archive tables keep the hot columns (generated ones as plain values) in the same order
+    and the same indexes, but no foreign keys or triggers: archived rows are read-only and
+    may outlive the deliveries and products they point at.
+    """
+    with get_db() as conn:
+        attach_archive(conn)
+
+    for table, id_column, _ in ARCHIVED_TABLES:
+        columns = fetch_all(f"PRAGMA main.table_xinfo({table})")
+        if not columns:
+            continue
+        existing = {column["name"] for column in fetch_all(f"PRAGMA archive.table_xinfo({table})")}
+
+        if not existing:
+            definitions = [
+                f"{column['name']} {column['type']}{' PRIMARY KEY' if column['name'] == id_column else ''}"
+                for column in columns
+            ]
+            execute(f"CREATE TABLE archive.{table} ({', '.join(definitions)})")
+        else:
+            table_sql = None
+            for column in columns:
+                if column["name"] not in existing:
+                    execute(f"ALTER TABLE archive.{table} ADD COLUMN {column['name']} {column['type']}")
+                    # Generated in main (hidden 2 / 3): compute the value for rows archived before the column existed
+                    if column["hidden"] in (2, 3):
+                        if table_sql is None:
+                            table_sql = fetch_one("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,))["sql"]
+                        execute(f"UPDATE archive.{table} SET {column['name']} = {_generated_expression(table_sql, column['name'])}")
+
+        indexes = fetch_all(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        )
+        for index in indexes:
+            execute(_CREATE_INDEX.sub(r"CREATE \1INDEX IF NOT EXISTS archive.\3", index["sql"], count=1))
+
+
+def select_with_archive(table: str, id_column: str, where: str = "1", order_by: str | None = None) -> str:
+    """SELECT hot and archived rows of `table` matching `where`; bind its parameters twice.
+
+    An archived row whose id is still hot (a batch interrupted between its copy and delete
+    commits) is skipped, so every row comes back once.
+    """
+    return (
+        f"SELECT * FROM main.{table} WHERE {where} "
+        f"UNION ALL "
+        f"SELECT * FROM archive.{table} AS a WHERE {where} "
+        f"AND NOT EXISTS (SELECT 1 FROM main.{table} AS h WHERE h.{id_column} = a.{id_column}) "
+        f"ORDER BY {order_by or id_column}"
+    )
+
+
+def fetch_all_with_archive(
+    table: str, id_column: str, where: str = "1", params: tuple[Any, ...] = (), order_by: str | None = None
+) -> list[dict[str, Any]]:
+    return fetch_all(select_with_archive(table, id_column, where, order_by), (*params, *params))
+
+
+def find_archived(table: str, id_column: str, id_value: int) -> dict[str, Any] | None:
+    return fetch_one(f"SELECT * FROM archive.{table} WHERE {id_column} = ?", (id_value,))
+
+
+def ensure_not_archived(table: str, id_column: str, id_value: int) -> None:
+    """Archived rows are read-only; refuse writes to them instead of reporting them missing."""
+    if fetch_one(f"SELECT 1 FROM main.{table} WHERE {id_column} = ?", (id_value,)) is None and find_archived(
+        table, id_column, id_value
+    ):
+        raise ConflictError(f"{table} with id {id_value} is archived and read-only")
+
+
+def archive_closed_orders(
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: int | None = ARCHIVE_MAX_BATCHES,
+    on_progress: Callable[[int], None] | None = None,
+) -> dict[str, Any]:
+    """Move closed orders older than the cutoff, with their details and delivery links, to the archive.
+
+    Each batch is copied in one commit and deleted from the hot tables in a second. A
+    transaction spanning two WAL databases is not atomic across them, and SQLite commits
+    main first; copying first means a crash can leave a batch in both files (re-copied and
+    deleted by the next run, deduplicated by reads meanwhile) but never in neither.
+    """
+    cutoff = (date.today() - timedelta(days=older_than_days)).isoformat()
+    statuses = json.dumps(list(ARCHIVE_STATUSES))
+    archived = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with write_slot():
+            rows = fetch_all(
+                "SELECT order_id FROM main.orders WHERE status IN (SELECT value FROM json_each(?)) "
+                f"AND order_day < {DAY_OF_PARAM} "
+                "ORDER BY order_id LIMIT ?",
+                (statuses, cutoff, batch_size),
+                row_format="tuple",
+            )
+            if not rows:
+                break
+            order_ids = json.dumps([row[0] for row in rows])
+
+            with transaction():
+                for table, _, belongs_to_batch in ARCHIVED_TABLES:
+                    execute(f"INSERT OR REPLACE INTO archive.{table} SELECT * FROM main.{table} WHERE {belongs_to_batch}", (order_ids,))
+
+            with transaction():
+                last_seq = fetch_one("SELECT coalesce(max(seq), 0) AS seq FROM change_log")["seq"]
+                for table, _, belongs_to_batch in reversed(ARCHIVED_TABLES):
+                    execute(f"DELETE FROM main.{table} WHERE {belongs_to_batch}", (order_ids,))
+                # The rows still exist; tell change feed consumers they moved rather than vanished
+                execute("UPDATE change_log SET operation = 'archive' WHERE seq > ? AND operation = 'delete'", (last_seq,))
+
+        archived += len(rows)
+        batches += 1
+        if on_progress:
+            on_progress(archived)
+        if len(rows) < batch_size:
+            break
+
+    return {"archived_orders": archived, "batches": batches, "cutoff": cutoff}
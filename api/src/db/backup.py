@@ -0,0 +1,245 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.db.config import archive_path_beside, get_backup_dir
+from src.db.connection import connect, get_db
+from src.utils.errors import ConflictError, NotFoundError, ValidationError
+
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_MS = int(os.getenv("BACKUP_STEP_SLEEP_MS", "5"))
+BACKUP_COMPRESS_LEVEL = int(os.getenv("BACKUP_COMPRESS_LEVEL", "6"))
+
+COPY_CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_SUFFIX = ".db.gz"
+ARCHIVE_SUFFIX = ".archive.db.gz"
+
+# (pages copied, total pages)
+BackupProgress = Callable[[int, int], None]
+
+
+def _manifest_path(snapshot: Path) -> Path:
+    return snapshot.with_name(snapshot.name.removesuffix(SNAPSHOT_SUFFIX) + ".json")
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _throughput(size: int, seconds: float) -> float:
+    return round(size / 2**20 / seconds, 2) if seconds > 0 else 0.0
+
+
+def _quick_check(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != "ok":
+        raise ConflictError(f"Snapshot failed integrity check: {result}")
+
+
+def _copy_schema(
+    conn: sqlite3.Connection, schema: str, raw_path: Path, pages_per_step: int, step_sleep_ms: int, progress
+) -> int:
+    """Back up one attached schema of `conn` into a new file; returns its page count."""
+    target = connect(str(raw_path))
+    try:
+        conn.backup(target, pages=pages_per_step, progress=progress, name=schema, sleep=step_sleep_ms / 1000)
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        # The copy inherits WAL mode; a snapshot file should be self-contained
+        target.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        target.close()
+    return page_count
+
+
+def _compress(raw_path: Path, snapshot_path: Path, pages: int) -> dict[str, Any]:
+    """Integrity-check, checksum and gzip a copied file; returns its manifest entry."""
+    _quick_check(raw_path)
+    with open(raw_path, "rb") as source, gzip.open(snapshot_path, "wb", compresslevel=BACKUP_COMPRESS_LEVEL) as target_file:
+        shutil.copyfileobj(source, target_file, COPY_CHUNK_SIZE)
+    return {
+        "file": snapshot_path.name,
+        "pages": pages,
+        "sizeBytes": raw_path.stat().st_size,
+        "compressedBytes": snapshot_path.stat().st_size,
+        "sha256": _sha256(raw_path),
+        "compressedSha256": _sha256(snapshot_path),
+    }
+
+
+def create_snapshot(
+    output_dir: Path | None = None,
+    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+    step_sleep_ms: int = BACKUP_STEP_SLEEP_MS,
+    on_progress: BackupProgress | None = None,
+) -> dict[str, Any]:
+    """Copy the live database and its archive with the online backup API, then gzip and checksum them.
+
+    The copy runs `pages_per_step` pages at a time and sleeps between steps, so writers
+    wait at most one step for the lock. It reads through the application's own connection:
+    SQLite feeds writes made on the source connection straight into the running backup,
+    whereas a write from any other connection restarts it. The main schema is copied before
+    the attached archive, so an order archived in between is in both copies, never in
+    neither, the same state an interrupted archive run leaves (src.db.archive).
+    """
+    output_dir = output_dir or get_backup_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    name = f"snapshot-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+    raw_paths = {schema: output_dir / f"{name}.{schema}.partial" for schema in ("main", "archive")}
+    snapshot_paths = {"main": output_dir / f"{name}{SNAPSHOT_SUFFIX}", "archive": output_dir / f"{name}{ARCHIVE_SUFFIX}"}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        if on_progress:
+            on_progress(total - remaining, total)
+        # sqlite3's own `sleep` only applies after SQLITE_BUSY; pausing here lets writers in between steps
+        if remaining and step_sleep_ms:
+            time.sleep(step_sleep_ms / 1000)
+
+    started = time.perf_counter()
+    files: dict[str, dict[str, Any]] = {}
+    try:
+        with get_db() as conn:
+            schemas = [row[1] for row in conn.execute("PRAGMA database_list") if row[1] in raw_paths]
+            pages = {
+                schema: _copy_schema(conn, schema, raw_paths[schema], pages_per_step, step_sleep_ms, progress)
+                for schema in schemas
+            }
+        copied = time.perf_counter()
+
+        for schema in schemas:
+            files[schema] = _compress(raw_paths[schema], snapshot_paths[schema], pages[schema])
+        finished = time.perf_counter()
+    except Exception:
+        for path in snapshot_paths.values():
+            path.unlink(missing_ok=True)
+        raise
+    finally:
+        for path in raw_paths.values():
+            path.unlink(missing_ok=True)
+
+    raw_size = sum(entry["sizeBytes"] for entry in files.values())
+    manifest = {
+        "name": name,
+        **files["main"],
+        "createdAt": datetime.now().isoformat(),
+        "sqliteVersion": sqlite3.sqlite_version,
+        "archive": files.get("archive"),
+        "copySeconds": round(copied - started, 3),
+        "totalSeconds": round(finished - started, 3),
+        "copyMiBPerSecond": _throughput(raw_size, copied - started),
+    }
+    _manifest_path(snapshot_paths["main"]).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def list_snapshots(backup_dir: Path | None = None) -> list[dict[str, Any]]:
+    backup_dir = backup_dir or get_backup_dir()
+    manifests = []
+    for path in sorted(backup_dir.glob("snapshot-*.json"), reverse=True):
+        manifests.append(json.loads(path.read_text(encoding="utf-8")))
+    return manifests
+
+
+def find_snapshot(name: str, backup_dir: Path | None = None) -> Path:
+    backup_dir = (backup_dir or get_backup_dir()).resolve()
+    snapshot = (backup_dir / f"{name.removesuffix(SNAPSHOT_SUFFIX)}{SNAPSHOT_SUFFIX}").resolve()
+    if snapshot.parent != backup_dir or not snapshot.is_file():
+        raise NotFoundError(f"Snapshot {name} not found")
+    return snapshot
+
+
+def _check_target(target: Path, overwrite: bool) -> None:
+    if target.exists() and not overwrite:
+        raise ConflictError(f"{target} already exists")
+    for suffix in ("-wal", "-shm"):
+        if Path(f"{target}{suffix}").exists():
+            raise ConflictError(f"{target}{suffix} exists; is a server still using the target?")
+
+
+def _check_source(source: Path, compressed_sha256: str) -> None:
+    if not source.is_file():
+        raise NotFoundError(f"{source.name} not found")
+    if _sha256(source) != compressed_sha256:
+        raise ValidationError(f"{source.name} does not match its manifest checksum")
+
+
+def _decompress(snapshot_path: Path, partial: Path, sha256: str) -> None:
+    digest = hashlib.sha256()
+    with gzip.open(snapshot_path, "rb") as source, open(partial, "wb") as target:
+        while chunk := source.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            target.write(chunk)
+
+    if digest.hexdigest() != sha256:
+        raise ValidationError(f"Restored data from {snapshot_path.name} does not match its checksum")
+    _quick_check(partial)
+
+
+def restore_snapshot(
+    snapshot_path: Path, target_path: Path, overwrite: bool = False, archive_target: Path | None = None
+) -> dict[str, Any]:
+    """Decompress a snapshot into a new database file, and its archive beside it, verifying every checksum first.
+
+    The archive goes to `archive_target`, by default `<target>.archive.db` where the API looks
+    for it unless ARCHIVE_DATABASE_PATH says otherwise. Files are assembled next to their
+    targets and renamed into place, so a half-written restore is never visible. Restore into
+    a fresh path and point DATABASE_PATH at it; replacing the file under a running server is
+    not supported.
+    """
+    manifest_path = _manifest_path(snapshot_path)
+    if not manifest_path.exists():
+        raise NotFoundError(f"Manifest for {snapshot_path.name} not found")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    # Snapshots taken before archives were backed up have no archive entry
+    files = {target_path: (snapshot_path, manifest)}
+    if manifest.get("archive"):
+        archive_target = archive_target or archive_path_beside(target_path)
+        files[archive_target] = (snapshot_path.with_name(manifest["archive"]["file"]), manifest["archive"])
+
+    for target in files:
+        _check_target(target, overwrite)
+
+    started = time.perf_counter()
+    for source, entry in files.values():
+        _check_source(source, entry["compressedSha256"])
+
+    partials = {target: target.with_name(f"{target.name}.partial") for target in files}
+    try:
+        for target, (source, entry) in files.items():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _decompress(source, partials[target], entry["sha256"])
+        # Archive first: a main file that is in place always has its archive
+        for target in reversed(files):
+            os.replace(partials[target], target)
+    finally:
+        for partial in partials.values():
+            partial.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - started
+    archive = manifest.get("archive")
+    return {
+        "snapshot": manifest["name"],
+        "target": str(target_path),
+        "archiveTarget": str(archive_target) if archive else None,
+        "sizeBytes": manifest["sizeBytes"],
+        "archiveSizeBytes": archive["sizeBytes"] if archive else 0,
+        "seconds": round(elapsed, 3),
+        "MiBPerSecond": _throughput(manifest["sizeBytes"] + (archive["sizeBytes"] if archive else 0), elapsed),
+    }
@@ -0,0 +1,147 @@
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.db.connection import execute, fetch_all, fetch_one
+from src.utils.errors import NotFoundError, ValidationError
+
+CASCADE_DELETE_JOB_THRESHOLD = int(os.getenv("CASCADE_DELETE_JOB_THRESHOLD", "1000"))
+CASCADE_DELETE_CHUNK_SIZE = int(os.getenv("CASCADE_DELETE_CHUNK_SIZE", "500"))
+
+# (rows deleted so far, rows planned)
+CascadeProgress = Callable[[int, int], None]
+
+
+@dataclass
+class CascadeStep:
+    """Rows of `table` that ON DELETE CASCADE would remove with the root row."""
+
+    table: str
+    where: str
+    # Each path from the root binds the root id once
+    param_count: int
+    depth: int
+    rows: int = 0
+
+
+@dataclass
+class CascadePlan:
+    table: str
+    id_column: str
+    id_value: int
+    # Deepest tables first, so every chunk deletes rows whose own children are already gone
+    steps: list[CascadeStep] = field(default_factory=list)
+
+    @property
+    def dependent_rows(self) -> int:
+        return sum(step.rows for step in self.steps)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "id": self.id_value,
+            "dependentRows": self.dependent_rows,
+            "rows": {step.table: step.rows for step in self.steps},
+        }
+
+
+def _cascade_children() -> dict[str, list[tuple[str, str, str]]]:
+    """parent table -> [(child table, child column, parent column)] for ON DELETE CASCADE keys."""
+    children: dict[str, list[tuple[str, str, str]]] = {}
+    tables = fetch_all("SELECT name FROM main.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    for row in tables:
+        for fk in fetch_all(f"PRAGMA main.foreign_key_list({row['name']})"):
+            if fk["on_delete"] == "CASCADE":
+                children.setdefault(fk["table"], []).append((row["name"], fk["from"], fk["to"]))
+    return children
+
+
+def _primary_key(table: str) -> str:
+    columns = [column["name"] for column in fetch_all(f"PRAGMA main.table_info({table})") if column["pk"]]
+    if len(columns) != 1:
+        raise ValidationError(f"{table} has no single-column primary key")
+    return columns[0]
+
+
+def plan_cascade(table: str, id_value: int, count_limit: int | None = None) -> CascadePlan:
+    """Work out which rows deleting `table` row `id_value` would cascade to, and count them.
+
+    With `count_limit`, each table's count stops at that many rows, which is enough to
+    decide between an inline delete and a background job without scanning a big tenant.
+    """
+    id_column = _primary_key(table)
+    if fetch_one(f"SELECT 1 FROM {table} WHERE {id_column} = ?", (id_value,)) is None:
+        raise NotFoundError(f"{table} with id {id_value} not found")
+
+    children = _cascade_children()
+    paths: dict[str, list[tuple[str, int]]] = {}
+    # (table, filter selecting its rows under the root, depth, tables on the path)
+    pending = [(table, f"{id_column} = ?", 0, (table,))]
+    while pending:
+        parent, parent_where, depth, visited = pending.pop()
+        for child, child_column, parent_column in children.get(parent, []):
+            if child in visited:
+                continue
+            where = f"{child_column} IN (SELECT {parent_column} FROM {parent} WHERE {parent_where})"
+            paths.setdefault(child, []).append((where, depth + 1))
+            pending.append((child, where, depth + 1, (*visited, child)))
+
+    plan = CascadePlan(table=table, id_column=id_column, id_value=id_value)
+    for child, child_paths in paths.items():
+        where = " OR ".join(f"({path})" for path, _ in child_paths)
+        step = CascadeStep(child, where, len(child_paths), max(depth for _, depth in child_paths))
+        params = (id_value,) * step.param_count
+        if count_limit is None:
+            sql = f"SELECT count(*) AS count FROM {child} WHERE {where}"
+            step.rows = fetch_one(sql, params)["count"]
+        else:
+            sql = f"SELECT count(*) AS count FROM (SELECT 1 FROM {child} WHERE {where} LIMIT ?)"
+            step.rows = fetch_one(sql, (*params, count_limit))["count"]
+        plan.steps.append(step)
+
+    plan.steps.sort(key=lambda step: (-step.depth, step.table))
+    return plan
+
+
+def delete_in_chunks(
+    plan: CascadePlan, chunk_size: int = CASCADE_DELETE_CHUNK_SIZE, on_progress: CascadeProgress | None = None
+) -> dict[str, Any]:
+    """Delete the plan's rows leaves-first, `chunk_size` rows per commit, then the root row.
+
+    Each chunk's rowids are found with a keyset read outside the write lock; the lock is
+    only held to delete exactly those rows, so other requests get it between chunks instead
+    of waiting for one statement cascading through the whole tenant. Rows added under the
+    root meanwhile are caught by the final delete's own cascade.
+    """
+    total = plan.dependent_rows + 1
+    deleted: dict[str, int] = {}
+    done = 0
+
+    for step in plan.steps:
+        params = (plan.id_value,) * step.param_count
+        select_sql = f"SELECT rowid FROM {step.table} WHERE ({step.where}) AND rowid > ? ORDER BY rowid LIMIT ?"
+        delete_sql = f"DELETE FROM {step.table} WHERE rowid IN (SELECT value FROM json_each(?))"
+        last_rowid = 0
+        while True:
+            rowids = [row[0] for row in fetch_all(select_sql, (*params, last_rowid, chunk_size), row_format="tuple")]
+            if not rowids:
+                break
+
+            removed = execute(delete_sql, (json.dumps(rowids),), idempotent=True).rowcount
+            deleted[step.table] = deleted.get(step.table, 0) + removed
+            done += removed
+            last_rowid = rowids[-1]
+            if on_progress:
+                on_progress(done, total)
+            if len(rowids) < chunk_size:
+                break
+        deleted.setdefault(step.table, 0)
+
+    removed = execute(f"DELETE FROM {plan.table} WHERE {plan.id_column} = ?", (plan.id_value,), idempotent=True).rowcount
+    deleted[plan.table] = removed
+    if on_progress:
+        on_progress(done + removed, total)
+
+    return {"table": plan.table, "id": plan.id_value, "deleted": deleted}
@@ -0,0 +1,425 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.db.config import get_database_path
+from src.db.connection import commit_observers, fetch_all, fetch_one, in_transaction
+from src.utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process serving only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Serve products and suppliers by id and in full from a memory-mapped snapshot file
+CATALOG_SNAPSHOT = os.getenv("CATALOG_SNAPSHOT", "false").lower() == "true"
+# Defaults to "<database>.catalog" next to the main file
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "")
+# How often a worker checks its snapshot against the change log, for writes made outside the app
+CATALOG_VERIFY_SECONDS = float(os.getenv("CATALOG_VERIFY_SECONDS", "1"))
+# Builds discarded because the catalog changed while they ran, before giving up until the next write
+CATALOG_BUILD_ATTEMPTS = 5
+# Wait after a failed or contended build before a read asks for another one
+CATALOG_RETRY_SECONDS = 1.0
+
+MAGIC = b"OCCAT01\n"
+# Magic, then the offset and length of the JSON layout at the end of the file
+_HEADER = struct.Struct("<8sQQ")
+
+# Array typecodes of fixed-width columns; text is a uint32 offset array into a UTF-8 heap
+_TYPECODES = {"int": "q", "float": "d", "bool": "b"}
+
+builds_total = metrics.counter("catalog_snapshot_builds_total", "Catalog snapshots written")
+build_seconds = metrics.histogram("catalog_snapshot_build_seconds", "Time to read the catalog and write a snapshot")
+build_failures = metrics.counter("catalog_snapshot_build_failures_total", "Catalog snapshot builds that raised")
+snapshot_bytes = metrics.gauge("catalog_snapshot_bytes", "Size of the catalog snapshot this worker has mapped")
+
+# table -> (key column, query returning the rows find_all serves, ordered by the key)
+CATALOG_TABLES: dict[str, tuple[str, str]] = {}
+
+
+def register_catalog_table(table: str, key: str, sql: str) -> None:
+    """Include `table` in the snapshot; `sql` must return the repository's own row shape."""
+    CATALOG_TABLES[table] = (key, sql)
+
+
+def catalog_seq() -> int:
+    """Latest change log entry for a catalog table; the snapshot is current while this is unchanged."""
+    if not CATALOG_TABLES:
+        return 0
+    latest = ", ".join(
+        f"COALESCE((SELECT MAX(seq) FROM change_log WHERE table_name = '{table}'), 0)"
+        for table in sorted(CATALOG_TABLES)
+    )
+    return fetch_one(f"SELECT MAX(0, {latest}) AS seq")["seq"]
+
+
+def _column_kind(values: list[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if present and all(type(value) is bool for value in present):
+        return "bool"
+    if present and all(type(value) is int for value in present):
+        return "int"
+    if present and all(type(value) is float for value in present):
+        return "float"
+    if all(type(value) is str for value in present):
+        return "text"
+    raise ValueError("column mixes value types")
+
+
+def _aligned(blob: bytes) -> bytes:
+    return blob + b"\0" * (-len(blob) % 8)
+
+
+def encode_snapshot(tables: dict[str, tuple[str, list[dict[str, Any]]]], seq: int) -> bytes:
+    """Pack {table: (key column, rows ordered by key)} column by column into one buffer.
+
+    Each column is one contiguous array (int64, float64, int8 flags, or uint32 offsets into
+    a UTF-8 heap) plus a null bitmap when it has nulls, so readers index it in place.
+    """
+    blobs: list[bytes] = []
+    offset = 0
+
+    def add(blob: bytes) -> int:
+        nonlocal offset
+        start = _HEADER.size + offset
+        blob = _aligned(blob)
+        blobs.append(blob)
+        offset += len(blob)
+        return start
+
+    layout: dict[str, Any] = {"seq": seq, "built_at": time.time(), "tables": {}}
+    for table, (key, rows) in tables.items():
+        names = list(rows[0]) if rows else []
+        columns = []
+        for name in names:
+            values = [row[name] for row in rows]
+            kind = _column_kind(values)
+            column: dict[str, Any] = {"name": name, "kind": kind, "nulls": None}
+            if any(value is None for value in values):
+                bitmap = bytearray((len(values) + 7) // 8)
+                for index, value in enumerate(values):
+                    if value is None:
+                        bitmap[index >> 3] |= 1 << (index & 7)
+                column["nulls"] = add(bytes(bitmap))
+            if kind == "text":
+                encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+                ends = array("I", [0])
+                for item in encoded:
+                    ends.append(ends[-1] + len(item))
+                column["offsets"] = add(ends.tobytes())
+                column["heap"] = add(b"".join(encoded))
+            else:
+                zero = 0.0 if kind == "float" else 0
+                column["values"] = add(array(_TYPECODES[kind], [zero if v is None else v for v in values]).tobytes())
+            columns.append(column)
+        if key not in names and rows:
+            raise ValueError(f"{table} rows have no {key} column")
+        layout["tables"][table] = {"key": key, "rows": len(rows), "columns": columns}
+
+    # The layout goes last, once every offset is known; the fixed header says where it is
+    layout_json = json.dumps(layout).encode("utf-8")
+    return _HEADER.pack(MAGIC, _HEADER.size + offset, len(layout_json)) + b"".join(blobs) + layout_json
+
+
+class CatalogTable:
+    """One table of a mapped snapshot. Rows are decoded on request; nothing else is copied."""
+
+    def __init__(self, view: memoryview, layout: dict[str, Any]):
+        self.key = layout["key"]
+        self.size = layout["rows"]
+        self.names: list[str] = []
+        self._columns: list[tuple[Callable[[int], Any], Callable[[], list[Any]]]] = []
+        self._ids = None
+        for column in layout["columns"]:
+            self.names.append(column["name"])
+            self._columns.append(self._accessors(view, column))
+            if column["name"] == self.key:
+                start = column["values"]
+                self._ids = view[start:start + 8 * self.size].cast("q")
+
+    def _accessors(self, view: memoryview, column: dict[str, Any]):
+        size = self.size
+        if column["kind"] == "text":
+            start = column["offsets"]
+            ends = view[start:start + 4 * (size + 1)].cast("I")
+            heap = view[column["heap"]:]
+
+            def get(index: int) -> Any:
+                return str(heap[ends[index]:ends[index + 1]], "utf-8")
+
+            def every() -> list[Any]:
+                return [str(heap[ends[i]:ends[i + 1]], "utf-8") for i in range(size)]
+        else:
+            typecode = _TYPECODES[column["kind"]]
+            start = column["values"]
+            values = view[start:start + array(typecode).itemsize * size].cast(typecode)
+            if column["kind"] == "bool":
+                def get(index: int) -> Any:
+                    return bool(values[index])
+
+                def every() -> list[Any]:
+                    return [bool(value) for value in values]
+            else:
+                get = values.__getitem__
+                every = values.tolist
+
+        if column["nulls"] is None:
+            return get, every
+
+        nulls = view[column["nulls"]:column["nulls"] + (size + 7) // 8]
+
+        def get_nullable(index: int) -> Any:
+            return None if nulls[index >> 3] >> (index & 7) & 1 else get(index)
+
+        def every_nullable() -> list[Any]:
+            return [None if nulls[i >> 3] >> (i & 7) & 1 else value for i, value in enumerate(every())]
+
+        return get_nullable, every_nullable
+
+    def get(self, id_value: int) -> dict[str, Any] | None:
+        if self._ids is None:
+            return None
+        index = bisect_left(self._ids, id_value)
+        if index == self.size or self._ids[index] != id_value:
+            return None
+        return {name: get(index) for name, (get, _) in zip(self.names, self._columns, strict=True)}
+
+    def rows(self) -> list[dict[str, Any]]:
+        names = self.names
+        return [dict(zip(names, values, strict=True)) for values in zip(*(every() for _, every in self._columns), strict=True)]
+
+
+class CatalogSnapshot:
+    """A snapshot file mapped read-only: every worker shares the same pages of the OS page cache."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Rebuilds replace the file, so a different inode means a newer snapshot
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+        self.size = stat.st_size
+
+        view = memoryview(self._map)
+        magic, layout_offset, layout_length = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        layout = json.loads(bytes(view[layout_offset:layout_offset + layout_length]))
+        self.seq: int = layout["seq"]
+        self.built_at: float = layout["built_at"]
+        self.tables = {name: CatalogTable(view, table) for name, table in layout["tables"].items()}
+
+
+def _read_catalog() -> dict[str, tuple[str, list[dict[str, Any]]]]:
+    return {table: (key, fetch_all(sql)) for table, (key, sql) in CATALOG_TABLES.items()}
+
+
+class CatalogStore:
+    """Keeps one snapshot file current for every worker sharing a database.
+
+    A committed write to a catalog table deletes the file right away, so no worker reads a
+    row older than a write it could have seen, and one process rebuilds it in the
+    background. Until the new file is in place, reads go to SQLite.
+    """
+
+    def __init__(self, path: str | Path, verify_seconds: float = CATALOG_VERIFY_SECONDS):
+        self.path = Path(path)
+        self.verify_seconds = verify_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        self._verified_at = 0.0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._builder: threading.Thread | None = None
+        self._pid: int | None = None
+        self._retry_at = 0.0
+        # Stand-in for the lock files where fcntl is missing (one process only)
+        self._thread_locks = {"build": threading.Lock(), "swap": threading.Lock()}
+
+    def current(self) -> CatalogSnapshot | None:
+        """The snapshot to serve from, or None when reads must go to SQLite."""
+        if in_transaction():
+            # The transaction's own uncommitted writes are not in any snapshot
+            return None
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._snapshot = None
+            if time.monotonic() >= self._retry_at:
+                self.schedule_rebuild()
+            return None
+
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.identity != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                snapshot = CatalogSnapshot(self.path)
+            except (FileNotFoundError, ValueError):
+                return None
+            # Verify a newly mapped file once: it may predate writes made while no app ran
+            self._snapshot, self._verified_at = snapshot, 0.0
+            snapshot_bytes.set(snapshot.size)
+
+        now = time.monotonic()
+        if now - self._verified_at >= self.verify_seconds:
+            self._verified_at = now
+            if catalog_seq() != snapshot.seq:
+                self.invalidate()
+                return None
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Delete the snapshot (the catalog changed) and rebuild it in the background."""
+        with self._file_lock("swap"):
+            self.path.unlink(missing_ok=True)
+        self._snapshot = None
+        self._retry_at = 0.0
+        self.schedule_rebuild()
+
+    def schedule_rebuild(self) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked worker does not inherit the parent's builder thread
+                self._builder, self._pid = None, os.getpid()
+            self._dirty = True
+            if self._builder is None:
+                self._builder = threading.Thread(target=self._build_while_dirty, name="catalog-snapshot", daemon=True)
+                self._builder.start()
+
+    def _build_while_dirty(self) -> None:
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._builder = None
+                    return
+                self._dirty = False
+            try:
+                built = self.rebuild()
+            except Exception as e:
+                logger.error("Catalog snapshot build failed", exc_info=True)
+                build_failures.inc(error=type(e).__name__)
+                built = False
+            if not built:
+                self._retry_at = time.monotonic() + CATALOG_RETRY_SECONDS
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Wait for a background build to finish, so it does not outlive the database connection."""
+        with self._lock:
+            self._dirty = False
+            builder = self._builder if self._pid == os.getpid() else None
+        if builder is not None:
+            builder.join(timeout)
+
+    def rebuild(self) -> bool:
+        """Write a snapshot of the committed catalog and swap it in.
+
+        Returns False if another process is already building one (it will pick up any
+        change it missed) or the catalog kept changing while this one was built.
+        """
+        with self._file_lock("build", blocking=False) as acquired:
+            if not acquired:
+                return False
+
+            for _ in range(CATALOG_BUILD_ATTEMPTS):
+                seq = catalog_seq()
+                started = time.perf_counter()
+                data = encode_snapshot(_read_catalog(), seq)
+
+                temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary.write_bytes(data)
+                # A write committed after `seq` was read invalidates (under this lock) after
+                # committing, so it either shows up here or deletes the file once swapped in
+                with self._file_lock("swap"):
+                    if catalog_seq() == seq:
+                        os.replace(temporary, self.path)
+                        builds_total.inc()
+                        build_seconds.observe(time.perf_counter() - started)
+                        return True
+                temporary.unlink(missing_ok=True)
+            return False
+
+    @contextmanager
+    def _file_lock(self, name: str, blocking: bool = True) -> Iterator[bool]:
+        """Exclusive between threads and processes sharing the snapshot, held for the block."""
+        if fcntl is None:
+            lock = self._thread_locks[name]
+            acquired = lock.acquire(blocking)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    lock.release()
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f".{self.path.name}.{name}.lock"), "a+") as handle:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def default_snapshot_path() -> str | None:
+    """CATALOG_SNAPSHOT_PATH, or "<database>.catalog"; None for an in-memory database."""
+    if CATALOG_SNAPSHOT_PATH:
+        return CATALOG_SNAPSHOT_PATH
+    database_path = get_database_path()
+    if database_path == ":memory:":
+        return None
+    main = Path(database_path)
+    return str(main.with_name(f"{main.stem}.catalog"))
+
+
+# Set by enable_catalog(); None while repositories read the catalog from SQLite
+store: CatalogStore | None = None
+
+
+def _on_commit(tables: set[str]) -> None:
+    if store is not None and not tables.isdisjoint(CATALOG_TABLES):
+        store.invalidate()
+
+
+def enable_catalog(path: str | None = None) -> CatalogStore | None:
+    """Serve catalog reads from the snapshot at `path` (default_snapshot_path()) in this process."""
+    global store
+    path = path or default_snapshot_path()
+    if path is None:
+        return None
+    store = CatalogStore(path)
+    if _on_commit not in commit_observers:
+        commit_observers.append(_on_commit)
+    return store
+
+
+def disable_catalog() -> None:
+    global store
+    if _on_commit in commit_observers:
+        commit_observers.remove(_on_commit)
+    if store is not None:
+        store.close()
+    store = None
+
+
+def catalog_table(table: str) -> CatalogTable | None:
+    """`table` in the current snapshot, or None when repositories should read SQLite."""
+    if store is None:
+        return None
+    snapshot = store.current()
+    return snapshot.tables.get(table) if snapshot is not None else None
@@ -3,6 +3,23 @@ from pathlib import Path
 
 DATABASE_PATH = os.getenv("DATABASE_PATH", "./data/supply_chain.db")
 PYTHON_ENV = os.getenv("PYTHON_ENV", "development")
+EXPORT_DIR = os.getenv("EXPORT_DIR", "./data/exports")
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./data/backups")
+# Cold storage for archived orders; defaults to "<database>.archive.db" next to the main file
+ARCHIVE_DATABASE_PATH = os.getenv("ARCHIVE_DATABASE_PATH", "")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Connection tuning profiles (cache_size < 0 is KiB); DB_* variables override single values
+DB_PROFILES: dict[str, dict[str, str | int]] = {
+    "durable": {"synchronous": "FULL", "cache_size": -16000, "mmap_size": 0, "temp_store": "DEFAULT"},
+    "balanced": {"synchronous": "NORMAL", "cache_size": -32000, "mmap_size": 128 * 2**20, "temp_store": "MEMORY"},
+    "fast": {"synchronous": "OFF", "cache_size": -128000, "mmap_size": 1024 * 2**20, "temp_store": "MEMORY"},
+}
+DB_PROFILE = os.getenv("DB_PROFILE", "balanced")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS")
+DB_CACHE_SIZE = os.getenv("DB_CACHE_SIZE")
+DB_MMAP_SIZE = os.getenv("DB_MMAP_SIZE")
+DB_TEMP_STORE = os.getenv("DB_TEMP_STORE")
 
 
 def get_database_path() -> str:
@@ -15,9 +32,52 @@ def get_database_path() -> str:
     return str(db_path)
 
 
+def get_archive_database_path(main_path: str) -> str:
+    """Archive file for the database at `main_path` ("" or ":memory:" for in-memory databases)."""
+    if main_path in ("", ":memory:"):
+        return ":memory:"
+    if ARCHIVE_DATABASE_PATH:
+        return ARCHIVE_DATABASE_PATH
+    return str(archive_path_beside(Path(main_path)))
+
+
+def archive_path_beside(main_path: Path) -> Path:
+    """The default archive file name for `main_path`: `<stem>.archive<suffix>` in the same directory."""
+    return main_path.with_name(f"{main_path.stem}.archive{main_path.suffix or '.db'}")
+
+
+def get_connection_pragmas() -> dict[str, str | int]:
+    if DB_PROFILE not in DB_PROFILES:
+        raise ValueError(f"DB_PROFILE must be one of: {', '.join(DB_PROFILES)}")
+
+    pragmas = dict(DB_PROFILES[DB_PROFILE])
+    overrides = {
+        "synchronous": DB_SYNCHRONOUS,
+        "cache_size": DB_CACHE_SIZE,
+        "mmap_size": DB_MMAP_SIZE,
+        "temp_store": DB_TEMP_STORE,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value})
+    return pragmas
+
+
 def get_migrations_dir() -> Path:
     return Path(__file__).parent.parent.parent / "database" / "migrations"
 
 
 def get_seed_dir() -> Path:
     return Path(__file__).parent.parent.parent / "database" / "seed"
+
+
+def get_export_dir() -> Path:
+    export_dir = Path(EXPORT_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+
+    return export_dir
+
+
+def get_backup_dir() -> Path:
+    backup_dir = Path(BACKUP_DIR)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    return backup_dir
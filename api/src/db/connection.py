@@ -1,26 +1,145 @@
+import math
+import os
+import re
 import sqlite3
-from contextlib import contextmanager
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import AbstractContextManager, ExitStack, contextmanager
 from typing import Any, Generator
 
-from src.db.config import get_database_path
+from src.db.config import DB_BUSY_TIMEOUT_MS, get_archive_database_path, get_connection_pragmas, get_database_path
+from src.db.retry import retry_on_busy
+from src.db.rows import RowFormat, build_rows
+from src.utils.metrics import metrics
+
+# Decay constant for the write-wait average once writes stop arriving
+WRITE_WAIT_DECAY_SECONDS = 5.0
+
+write_lock_wait = metrics.histogram("db_write_lock_wait_seconds", "Time spent waiting for the process write lock")
+waiting_writers_gauge = metrics.gauge("db_waiting_writers", "Writers queued for the process write lock")
+active_operations_gauge = metrics.gauge("db_active_operations", "Statements currently executing")
+
+
+class DatabaseStats:
+    """Queue depth and write-lock wait signals consumed by the admission controller."""
+
+    def __init__(self):
+        self.waiting_writers = 0
+        self.active_operations = 0
+        # Bumped by every execute() / execute_many(); request-scoped caches (src.utils.loader) drop rows read before a write
+        self.writes = 0
+        self._wait_average = 0.0
+        self._wait_updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed_average(self, now: float) -> float:
+        return self._wait_average * math.exp(-(now - self._wait_updated) / WRITE_WAIT_DECAY_SECONDS)
+
+    def record_write_wait(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._wait_average = 0.8 * self._decayed_average(now) + 0.2 * seconds
+            self._wait_updated = now
+        write_lock_wait.observe(seconds)
+
+    def write_wait_average(self) -> float:
+        """Exponentially weighted write-lock wait in seconds, decaying toward 0 when idle."""
+        with self._lock:
+            return self._decayed_average(time.monotonic())
+
+    def adjust(self, waiting: int = 0, active: int = 0) -> None:
+        with self._lock:
+            self.waiting_writers += waiting
+            self.active_operations += active
+            waiting_writers_gauge.set(self.waiting_writers)
+            active_operations_gauge.set(self.active_operations)
+
+
+db_stats = DatabaseStats()
+
+# Context manager factories entered around every statement (profiler, tracing)
+statement_observers: list[Callable[[str], AbstractContextManager]] = []
+
+# SQLite allows one writer at a time; queueing writers here instead of inside SQLite's busy
+# handler makes the queue visible (db_stats) and keeps busy_timeout for cross-process contention
+_write_lock = threading.RLock()
+
+# Every thread shares one connection, and SQLite isolates connections, not threads: a read
+# issued while another thread's write is open would see rows a rollback can still discard.
+# Reads therefore wait while a write holds the connection (read_slot); the writer's own
+# thread reads its uncommitted rows as before.
+_read_gate = threading.Condition()
+_active_readers = 0
+_writer_thread: int | None = None
+_reading = threading.local()
+
+# Set while the current thread is inside transaction(); execute() then leaves committing to it
+_transaction_state = threading.local()
+
+# Called after each commit with the tables its writes named (src.db.catalog drops its snapshot)
+commit_observers: list[Callable[[set[str]], None]] = []
+
+_WRITE_TARGET = re.compile(
+    r"\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def connect(database: str, **kwargs: Any) -> sqlite3.Connection:
+    """Open a connection that honours the `col AS "col [bool]"` converters in src.db.rows."""
+    return sqlite3.connect(database, check_same_thread=False, detect_types=sqlite3.PARSE_COLNAMES, **kwargs)
+
+
+def attach_archive(conn: sqlite3.Connection) -> None:
+    """Attach the cold-storage database as schema `archive` unless `conn` already has it (src.db.archive)."""
+    databases = {row[1]: row[2] for row in conn.execute("PRAGMA database_list").fetchall()}
+    if "archive" in databases:
+        return
+
+    archive_path = get_archive_database_path(databases.get("main", ""))
+    conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+    if archive_path != ":memory:":
+        conn.execute("PRAGMA archive.journal_mode=WAL")
 
 
 class DatabaseConnection:
+    """One lazily opened connection per process.
+
+    The owning pid is recorded so a connection inherited across fork() (e.g. gunicorn
+    --preload, or anything that touched the database before workers were forked) is never
+    used by the child: SQLite connections must not cross process boundaries.
+    """
+
     _instance: sqlite3.Connection | None = None
+    _pid: int | None = None
     _test_mode: bool = False
 
     @classmethod
     def get_connection(cls, test_mode: bool = False) -> sqlite3.Connection:
+        if cls._instance is not None and cls._pid != os.getpid():
+            cls._forget_inherited()
+
         if test_mode or cls._test_mode:
             cls._test_mode = True
-            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn = connect(":memory:")
         elif cls._instance is None:
             db_path = get_database_path()
-            cls._instance = sqlite3.connect(db_path, check_same_thread=False)
+            cls._instance = connect(db_path)
+            cls._pid = os.getpid()
+            cls._instance.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+
+            # Only takes effect on a new database; existing ones need a VACUUM to convert
+            cls._instance.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
             if db_path != ":memory:":
                 cls._instance.execute("PRAGMA journal_mode=WAL")
 
+            for name, value in get_connection_pragmas().items():
+                cls._instance.execute(f"PRAGMA {name} = {value}")
+
+            attach_archive(cls._instance)
+
             conn = cls._instance
         else:
             conn = cls._instance
@@ -30,6 +149,19 @@ class DatabaseConnection:
 
         return conn
 
+    @classmethod
+    def use_connection(cls, conn: sqlite3.Connection) -> None:
+        """Route all helpers through an externally managed connection (scratch or test databases)."""
+        cls._test_mode = False
+        cls._instance = conn
+        cls._pid = os.getpid()
+
+    @classmethod
+    def _forget_inherited(cls) -> None:
+        # Closing the parent's handle from the child could release the parent's locks; drop it
+        cls._instance = None
+        cls._pid = None
+
     @classmethod
     def close(cls) -> None:
         if cls._instance:
@@ -42,6 +174,19 @@ class DatabaseConnection:
         cls._test_mode = True
 
 
+def _after_fork_in_child() -> None:
+    global _write_lock, _read_gate, _active_readers, _writer_thread
+    DatabaseConnection._forget_inherited()
+    # A lock held by another parent thread at fork time would never be released in the child
+    _write_lock = threading.RLock()
+    _read_gate, _active_readers, _writer_thread = threading.Condition(), 0, None
+    db_stats.__init__()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     conn = DatabaseConnection.get_connection()
@@ -51,24 +196,215 @@ def get_db() -> Generator[sqlite3.Connection, None, None]:
         pass
 
 
-def execute(sql: str, params: tuple[Any, ...] | list[Any] = ()) -> sqlite3.Cursor:
-    with get_db() as conn:
-        cursor = conn.execute(sql, params)
-        conn.commit()
-        return cursor
+@contextmanager
+def observe_statement(sql: str) -> Generator[None, None, None]:
+    if not statement_observers:
+        yield
+        return
+
+    with ExitStack() as stack:
+        for observer in list(statement_observers):
+            stack.enter_context(observer(sql))
+        yield
+
+
+def in_transaction() -> bool:
+    """Whether the current thread is inside transaction(), so its writes are not committed yet."""
+    return getattr(_transaction_state, "active", False)
+
+
+def _written_tables(sql: str) -> set[str]:
+    match = _WRITE_TARGET.match(sql)
+    return {match.group(1).lower()} if match else set()
+
+
+def _notify_commit(tables: set[str]) -> None:
+    if tables:
+        for observer in list(commit_observers):
+            observer(tables)
+
+
+@contextmanager
+def write_slot() -> Generator[None, None, None]:
+    """Hold the process write lock, recording how long it took to get it.
+
+    The outermost slot also waits for reads in flight on other threads and holds off new
+    ones until it is released, by which time its writes are committed or rolled back.
+    """
+    global _writer_thread
+    db_stats.adjust(waiting=1)
+    started = time.perf_counter()
+    _write_lock.acquire()
+    outermost = _writer_thread != threading.get_ident()
+    if outermost:
+        with _read_gate:
+            _writer_thread = threading.get_ident()
+            _read_gate.wait_for(lambda: _active_readers == 0)
+    db_stats.adjust(waiting=-1, active=1)
+    db_stats.record_write_wait(time.perf_counter() - started)
+    try:
+        yield
+    finally:
+        db_stats.adjust(active=-1)
+        if outermost:
+            with _read_gate:
+                _writer_thread = None
+                _read_gate.notify_all()
+        _write_lock.release()
+
+
+@contextmanager
+def read_slot() -> Generator[None, None, None]:
+    """Wait until no other thread has a write open on the shared connection, and keep it that way.
+
+    fetch_one()/fetch_all() take it around each statement; code reading through get_db()
+    directly should too, one short read at a time, since writers wait for it.
+    """
+    global _active_readers
+    if _writer_thread == threading.get_ident() or getattr(_reading, "active", False):
+        yield
+        return
+
+    with _read_gate:
+        _read_gate.wait_for(lambda: _writer_thread is None)
+        _active_readers += 1
+    _reading.active = True
+    try:
+        yield
+    finally:
+        _reading.active = False
+        with _read_gate:
+            _active_readers -= 1
+            if not _active_readers:
+                _read_gate.notify_all()
+
+
+@contextmanager
+def transaction() -> Generator[sqlite3.Connection, None, None]:
+    """Run several writes atomically: BEGIN IMMEDIATE under the write slot, commit or roll back.
+
+    execute() calls inside the block join it instead of committing; nested blocks join the
+    outermost one. On a connection already inside a transaction (the test harness keeps
+    each test in a savepoint) the block becomes a savepoint of its own.
+    """
+    if getattr(_transaction_state, "active", False):
+        with get_db() as conn:
+            yield conn
+        return
+
+    with get_db() as conn, write_slot():
+        nested = conn.in_transaction
+        conn.execute("SAVEPOINT unit_of_work" if nested else "BEGIN IMMEDIATE")
+        _transaction_state.active = True
+        _transaction_state.written = set()
+        try:
+            yield conn
+        except BaseException:
+            if nested:
+                conn.execute("ROLLBACK TO unit_of_work")
+                conn.execute("RELEASE unit_of_work")
+            else:
+                conn.rollback()
+            raise
+        else:
+            if nested:
+                conn.execute("RELEASE unit_of_work")
+            else:
+                conn.commit()
+        finally:
+            _transaction_state.active = False
+    _notify_commit(_transaction_state.written)
+
+
+def execute(sql: str, params: tuple[Any, ...] | list[Any] = (), idempotent: bool = False) -> sqlite3.Cursor:
+    """Execute and commit a write. Pass idempotent=True to retry it on SQLITE_BUSY."""
+    db_stats.writes += 1
+    if getattr(_transaction_state, "active", False):
+        # Part of the caller's transaction(): it commits, and retries the whole unit if it wants to
+        if commit_observers:
+            _transaction_state.written |= _written_tables(sql)
+        with get_db() as conn, observe_statement(sql):
+            return conn.execute(sql, params)
+
+    def run() -> sqlite3.Cursor:
+        with get_db() as conn, write_slot(), observe_statement(sql):
+            try:
+                cursor = conn.execute(sql, params)
+                conn.commit()
+                return cursor
+            except sqlite3.OperationalError:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    cursor = retry_on_busy(run, "write") if idempotent else run()
+    if commit_observers:
+        _notify_commit(_written_tables(sql))
+    return cursor
+
+
+def execute_many(sql: str, rows: Iterable[Sequence[Any]]) -> sqlite3.Cursor:
+    """executemany() counterpart of execute(): one prepared statement run for every row.
+
+    Outside transaction() the rows commit together, or none do if one fails.
+    """
+    db_stats.writes += 1
+    if getattr(_transaction_state, "active", False):
+        if commit_observers:
+            _transaction_state.written |= _written_tables(sql)
+        with get_db() as conn, observe_statement(sql):
+            return conn.executemany(sql, rows)
+
+    with get_db() as conn, write_slot(), observe_statement(sql):
+        try:
+            cursor = conn.executemany(sql, rows)
+            conn.commit()
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    if commit_observers:
+        _notify_commit(_written_tables(sql))
+    return cursor
+
+
+def _read(operation):
+    db_stats.adjust(active=1)
+    try:
+        return retry_on_busy(operation, "read")
+    finally:
+        db_stats.adjust(active=-1)
+
+
+def _query(conn: sqlite3.Connection, sql: str, params: tuple[Any, ...] | list[Any]) -> sqlite3.Cursor:
+    # Plain tuples from sqlite3; build_rows shapes them once instead of Row -> dict copies
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def fetch_one(
+    sql: str, params: tuple[Any, ...] | list[Any] = (), row_format: RowFormat = "dict", name: str = "row"
+) -> Any | None:
+    def run() -> Any | None:
+        with read_slot(), get_db() as conn, observe_statement(sql):
+            cursor = _query(conn, sql, params)
+            row = cursor.fetchone()
+            if row:
+                return build_rows(cursor, [row], row_format, name)[0]
+            return None
+
+    return _read(run)
 
 
-def fetch_one(sql: str, params: tuple[Any, ...] | list[Any] = ()) -> dict[str, Any] | None:
-    with get_db() as conn:
-        cursor = conn.execute(sql, params)
-        row = cursor.fetchone()
-        if row:
-            return dict(row)
-        return None
+def fetch_all(
+    sql: str, params: tuple[Any, ...] | list[Any] = (), row_format: RowFormat = "dict", name: str = "row"
+) -> Any:
+    """Fetch every row as dicts (default), a shared-index `Rows` of tuples, or namedtuple records."""
 
+    def run() -> Any:
+        with read_slot(), get_db() as conn, observe_statement(sql):
+            cursor = _query(conn, sql, params)
+            return build_rows(cursor, cursor.fetchall(), row_format, name)
 
-def fetch_all(sql: str, params: tuple[Any, ...] | list[Any] = ()) -> list[dict[str, Any]]:
-    with get_db() as conn:
-        cursor = conn.execute(sql, params)
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+    return _read(run)
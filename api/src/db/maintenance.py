@@ -0,0 +1,304 @@
+import ctypes
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.db.archive import ARCHIVE_INTERVAL_SECONDS, archive_closed_orders
+from src.db.connection import get_db, write_slot
+from src.repositories.change_log_repo import CHANGE_LOG_COMPACT_INTERVAL_SECONDS, compact_change_log
+from src.utils.metrics import metrics
+
+DB_MAINTENANCE_TICK_SECONDS = float(os.getenv("DB_MAINTENANCE_TICK_SECONDS", "5"))
+DB_WAL_CHECK_INTERVAL_SECONDS = int(os.getenv("DB_WAL_CHECK_INTERVAL_SECONDS", "30"))
+DB_WAL_CHECKPOINT_BYTES = int(os.getenv("DB_WAL_CHECKPOINT_BYTES", str(16 * 2**20)))
+DB_WAL_TRUNCATE_BYTES = int(os.getenv("DB_WAL_TRUNCATE_BYTES", str(64 * 2**20)))
+DB_OPTIMIZE_INTERVAL_SECONDS = int(os.getenv("DB_OPTIMIZE_INTERVAL_SECONDS", "3600"))
+DB_ANALYZE_INTERVAL_SECONDS = int(os.getenv("DB_ANALYZE_INTERVAL_SECONDS", str(24 * 60 * 60)))
+DB_VACUUM_INTERVAL_SECONDS = int(os.getenv("DB_VACUUM_INTERVAL_SECONDS", "900"))
+DB_VACUUM_MIN_FREE_PAGES = int(os.getenv("DB_VACUUM_MIN_FREE_PAGES", "256"))
+DB_VACUUM_STEP_PAGES = int(os.getenv("DB_VACUUM_STEP_PAGES", "128"))
+DB_STATS_INTERVAL_SECONDS = int(os.getenv("DB_STATS_INTERVAL_SECONDS", "15"))
+# Page cache hit/miss counters come from sqlite3_db_status(), which the stdlib module doesn't
+# expose; reading them relies on CPython's private object layout, so it is opt-in
+DB_CACHE_STATS = os.getenv("DB_CACHE_STATS", "false").lower() == "true"
+
+wal_bytes = metrics.gauge("db_wal_bytes", "Size of the -wal file")
+page_count = metrics.gauge("db_page_count", "Pages in the main database file")
+freelist_pages = metrics.gauge("db_freelist_pages", "Unused pages waiting to be vacuumed")
+cache_hit_ratio = metrics.gauge("db_cache_hit_ratio", "Page cache hits / (hits + misses) for this process's connection")
+cache_lookups = metrics.gauge("db_cache_lookups", "Page cache lookups since the connection opened")
+checkpoints = metrics.counter("db_wal_checkpoints_total", "WAL checkpoints run by maintenance")
+vacuumed_pages = metrics.counter("db_vacuumed_pages_total", "Pages released by incremental vacuum")
+maintenance_runs = metrics.counter("db_maintenance_runs_total", "Maintenance task runs")
+maintenance_seconds = metrics.histogram("db_maintenance_seconds", "Maintenance task duration")
+
+# sqlite3_db_status() verbs
+_DBSTATUS_CACHE_HIT = 7
+_DBSTATUS_CACHE_MISS = 8
+
+
+def _load_db_status() -> Callable[[sqlite3.Connection, int], int] | None:
+    """sqlite3_db_status() for a Python connection with DB_CACHE_STATS on, otherwise None.
+
+    The sqlite3* handle is read as the first field after the object header. That layout is
+    a CPython implementation detail, and a wrong guess crashes the process before the
+    sqlite3_db_filename() check below can catch it, so this only runs when asked for.
+    """
+    if not DB_CACHE_STATS:
+        return None
+    try:
+        import _sqlite3
+
+        library = ctypes.CDLL(_sqlite3.__file__)
+        db_status = library.sqlite3_db_status
+        db_status.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+        db_filename = library.sqlite3_db_filename
+        db_filename.restype = ctypes.c_char_p
+        db_filename.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+    except (ImportError, OSError, AttributeError):
+        return None
+
+    def status(conn: sqlite3.Connection, verb: int) -> int:
+        handle = ctypes.c_void_p.from_address(id(conn) + object.__basicsize__).value
+        filename = conn.execute("PRAGMA database_list").fetchone()[2]
+        if not handle or (db_filename(handle, b"main") or b"").decode() != filename:
+            raise RuntimeError("Unexpected sqlite3 connection layout")
+
+        current, highwater = ctypes.c_int(), ctypes.c_int()
+        if db_status(handle, verb, ctypes.byref(current), ctypes.byref(highwater), 0) != 0:
+            raise RuntimeError("sqlite3_db_status failed")
+        return current.value
+
+    return status
+
+
+_db_status = _load_db_status()
+
+
+def wal_size(conn: sqlite3.Connection) -> int:
+    filename = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not filename:
+        return 0
+    wal_path = Path(f"{filename}-wal")
+    return wal_path.stat().st_size if wal_path.exists() else 0
+
+
+def collect_stats() -> dict[str, Any]:
+    """Database size, WAL size and (with DB_CACHE_STATS) page cache counters, also published as gauges."""
+    global _db_status
+
+    with get_db() as conn:
+        stats: dict[str, Any] = {
+            "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "auto_vacuum": ("none", "full", "incremental")[conn.execute("PRAGMA auto_vacuum").fetchone()[0]],
+            "wal_bytes": wal_size(conn),
+            "cache_hits": None,
+            "cache_misses": None,
+            "cache_hit_ratio": None,
+        }
+
+        if _db_status is not None:
+            try:
+                hits = _db_status(conn, _DBSTATUS_CACHE_HIT)
+                misses = _db_status(conn, _DBSTATUS_CACHE_MISS)
+            except RuntimeError as e:
+                print(f"Page cache statistics unavailable: {e}")
+                _db_status = None
+            else:
+                stats.update(cache_hits=hits, cache_misses=misses)
+                if hits + misses:
+                    stats["cache_hit_ratio"] = hits / (hits + misses)
+
+    wal_bytes.set(stats["wal_bytes"])
+    page_count.set(stats["page_count"])
+    freelist_pages.set(stats["freelist_count"])
+    if stats["cache_hits"] is not None:
+        cache_lookups.set(stats["cache_hits"], result="hit")
+        cache_lookups.set(stats["cache_misses"], result="miss")
+    if stats["cache_hit_ratio"] is not None:
+        cache_hit_ratio.set(stats["cache_hit_ratio"])
+    return stats
+
+
+def checkpoint_wal(force: bool = False) -> dict[str, Any]:
+    """Checkpoint once the WAL passes DB_WAL_CHECKPOINT_BYTES; truncate it past DB_WAL_TRUNCATE_BYTES.
+
+    SQLite's automatic checkpoints are PASSIVE and never finish while readers keep old
+    snapshots open, which is how the WAL keeps growing under sustained reads. Holding the
+    process write lock keeps our own writers out so RESTART/TRUNCATE can complete.
+    """
+    with get_db() as conn:
+        size = wal_size(conn)
+        if not force and size < DB_WAL_CHECKPOINT_BYTES:
+            return {"wal_bytes": size, "mode": None}
+
+        mode = "TRUNCATE" if force or size >= DB_WAL_TRUNCATE_BYTES else "PASSIVE"
+        with write_slot():
+            busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+        checkpoints.inc(mode=mode.lower())
+        after = wal_size(conn)
+        wal_bytes.set(after)
+        return {
+            "mode": mode,
+            "busy": bool(busy),
+            "log_frames": log_frames,
+            "checkpointed_frames": checkpointed,
+            "wal_bytes_before": size,
+            "wal_bytes": after,
+        }
+
+
+def optimize() -> dict[str, Any]:
+    """PRAGMA optimize: re-analyzes only tables whose statistics are stale."""
+    with get_db() as conn, write_slot():
+        conn.execute("PRAGMA optimize").fetchall()
+    return {}
+
+
+def analyze() -> dict[str, Any]:
+    """Full ANALYZE, bounded by analysis_limit so it stays cheap on large tables."""
+    with get_db() as conn, write_slot():
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE")
+        conn.commit()
+    return {}
+
+
+def incremental_vacuum(min_free_pages: int = DB_VACUUM_MIN_FREE_PAGES, step_pages: int = DB_VACUUM_STEP_PAGES) -> dict[str, Any]:
+    """Release free pages (left by cascading deletes) back to the filesystem in small steps.
+
+    Each step holds the write lock only briefly. Databases created before auto_vacuum was
+    enabled need one full VACUUM (run_task("vacuum")) before this has any effect.
+    """
+    with get_db() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return {"released_pages": 0, "skipped": "auto_vacuum is not INCREMENTAL"}
+
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free < min_free_pages:
+            return {"released_pages": 0, "freelist_count": free}
+
+        released = 0
+        while free > 0:
+            with write_slot():
+                conn.execute(f"PRAGMA incremental_vacuum({step_pages})").fetchall()
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free:
+                break
+            released += free - remaining
+            free = remaining
+
+    vacuumed_pages.inc(released)
+    freelist_pages.set(free)
+    return {"released_pages": released, "freelist_count": free}
+
+
+def full_vacuum() -> dict[str, Any]:
+    """Rebuild the file; also converts an existing database to incremental auto_vacuum."""
+    with get_db() as conn, write_slot():
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    return collect_stats()
+
+
+def compact_change_log_task() -> dict[str, Any]:
+    return {"deleted": compact_change_log()}
+
+
+@dataclass
+class MaintenanceTask:
+    name: str
+    interval: float
+    run: Callable[[], dict[str, Any]]
+    # Tasks that write only run in the process holding the maintenance lock
+    leader_only: bool = True
+    next_run: float = 0.0
+    last_run: float | None = None
+    last_duration: float | None = None
+    last_result: dict[str, Any] | None = None
+    last_error: str | None = None
+
+
+@dataclass
+class MaintenanceScheduler:
+    tasks: dict[str, MaintenanceTask] = field(default_factory=dict)
+    leader: bool = False
+    clock: Callable[[], float] = time.monotonic
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, task: MaintenanceTask) -> None:
+        # Spread first runs out instead of doing everything at startup
+        task.next_run = self.clock() + min(task.interval, DB_WAL_CHECK_INTERVAL_SECONDS)
+        self.tasks[task.name] = task
+
+    def run_task(self, name: str) -> MaintenanceTask:
+        task = self.tasks[name]
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                task.last_result = task.run()
+                task.last_error = None
+            except Exception as e:
+                traceback.print_exc()
+                task.last_error = str(e)
+            finally:
+                task.last_duration = time.perf_counter() - started
+                task.last_run = time.time()
+                task.next_run = self.clock() + task.interval
+
+        maintenance_runs.inc(task=name, outcome="error" if task.last_error else "ok")
+        maintenance_seconds.observe(task.last_duration, task=name)
+        return task
+
+    def run_due(self) -> list[str]:
+        now = self.clock()
+        due = [
+            task.name for task in self.tasks.values()
+            if task.next_run <= now and (self.leader or not task.leader_only)
+        ]
+        for name in due:
+            self.run_task(name)
+        return due
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": task.name,
+                "intervalSeconds": task.interval,
+                "leaderOnly": task.leader_only,
+                "lastRun": task.last_run,
+                "lastDurationMs": round(task.last_duration * 1000, 3) if task.last_duration is not None else None,
+                "lastResult": task.last_result,
+                "lastError": task.last_error,
+            }
+            for task in self.tasks.values()
+        ]
+
+
+def create_scheduler(leader: bool = False) -> MaintenanceScheduler:
+    scheduler = MaintenanceScheduler(leader=leader)
+    scheduler.add(MaintenanceTask("stats", DB_STATS_INTERVAL_SECONDS, collect_stats, leader_only=False))
+    scheduler.add(MaintenanceTask("checkpoint", DB_WAL_CHECK_INTERVAL_SECONDS, checkpoint_wal))
+    scheduler.add(MaintenanceTask("optimize", DB_OPTIMIZE_INTERVAL_SECONDS, optimize))
+    scheduler.add(MaintenanceTask("analyze", DB_ANALYZE_INTERVAL_SECONDS, analyze))
+    scheduler.add(MaintenanceTask("incremental_vacuum", DB_VACUUM_INTERVAL_SECONDS, incremental_vacuum))
+    scheduler.add(MaintenanceTask("compact_change_log", CHANGE_LOG_COMPACT_INTERVAL_SECONDS, compact_change_log_task))
+    scheduler.add(MaintenanceTask("archive_orders", ARCHIVE_INTERVAL_SECONDS, archive_closed_orders))
+    # On demand only (admin endpoint): rewrites the whole file
+    scheduler.tasks["vacuum"] = MaintenanceTask("vacuum", float("inf"), full_vacuum, next_run=float("inf"))
+    return scheduler
+
+
+# Process-wide; the lifespan decides whether this process is the maintenance leader
+maintenance = create_scheduler()
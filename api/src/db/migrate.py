@@ -1,6 +1,8 @@
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from src.db.archive import sync_archive_schema
 from src.db.config import get_migrations_dir
 from src.db.connection import execute, fetch_all
 
@@ -36,10 +38,25 @@ class MigrationRunner:
 
         return pending
 
+    @staticmethod
+    def _split_statements(sql_content: str) -> list[str]:
+        # Accumulate ";"-separated pieces until SQLite considers them a complete statement,
+        # so trigger bodies (BEGIN ... ; ... END) stay in one piece
+        statements = []
+        buffer = ""
+        for piece in sql_content.split(";"):
+            buffer += piece + ";"
+            if sqlite3.complete_statement(buffer):
+                statement = buffer.strip()
+                if statement.rstrip(";").strip():
+                    statements.append(statement)
+                buffer = ""
+        return statements
+
     def _apply_migration(self, version: str, file_path: Path) -> None:
         sql_content = file_path.read_text()
 
-        statements = [s.strip() for s in sql_content.split(";") if s.strip()]
+        statements = self._split_statements(sql_content)
 
         for statement in statements:
             if statement:
@@ -54,12 +71,12 @@ class MigrationRunner:
     def run_migrations(self) -> list[str]:
         pending = self._get_pending_migrations()
 
-        if not pending:
-            return []
-
         applied = []
         for version, file_path in pending:
             self._apply_migration(version, file_path)
             applied.append(version)
 
+        # Also covers a fresh or replaced archive file next to an up-to-date database
+        sync_archive_schema()
+
         return applied
@@ -0,0 +1,256 @@
+import importlib
+import inspect
+import pkgutil
+import re
+import sqlite3
+import types
+import typing
+from dataclasses import dataclass, field
+from typing import Any
+
+import src.repositories
+from src.db.connection import DatabaseConnection, connect
+from src.db.migrate import MigrationRunner
+from src.db.seed import Seeder
+
+# Methods that do not issue queries worth auditing (or have side effects outside the database)
+SKIP_METHODS = {"export_to_file", "validate_product_data"}
+
+# Queries that are known to scan and are accepted, with the reason
+ALLOWED_SCANS = {
+    "ProductsRepository.find_by_name": "leading-wildcard LIKE cannot use a B-tree index",
+}
+
+# Shared base classes, audited through their subclasses
+BASE_REPOSITORIES = {"BaseRepository", "StatusRepository"}
+
+# Write methods run last so reads see seeded rows
+WRITE_METHOD_ORDER = ("create", "update", "delete")
+
+SAMPLE_ARGS_BY_NAME: dict[str, Any] = {
+    "status": "pending",
+    "start_date": "2024-01-01",
+    "end_date": "2024-12-31",
+    "interval": "month",
+    "lines": [{"product_id": 1, "quantity": 1}],
+    "name": "cat",
+    "rows": [{"supplier_id": 1, "name": "Audit", "price": 1.0, "sku": "AUDIT-1", "unit": "each"}],
+}
+
+SAMPLE_ARGS_BY_TYPE: dict[Any, Any] = {
+    int: 1,
+    float: 1.0,
+    str: "audit",
+    bytes: b"",
+    bool: True,
+}
+
+AUDITED_PREFIXES = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+@dataclass
+class QueryFinding:
+    source: str
+    sql: str
+    plan: list[str]
+    problems: list[str] = field(default_factory=list)
+    allowed_reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems or self.allowed_reason is not None
+
+
+@dataclass
+class AuditReport:
+    findings: list[QueryFinding] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    unindexed_foreign_keys: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(f.ok for f in self.findings) and not self.unindexed_foreign_keys
+
+
+def discover_repositories() -> list[type]:
+    classes = []
+    for module_info in pkgutil.iter_modules(src.repositories.__path__):
+        module = importlib.import_module(f"src.repositories.{module_info.name}")
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if name.endswith("Repository") and name not in BASE_REPOSITORIES and obj.__module__ == module.__name__:
+                classes.append(obj)
+    return sorted(classes, key=lambda cls: cls.__name__)
+
+
+def _sample_row(conn: sqlite3.Connection, table: str, id_column: str) -> dict[str, Any]:
+    data = {}
+    for column in conn.execute(f"PRAGMA table_info({table})").fetchall():
+        name, declared_type = column[1], (column[2] or "").upper()
+        if name == id_column:
+            continue
+        if "INT" in declared_type:
+            data[name] = 1
+        elif "REAL" in declared_type or "FLOA" in declared_type:
+            data[name] = 1.0
+        else:
+            data[name] = "2024-06-01" if name.endswith("_date") else "audit"
+    return data
+
+
+def _sample_for_annotation(annotation: Any) -> Any:
+    if annotation in SAMPLE_ARGS_BY_TYPE:
+        return SAMPLE_ARGS_BY_TYPE[annotation]
+    # Optional[X] / X | None
+    if typing.get_origin(annotation) not in (typing.Union, types.UnionType):
+        return None
+    for arg in typing.get_args(annotation):
+        if arg in SAMPLE_ARGS_BY_TYPE:
+            return SAMPLE_ARGS_BY_TYPE[arg]
+    return None
+
+
+def _build_args(method, repo, conn: sqlite3.Connection) -> list[Any] | None:
+    args = []
+    for param in inspect.signature(method).parameters.values():
+        if param.default is not inspect.Parameter.empty:
+            continue
+        sample = _sample_for_annotation(param.annotation)
+        if param.name in SAMPLE_ARGS_BY_NAME:
+            args.append(SAMPLE_ARGS_BY_NAME[param.name])
+        elif sample is not None:
+            args.append(sample)
+        elif param.name == "data" and hasattr(repo, "table"):
+            args.append(_sample_row(conn, repo.table, getattr(repo, "id_column", "")))
+        elif getattr(param.annotation, "__origin__", None) is list:
+            args.append([1, 2, 3])
+        elif getattr(param.annotation, "__origin__", None) is dict:
+            args.append({})
+        else:
+            return None
+    return args
+
+
+def _method_order(name: str) -> tuple[int, str]:
+    for index, prefix in enumerate(WRITE_METHOD_ORDER, start=1):
+        if name.startswith(prefix):
+            return index, name
+    return 0, name
+
+
+def capture_statements(conn: sqlite3.Connection, report: AuditReport) -> list[tuple[str, str]]:
+    """Run every public repository method against `conn` and collect the SQL it emits."""
+    captured: list[tuple[str, str]] = []
+    current_source = [""]
+
+    def trace(statement: str) -> None:
+        if statement.lstrip().upper().startswith(AUDITED_PREFIXES):
+            captured.append((current_source[0], statement.strip()))
+
+    conn.set_trace_callback(trace)
+    try:
+        for repo_class in discover_repositories():
+            repo = repo_class()
+            names = [n for n, _ in inspect.getmembers(repo, inspect.ismethod) if not n.startswith("_")]
+            for name in sorted(names, key=_method_order):
+                source = f"{repo_class.__name__}.{name}"
+                if name in SKIP_METHODS:
+                    continue
+
+                method = getattr(repo, name)
+                args = _build_args(method, repo, conn)
+                if args is None:
+                    report.skipped.append(source)
+                    continue
+
+                current_source[0] = source
+                try:
+                    method(*args)
+                except Exception:
+                    # Constraint failures still emit the statement, which is all we need
+                    pass
+    finally:
+        conn.set_trace_callback(None)
+
+    seen = set()
+    unique = []
+    for source, statement in captured:
+        if (source, statement) not in seen:
+            seen.add((source, statement))
+            unique.append((source, statement))
+    return unique
+
+
+def _tables(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    return {row[0] for row in rows}
+
+
+def check_plan(conn: sqlite3.Connection, source: str, statement: str, tables: set[str]) -> QueryFinding:
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()]
+    finding = QueryFinding(source=source, sql=statement, plan=plan)
+    has_where = re.search(r"\bWHERE\b", statement, re.IGNORECASE) is not None
+
+    for detail in plan:
+        match = re.match(r"SCAN (\w+)", detail)
+        # An FTS5 MATCH (idxStr "M…") or rowid lookup ("=") is the virtual table's index
+        indexed_virtual = re.search(r"VIRTUAL TABLE INDEX \d+:\S*[M=]", detail) is not None
+        if match and match.group(1) in tables and "USING" not in detail and not indexed_virtual and has_where:
+            finding.problems.append(f"full scan: {detail}")
+        if "USE TEMP B-TREE" in detail:
+            finding.problems.append(f"sort: {detail}")
+
+    if finding.problems:
+        finding.allowed_reason = ALLOWED_SCANS.get(source)
+
+    return finding
+
+
+def check_foreign_key_indexes(conn: sqlite3.Connection) -> list[str]:
+    """Foreign key child columns without a leading index make ON DELETE CASCADE scan the child table."""
+    problems = []
+    for table in sorted(_tables(conn)):
+        leading_columns = set()
+        for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+            columns = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+            if columns:
+                leading_columns.add(columns[0][2])
+
+        for fk in conn.execute(f"PRAGMA foreign_key_list({table})").fetchall():
+            if fk[3] not in leading_columns:
+                problems.append(f"{table}.{fk[3]} -> {fk[2]}.{fk[4]}")
+    return problems
+
+
+def open_scratch_database(source_path: str | None = None) -> sqlite3.Connection:
+    """A migrated, seeded in-memory database, optionally cloned from an existing file."""
+    conn = connect(":memory:")
+    if source_path:
+        source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+    return conn
+
+
+def run_audit(source_path: str | None = None) -> AuditReport:
+    report = AuditReport()
+    conn = open_scratch_database(source_path)
+    previous = DatabaseConnection._instance, DatabaseConnection._test_mode
+    DatabaseConnection.use_connection(conn)
+
+    try:
+        conn.row_factory = sqlite3.Row
+        MigrationRunner().run_migrations()
+        Seeder().seed_database()
+
+        tables = _tables(conn)
+        for source, statement in capture_statements(conn, report):
+            report.findings.append(check_plan(conn, source, statement, tables))
+
+        report.unindexed_foreign_keys = check_foreign_key_indexes(conn)
+    finally:
+        DatabaseConnection._instance, DatabaseConnection._test_mode = previous
+        conn.close()
+
+    return report
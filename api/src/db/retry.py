@@ -0,0 +1,56 @@
+import os
+import random
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from src.utils.metrics import metrics
+
+DB_BUSY_RETRIES = int(os.getenv("DB_BUSY_RETRIES", "3"))
+DB_BUSY_RETRY_BASE_MS = float(os.getenv("DB_BUSY_RETRY_BASE_MS", "20"))
+DB_BUSY_RETRY_MAX_MS = float(os.getenv("DB_BUSY_RETRY_MAX_MS", "500"))
+
+T = TypeVar("T")
+
+busy_retries = metrics.counter("db_busy_retries_total", "Statements retried after SQLITE_BUSY/SQLITE_LOCKED")
+busy_failures = metrics.counter("db_busy_failures_total", "Statements that stayed busy after all retries")
+
+
+def is_busy_error(error: BaseException) -> bool:
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff in seconds, so retrying writers don't move in lockstep."""
+    cap = min(DB_BUSY_RETRY_MAX_MS, DB_BUSY_RETRY_BASE_MS * (2 ** attempt))
+    return random.uniform(0, cap) / 1000.0
+
+
+def retry_on_busy(operation: Callable[[], T], kind: str, attempts: int = DB_BUSY_RETRIES) -> T:
+    """Run `operation`, retrying SQLITE_BUSY/LOCKED failures up to `attempts` more times.
+
+    Only wrap idempotent work: a retried statement runs again from the start.
+    """
+    attempt = 0
+    while True:
+        try:
+            return operation()
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e):
+                raise
+            if attempt >= attempts:
+                busy_failures.inc(kind=kind)
+                raise
+
+            busy_retries.inc(kind=kind)
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
@@ -0,0 +1,73 @@
+import sqlite3
+from collections import namedtuple
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from typing import Any, Literal
+
+RowFormat = Literal["dict", "tuple", "record"]
+ROW_FORMATS = ("dict", "tuple", "record")
+
+
+def _convert_bool(value: bytes) -> bool:
+    return value not in (b"0", b"")
+
+
+# Applied to columns selected as `col AS "col [bool]"` on connections opened with PARSE_COLNAMES
+sqlite3.register_converter("bool", _convert_bool)
+
+
+class Rows(Sequence[tuple]):
+    """Result rows kept as the plain tuples sqlite3 returns, sharing one column index.
+
+    Each row costs one tuple instead of a tuple plus a dict with its own key table.
+    """
+
+    __slots__ = ("columns", "index", "rows")
+
+    def __init__(self, columns: tuple[str, ...], rows: list[tuple]):
+        self.columns = columns
+        self.index = {name: position for position, name in enumerate(columns)}
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        return self.rows[position]
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.rows)
+
+    def value(self, row: tuple, column: str) -> Any:
+        return row[self.index[column]]
+
+    def column(self, name: str) -> list[Any]:
+        position = self.index[name]
+        return [row[position] for row in self.rows]
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        return [dict(zip(self.columns, row, strict=True)) for row in self.rows]
+
+
+@lru_cache(maxsize=256)
+def record_type(name: str, columns: tuple[str, ...]) -> type:
+    """A namedtuple class (tuple storage, no per-instance __dict__) for one result shape."""
+    type_name = "".join(part.capitalize() for part in name.split("_")) + "Record"
+    return namedtuple(type_name, columns, rename=True)
+
+
+def column_names(cursor: sqlite3.Cursor) -> tuple[str, ...]:
+    return tuple(description[0] for description in cursor.description or ())
+
+
+def build_rows(cursor: sqlite3.Cursor, rows: list[tuple], row_format: RowFormat, name: str = "row"):
+    """Shape tuples fetched from `cursor` into dicts, a shared-index Rows, or records."""
+    columns = column_names(cursor)
+    if row_format == "dict":
+        return [dict(zip(columns, row, strict=True)) for row in rows]
+    if row_format == "tuple":
+        return Rows(columns, rows)
+    if row_format == "record":
+        make = record_type(name, columns)._make
+        return [make(row) for row in rows]
+    raise ValueError(f"Unknown row format: {row_format}")
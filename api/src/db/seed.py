@@ -1,4 +1,5 @@
 import sqlite3
+from collections.abc import Callable
 from pathlib import Path
 
 from src.db.config import get_seed_dir
@@ -28,7 +29,7 @@ class Seeder:
         for statement in statements:
             execute(statement)
 
-    def seed_database(self, force: bool = False) -> list[str]:
+    def seed_database(self, force: bool = False, on_progress: Callable[[str, int, int], None] | None = None) -> list[str]:
         if not force and self._check_if_seeded("suppliers"):
             return []
 
@@ -39,10 +40,13 @@ class Seeder:
         seed_files = sorted(self.seed_dir.glob("*.sql"))
         applied = []
 
-        for file_path in seed_files:
+        for index, file_path in enumerate(seed_files, start=1):
             self._apply_seed_file(file_path)
             applied.append(file_path.stem)
 
+            if on_progress:
+                on_progress(file_path.stem, index, len(seed_files))
+
         return applied
 
     def clear_database(self) -> None:
@@ -0,0 +1,119 @@
+import csv
+import json
+from datetime import datetime
+from typing import Any
+
+from src.db.backup import create_snapshot
+from src.db.cascade import delete_in_chunks, plan_cascade
+from src.db.config import get_export_dir
+from src.db.connection import fetch_one, get_db, read_slot
+from src.db.rows import column_names
+from src.db.seed import Seeder
+from src.jobs.runner import JobContext, JobRunner
+from src.utils.errors import ValidationError
+
+EXPORTABLE_TABLES = {
+    "suppliers": "supplier_id",
+    "headquarters": "headquarters_id",
+    "branches": "branch_id",
+    "products": "product_id",
+    "orders": "order_id",
+    "order_details": "order_detail_id",
+    "deliveries": "delivery_id",
+    "order_detail_deliveries": "order_detail_delivery_id",
+}
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_CHUNK_SIZE = 1000
+
+
+def reseed_database(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    """Clear every table and reload the seed files (Seeder.seed_database(force=True))."""
+    context.report_progress(0.0, "Clearing database", force=True)
+
+    def on_progress(name: str, done: int, total: int) -> None:
+        context.report_progress(done / total, f"Seeded {name}")
+
+    seeded = Seeder().seed_database(force=True, on_progress=on_progress)
+    return {"seeded": seeded}
+
+
+def export_table(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    """Stream a whole table to a CSV or NDJSON file in EXPORT_DIR, chunk by chunk."""
+    table = params.get("table")
+    export_format = params.get("format", "ndjson")
+
+    if table not in EXPORTABLE_TABLES:
+        raise ValidationError(f"Table must be one of: {', '.join(EXPORTABLE_TABLES)}")
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError(f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    total = fetch_one(f"SELECT COUNT(*) AS count FROM {table}")["count"]
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    path = get_export_dir() / f"{table}-{context.job_id}-{timestamp}.{export_format}"
+    exported = 0
+
+    try:
+        with get_db() as conn, open(path, "w", newline="", encoding="utf-8") as f:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            with read_slot():
+                cursor.execute(f"SELECT * FROM {table} ORDER BY {EXPORTABLE_TABLES[table]}")
+            columns = column_names(cursor)
+            writer = csv.writer(f) if export_format == "csv" else None
+            if writer:
+                writer.writerow(columns)
+
+            while True:
+                # A chunk at a time, so writes (progress reports included) are not held off for the whole export
+                with read_slot():
+                    rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                context.check_cancelled()
+                for row in rows:
+                    if writer:
+                        writer.writerow(row)
+                    else:
+                        f.write(json.dumps(dict(zip(columns, row, strict=True))) + "\n")
+
+                exported += len(rows)
+                context.report_progress(exported / total if total else 1.0, f"Exported {exported}/{total} rows")
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+
+    return {"path": str(path), "rows": exported, "format": export_format}
+
+
+def backup_database(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    """Online snapshot of the whole database into BACKUP_DIR (see src.db.backup)."""
+
+    def on_progress(done: int, total: int) -> None:
+        context.check_cancelled()
+        context.report_progress(done / total if total else 1.0, f"Copied {done}/{total} pages")
+
+    return create_snapshot(on_progress=on_progress)
+
+
+def cascade_delete(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    """Delete a row and everything cascading from it in chunks (see src.db.cascade)."""
+    table = params.get("table")
+    if table not in EXPORTABLE_TABLES:
+        raise ValidationError(f"Table must be one of: {', '.join(EXPORTABLE_TABLES)}")
+
+    context.report_progress(0.0, "Counting dependent rows", force=True)
+    plan = plan_cascade(table, int(params["id"]))
+
+    def on_progress(done: int, total: int) -> None:
+        context.check_cancelled()
+        context.report_progress(done / total, f"Deleted {done}/{total} rows")
+
+    return delete_in_chunks(plan, on_progress=on_progress)
+
+
+def register_default_handlers(runner: JobRunner) -> None:
+    runner.register("reseed", reseed_database)
+    runner.register("export", export_table)
+    runner.register("backup", backup_database)
+    runner.register("cascade_delete", cascade_delete)
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from src.repositories.jobs_repo import JobsRepository
+from src.utils.errors import ValidationError
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+
+# Progress is persisted at most this often so chatty handlers don't turn into write storms
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to job handlers for progress reporting and cooperative cancellation."""
+
+    def __init__(self, job_id: int, repo: JobsRepository, cancel_event: threading.Event):
+        self.job_id = job_id
+        self.repo = repo
+        self.cancel_event = cancel_event
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise JobCancelledError()
+
+    def report_progress(self, progress: float, message: str | None = None, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+            return
+
+        self._last_report = now
+        self.repo.update_progress(self.job_id, max(0.0, min(progress, 1.0)), message)
+
+
+JobHandler = Callable[[JobContext, dict[str, Any]], dict[str, Any] | None]
+
+
+class JobRunner:
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        self.max_workers = max_workers
+        self.repo = JobsRepository()
+        self._handlers: dict[str, JobHandler] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._cancel_events: dict[int, threading.Event] = {}
+        self._futures: dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        self._handlers[job_type] = handler
+
+    @property
+    def job_types(self) -> list[str]:
+        return sorted(self._handlers)
+
+    def start(self) -> None:
+        """Create the worker pool and pick up jobs queued before the last shutdown."""
+        if self._executor is not None:
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-worker")
+        self.repo.fail_interrupted()
+
+        for job in self.repo.find_by_status("queued"):
+            self._dispatch(job["job_id"], job["job_type"], job["params"] or {})
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, job_type: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if job_type not in self._handlers:
+            raise ValidationError(f"Unknown job type: {job_type}")
+
+        params = params or {}
+        job = self.repo.enqueue(job_type, params)
+        self._dispatch(job["job_id"], job_type, params)
+        return job
+
+    def cancel(self, job_id: int) -> None:
+        self.repo.request_cancel(job_id)
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+
+    def poll(self) -> None:
+        """Pick up work recorded by other worker processes, which only enqueue and flag cancels."""
+        if self._executor is None:
+            return
+
+        for job in self.repo.find_by_status("queued"):
+            self._dispatch(job["job_id"], job["job_type"], job["params"] or {})
+
+        for job in self.repo.find_by_status("running"):
+            if job["cancel_requested"]:
+                with self._lock:
+                    event = self._cancel_events.get(job["job_id"])
+                if event is not None:
+                    event.set()
+
+    def wait(self, job_id: int, timeout: float | None = None) -> None:
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def _dispatch(self, job_id: int, job_type: str, params: dict[str, Any]) -> None:
+        if self._executor is None:
+            # Not started (e.g. CLI or tests without lifespan): stays queued until start()
+            return
+
+        event = threading.Event()
+        with self._lock:
+            if job_id in self._futures:
+                return
+            self._cancel_events[job_id] = event
+            self._futures[job_id] = self._executor.submit(self._run, job_id, job_type, params, event)
+
+    def _run(self, job_id: int, job_type: str, params: dict[str, Any], cancel_event: threading.Event) -> None:
+        try:
+            if not self.repo.mark_running(job_id):
+                return
+
+            context = JobContext(job_id, self.repo, cancel_event)
+            try:
+                result = self._handlers[job_type](context, params)
+            except JobCancelledError:
+                self.repo.mark_finished(job_id, "cancelled", message="Cancelled")
+                return
+            except Exception as e:
+                traceback.print_exc()
+                self.repo.mark_finished(job_id, "failed", error=str(e))
+                return
+
+            self.repo.mark_finished(job_id, "succeeded", result=result or {}, message="Completed")
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+                self._futures.pop(job_id, None)
+
+
+job_runner = JobRunner()
@@ -1,54 +1,125 @@
-import os
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
+from src.db.catalog import CATALOG_SNAPSHOT, disable_catalog, enable_catalog
+from src.db.maintenance import DB_MAINTENANCE_TICK_SECONDS, maintenance
 from src.db.migrate import MigrationRunner
 from src.db.seed import Seeder
+from src.jobs.handlers import register_default_handlers
+from src.jobs.runner import JOB_POLL_INTERVAL_SECONDS, job_runner
+from src.middleware.admission import AdmissionMiddleware
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.idempotency import IdempotencyMiddleware
+from src.middleware.loaders import LoaderMiddleware
+from src.middleware.profiling import ProfilingMiddleware, profile_endpoints
+from src.middleware.tracing import install_tracing
 from src.routes import (
+    admin,
+    batch,
     branch,
+    change,
     delivery,
     headquarters,
+    inventory,
+    job,
     order,
     order_detail,
     order_detail_delivery,
     product,
+    search,
     supplier,
 )
+from src.settings import Settings, get_settings
 from src.utils.errors import DatabaseError
+from src.utils.metrics import metrics
+from src.utils import tracing
+from src.utils.process_lock import acquire_process_lock
+
+ROUTERS = (
+    supplier,
+    headquarters,
+    branch,
+    product,
+    order,
+    order_detail,
+    delivery,
+    order_detail_delivery,
+    inventory,
+    job,
+    change,
+    search,
+    batch,
+    admin,
+)
+
+
+async def run_maintenance_periodically() -> None:
+    while True:
+        await asyncio.sleep(DB_MAINTENANCE_TICK_SECONDS)
+        await run_in_threadpool(maintenance.run_due)
+
+
+async def poll_jobs_periodically() -> None:
+    while True:
+        await asyncio.sleep(JOB_POLL_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(job_runner.poll)
+        except DatabaseError as e:
+            print(f"Job polling failed: {e.message}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Run migrations and seed database
-    migration_runner = MigrationRunner()
-    applied_migrations = migration_runner.run_migrations()
+    # Runs in every worker process, after any fork: this is where the database is first opened
+    settings: Settings = app.state.settings
 
-    if applied_migrations:
-        print(f"Applied migrations: {', '.join(applied_migrations)}")
+    if settings.run_migrations:
+        migration_runner = MigrationRunner()
+        applied_migrations = migration_runner.run_migrations()
 
-    seeder = Seeder()
-    seeded_tables = seeder.seed_database()
+        if applied_migrations:
+            print(f"Applied migrations: {', '.join(applied_migrations)}")
 
-    if seeded_tables:
-        print(f"Seeded tables: {', '.join(seeded_tables)}")
+    if settings.seed_database:
+        seeder = Seeder()
+        seeded_tables = seeder.seed_database()
 
-    yield
-    # Shutdown: cleanup would go here if needed
+        if seeded_tables:
+            print(f"Seeded tables: {', '.join(seeded_tables)}")
 
+    if CATALOG_SNAPSHOT:
+        # Every worker maps the same snapshot file; whichever sees it missing or stale rebuilds it
+        enable_catalog()
 
-app = FastAPI(
-    title="OctoCAT Supply Chain Management API",
-    description="Python/FastAPI implementation of the OctoCAT Supply Chain Management API",
-    version="1.0.0",
-    lifespan=lifespan,
-)
+    # Every worker can enqueue jobs; only the worker holding the jobs lock runs them
+    register_default_handlers(job_runner)
+    # Stats are collected in every worker; checkpoints, vacuum etc. only in the lock holder
+    maintenance.leader = acquire_process_lock("maintenance")
+    tasks = [asyncio.create_task(run_maintenance_periodically())]
+    if settings.background_jobs and acquire_process_lock("jobs"):
+        job_runner.start()
+        tasks.append(asyncio.create_task(poll_jobs_periodically()))
 
+    yield
 
-def get_cors_origins() -> list[str]:
-    cors_origins_env = os.getenv("CORS_ORIGINS", "")
+    # Shutdown: signal running jobs to stop; queued jobs resume on next start
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    job_runner.shutdown()
+    disable_catalog()
+    if tracing.exporter is not None:
+        tracing.exporter.flush()
+
+
+def get_cors_origins(settings: Settings) -> list[str]:
+    cors_origins_env = settings.cors_origins
 
     if cors_origins_env:
         base_origins = [origin.strip() for origin in cors_origins_env.split(",") if origin.strip()]
@@ -70,25 +141,6 @@ def get_cors_origins() -> list[str]:
     return base_origins + patterns
 
 
-# Separate exact origins from regex patterns
-cors_config = get_cors_origins()
-exact_origins = [o for o in cors_config if not o.startswith("http") or not any(c in o for c in ["*", ".+", ".*"])]
-regex_patterns = [o for o in cors_config if o.startswith("http") and o not in exact_origins] + [o for o in cors_config if o.startswith("r\"") or (not o.startswith("http") and any(c in o for c in ["*", ".+", ".*"]))]
-
-print(f"Configured CORS origins: {exact_origins}")
-print(f"Configured CORS patterns: {regex_patterns}")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=exact_origins if exact_origins else ["*"],
-    allow_origin_regex="|".join(regex_patterns) if regex_patterns else None,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
-)
-
-
-@app.exception_handler(DatabaseError)
 async def database_exception_handler(request: Request, exc: DatabaseError):
     return JSONResponse(
         status_code=exc.status_code,
@@ -96,7 +148,6 @@ async def database_exception_handler(request: Request, exc: DatabaseError):
     )
 
 
-@app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,26 +155,79 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
-app.include_router(supplier.router, prefix="/api")
-app.include_router(headquarters.router, prefix="/api")
-app.include_router(branch.router, prefix="/api")
-app.include_router(product.router, prefix="/api")
-app.include_router(order.router, prefix="/api")
-app.include_router(order_detail.router, prefix="/api")
-app.include_router(delivery.router, prefix="/api")
-app.include_router(order_detail_delivery.router, prefix="/api")
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Build the application. Touches no database; each worker opens its own in lifespan.
+
+    Serve with `uvicorn --factory src.main:create_app`, `api-serve`, or `src.main:app`.
+    """
+    settings = settings or get_settings()
+
+    app = FastAPI(
+        title=settings.title,
+        description="Python/FastAPI implementation of the OctoCAT Supply Chain Management API",
+        version=settings.version,
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+
+    # Separate exact origins from regex patterns
+    cors_config = get_cors_origins(settings)
+    exact_origins = [o for o in cors_config if not o.startswith("http") or not any(c in o for c in ["*", ".+", ".*"])]
+    regex_patterns = [o for o in cors_config if o.startswith("http") and o not in exact_origins] + [o for o in cors_config if o.startswith("r\"") or (not o.startswith("http") and any(c in o for c in ["*", ".+", ".*"]))]
+
+    print(f"Configured CORS origins: {exact_origins}")
+    print(f"Configured CORS patterns: {regex_patterns}")
+
+    app.add_middleware(LoaderMiddleware)
+    app.add_middleware(IdempotencyMiddleware)
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(ProfilingMiddleware)
+    # Added last so it wraps the others: responses they answer themselves (idempotent
+    # replays, 409s, admission 503s) still carry the CORS headers browsers need
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=exact_origins if exact_origins else ["*"],
+        allow_origin_regex="|".join(regex_patterns) if regex_patterns else None,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization", "Idempotency-Key", "X-Admin-Token", "X-Request-Priority", "X-Profile", "traceparent"],
+        expose_headers=["Retry-After"],
+    )
+
+    app.add_exception_handler(DatabaseError, database_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+
+    profile_endpoints([module.router for module in ROUTERS])
+    for module in ROUTERS:
+        app.include_router(module.router, prefix="/api")
+
+    # Outermost middleware when enabled, so the request span includes admission and idempotency
+    install_tracing(app, [module.router for module in ROUTERS])
+
+    @app.get("/")
+    def read_root():
+        return {
+            "message": settings.title,
+            "version": settings.version,
+            "docs": "/docs",
+            "openapi": "/openapi.json",
+        }
+
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy"}
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def get_metrics():
+        return metrics.render_prometheus()
 
-@app.get("/")
-def read_root():
-    return {
-        "message": "OctoCAT Supply Chain Management API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "openapi": "/openapi.json",
-    }
+    return app
 
 
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+def __getattr__(name: str) -> FastAPI:
+    # `src.main:app` keeps working, but importing this module no longer builds an app
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import time
+
+from src.db.connection import DatabaseStats, db_stats
+from src.utils.admin import is_admin_scope
+from src.utils.metrics import metrics
+
+ADMISSION_MAX_WAITING_WRITERS = int(os.getenv("ADMISSION_MAX_WAITING_WRITERS", "8"))
+ADMISSION_MAX_WRITE_WAIT_MS = float(os.getenv("ADMISSION_MAX_WRITE_WAIT_MS", "200"))
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "16"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# Paths treated as low priority; X-Request-Priority can only raise that with the admin token
+LOW_PRIORITY_PREFIXES = tuple(
+    p.strip() for p in os.getenv("ADMISSION_LOW_PRIORITY_PATHS", "/api/jobs,/api/changes").split(",") if p.strip()
+)
+
+PRIORITIES = ("low", "normal", "high")
+
+admitted = metrics.counter("admission_requests_total", "Requests admitted by the admission controller")
+shed = metrics.counter("admission_shed_total", "Requests rejected with 503 before reaching the database")
+queue_wait = metrics.histogram("admission_queue_wait_seconds", "Time requests waited for an admission slot")
+
+
+class AdmissionController:
+    """Decides whether a request may proceed based on database saturation signals.
+
+    While the database is healthy everything is admitted. Once the write-lock queue or the
+    average write-lock wait crosses its threshold, low-priority requests are shed immediately,
+    normal requests queue for a bounded number of concurrent slots (and are shed if they wait
+    too long), and high-priority requests always pass.
+    """
+
+    def __init__(
+        self,
+        stats: DatabaseStats = db_stats,
+        max_waiting_writers: int = ADMISSION_MAX_WAITING_WRITERS,
+        max_write_wait_ms: float = ADMISSION_MAX_WRITE_WAIT_MS,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.stats = stats
+        self.max_waiting_writers = max_waiting_writers
+        self.max_write_wait = max_write_wait_ms / 1000.0
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._slots: asyncio.Semaphore | None = None
+
+    def saturated(self) -> bool:
+        return (
+            self.stats.waiting_writers >= self.max_waiting_writers
+            or self.stats.write_wait_average() >= self.max_write_wait
+        )
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        return self._slots
+
+    async def acquire(self, priority: str) -> str:
+        """Returns "pass" (no slot needed), "slot" (caller must release()) or "shed"."""
+        if priority == "high" or not self.saturated():
+            return "pass"
+        if priority == "low":
+            return "shed"
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            return "shed"
+        finally:
+            queue_wait.observe(time.perf_counter() - started)
+
+        return "slot"
+
+    def release(self) -> None:
+        self.slots.release()
+
+
+def request_priority(scope) -> str:
+    """Priority from the path, which X-Request-Priority may lower, or raise with a valid admin token."""
+    priority = "low" if scope["path"].startswith(LOW_PRIORITY_PREFIXES) else "normal"
+    for name, value in scope["headers"]:
+        if name == b"x-request-priority":
+            requested = value.decode("latin-1").strip().lower()
+            if requested in PRIORITIES and (
+                PRIORITIES.index(requested) < PRIORITIES.index(priority) or is_admin_scope(scope)
+            ):
+                return requested
+    return priority
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController | None = None):
+        self.app = app
+        self.controller = controller or AdmissionController()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        priority = request_priority(scope)
+        decision = await self.controller.acquire(priority)
+        if decision == "shed":
+            shed.inc(priority=priority)
+            body = json.dumps({"message": "Database is saturated, retry shortly"}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", str(ADMISSION_RETRY_AFTER_SECONDS).encode("latin-1")),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        admitted.inc(priority=priority)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if decision == "slot":
+                self.controller.release()
@@ -0,0 +1,240 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+# Bodies above this size are compressed in a worker thread so the event loop keeps serving
+OFFLOAD_SIZE = 64 * 1024
+
+# Server preference when the client weights several encodings equally
+SERVER_PREFERENCE = ["zstd", "br", "gzip"]
+
+SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def available_encodings() -> list[str]:
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: list[str] | None = None) -> str | None:
+    supported = supported if supported is not None else available_encodings()
+    weights: dict[str, float] = {}
+
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    wildcard = weights.get("*")
+    candidates = []
+    for encoding in supported:
+        q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > 0:
+            candidates.append((q, -SERVER_PREFERENCE.index(encoding), encoding))
+
+    if not candidates:
+        return None
+
+    return max(candidates)[2]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_LEVEL)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressedBodyCache:
+    """Byte-bounded LRU of compressed bodies keyed by encoding and body digest."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(body: bytes, encoding: str) -> tuple[str, bytes]:
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: tuple[str, bytes]) -> bytes | None:
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compressed
+
+    def put(self, key: tuple[str, bytes], compressed: bytes) -> None:
+        if len(compressed) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+
+            self._entries[key] = compressed
+            self.current_bytes += len(compressed)
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+compressed_body_cache = CompressedBodyCache()
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating zstd/br/gzip for complete (non-streaming) responses.
+
+    GET responses are looked up in the compressed body cache first, so identical hot
+    payloads such as the product catalog are compressed once and reused.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache: CompressedBodyCache | None = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else compressed_body_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        use_cache = scope["method"] in ("GET", "HEAD")
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.cache if use_cache else None)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, minimum_size: int, cache: CompressedBodyCache | None):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start_message = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = {name.lower(): value for name, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            if b"content-encoding" in headers or content_type.startswith(SKIP_CONTENT_TYPES):
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        if self.start_message is not None and message.get("more_body", False):
+            # Streaming response: forward untouched rather than buffering it
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        start_message, self.start_message = self.start_message, None
+
+        if len(body) < self.minimum_size:
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        compressed = await self._compress(body)
+        headers = [
+            (name, value)
+            for name, value in start_message.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary")
+        ]
+        vary = [value for name, value in start_message.get("headers", []) if name.lower() == b"vary"]
+        vary_value = b", ".join(vary + [b"Accept-Encoding"])
+        headers += [
+            (b"content-encoding", self.encoding.encode("latin-1")),
+            (b"content-length", str(len(compressed)).encode("latin-1")),
+            (b"vary", vary_value),
+        ]
+
+        await self.send({**start_message, "headers": headers})
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, body: bytes) -> bytes:
+        key = None
+        if self.cache is not None:
+            key = self.cache.key_for(body, self.encoding)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if len(body) > OFFLOAD_SIZE:
+            compressed = await anyio.to_thread.run_sync(compress, body, self.encoding)
+        else:
+            compressed = compress(body, self.encoding)
+
+        if key is not None:
+            self.cache.put(key, compressed)
+
+        return compressed
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import secrets
+
+import anyio
+
+from src.repositories.idempotency_repo import IdempotencyRepository
+from src.utils.errors import DatabaseError
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_PRUNE_BATCH = int(os.getenv("IDEMPOTENCY_PRUNE_BATCH", "100"))
+# How long an in-progress request holds its key; after that a retry takes it over
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+
+HEADER_NAME = b"idempotency-key"
+
+# Endpoints that stream their body: keying them would mean buffering the whole upload
+STREAMING_PATHS = frozenset({"/api/products/import"})
+
+
+async def _send_json(send, status_code: int, content: dict) -> None:
+    body = json.dumps(content).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("latin-1"))],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """Replays stored responses for POST requests carrying an `Idempotency-Key` header.
+
+    The first request reserves the key before the handler runs. Retries with the same key
+    and payload get the stored response back without re-executing the insert; a retry that
+    arrives while the original is still running gets 409, and reusing a key with a different
+    payload gets 422. 5xx responses release the key so the client can retry for real. If the
+    worker dies mid-request, the key is retried for real once its lock_seconds lease runs out.
+    Streaming endpoints reject the header instead of having their body buffered.
+    """
+
+    def __init__(
+        self,
+        app,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        prune_batch: int = IDEMPOTENCY_PRUNE_BATCH,
+        lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS,
+    ):
+        self.app = app
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.prune_batch = prune_batch
+        self.repo = IdempotencyRepository()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        key = None
+        for name, value in scope["headers"]:
+            if name == HEADER_NAME:
+                key = value.decode("latin-1").strip()
+                break
+
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not key or len(key) > IDEMPOTENCY_MAX_KEY_LENGTH:
+            await _send_json(send, 400, {"message": "Invalid Idempotency-Key header"})
+            return
+
+        if scope["path"] in STREAMING_PATHS:
+            await _send_json(send, 400, {"message": "Idempotency-Key is not supported on streaming endpoints"})
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            return
+
+        method, path = scope["method"], scope["path"]
+        request_hash = hashlib.sha256(body).hexdigest()
+        # Identifies this request's hold on the key, which a retry may take over once the lease ends
+        lease_token = secrets.token_hex(16)
+
+        try:
+            existing = await anyio.to_thread.run_sync(
+                self.repo.reserve, key, method, path, request_hash, lease_token, self.ttl_seconds, self.lock_seconds
+            )
+        except DatabaseError as e:
+            await _send_json(send, e.status_code, {"message": e.message})
+            return
+
+        if existing is not None:
+            await self._replay(existing, request_hash, send)
+            return
+
+        response = {"status": 500, "content_type": None, "chunks": []}
+        try:
+            await self._run(scope, body, receive, send, response)
+        finally:
+            await anyio.to_thread.run_sync(self._finish, key, method, path, lease_token, response)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes | None:
+        """The whole request body, or None if the client disconnected first."""
+        body_chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body_chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(body_chunks)
+
+    async def _run(self, scope, body: bytes, receive, send, response: dict) -> None:
+        """Run the handler on the already-read `body`, recording its response into `response`."""
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        response["content_type"] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response["chunks"].append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+    async def _replay(self, existing: dict, request_hash: str, send) -> None:
+        if existing["request_hash"] != request_hash:
+            await _send_json(send, 422, {"message": "Idempotency-Key was already used with a different request payload"})
+            return
+
+        if existing["status_code"] is None:
+            await _send_json(send, 409, {"message": "A request with this Idempotency-Key is still in progress"})
+            return
+
+        body = existing["response_body"] or b""
+        headers = [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"idempotent-replayed", b"true"),
+        ]
+        if existing["content_type"]:
+            headers.append((b"content-type", existing["content_type"].encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": existing["status_code"], "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _finish(self, key: str, method: str, path: str, lease_token: str, response: dict) -> None:
+        try:
+            if response["status"] >= 500:
+                self.repo.release(key, method, path, lease_token)
+            else:
+                self.repo.complete(
+                    key, method, path, lease_token,
+                    response["status"], response["content_type"], b"".join(response["chunks"]),
+                )
+            self.repo.prune_expired(self.prune_batch)
+        except DatabaseError:
+            # The response has already been sent; a lost key only means a retry re-executes
+            pass
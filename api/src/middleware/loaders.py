@@ -0,0 +1,20 @@
+from src.utils.loader import loader_scope
+
+
+class LoaderMiddleware:
+    """Give each API request its own repository loaders (src.utils.loader).
+
+    The scope lives in a context variable, which Starlette copies into the threadpool
+    running sync route handlers, so repositories called by the handler find it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        with loader_scope():
+            await self.app(scope, receive, send)
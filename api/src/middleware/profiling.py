@@ -0,0 +1,399 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import anyio.to_thread
+
+from src.db.connection import statement_observers
+from src.utils.admin import is_admin_scope
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "./data/profiles")
+PROFILE_ALLOC_TOP = int(os.getenv("PROFILE_ALLOC_TOP", "25"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+PROFILE_MODES = ("cpu", "alloc")
+
+# Frames from these files say nothing about the request, only about the sampler itself
+IGNORED_FILES = (__file__, threading.__file__)
+
+_current_session: contextvars.ContextVar["ProfileSession | None"] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+# Per-route allocation hot spots accumulated across alloc-mode profiles
+allocation_hotspots: dict[str, Counter] = defaultdict(Counter)
+_alloc_lock = threading.Lock()
+_hotspots_lock = threading.Lock()
+
+
+def get_output_dir() -> Path:
+    output_dir = Path(PROFILE_OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{code.co_qualname}"
+
+
+def _sql_label(sql: str) -> str:
+    return "SQL " + " ".join(sql.split())[:160]
+
+
+class ProfileSession:
+    """Samples the stacks of the threads serving one request.
+
+    The event-loop thread is sampled from the start; worker threads are sampled while they run
+    this request's route handler (see `profile_endpoints`) or one of its statements, and the
+    statement they are executing becomes the leaf frame.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        # Thread -> how many joined() blocks it is in; handlers nest statements
+        self.threads: Counter[int] = Counter({threading.get_ident(): 1})
+        self.active_sql: dict[int, str] = {}
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> float:
+        self._stop.set()
+        self._thread.join()
+        return time.perf_counter() - self.started_at
+
+    @contextmanager
+    def joined(self):
+        """Sample the calling thread until the block exits."""
+        ident = threading.get_ident()
+        self.threads[ident] += 1
+        try:
+            yield
+        finally:
+            self.threads[ident] -= 1
+            if not self.threads[ident]:
+                del self.threads[ident]
+
+    @contextmanager
+    def statement(self, sql: str):
+        ident = threading.get_ident()
+        with self.joined():
+            self.active_sql[ident] = sql
+            try:
+                yield
+            finally:
+                self.active_sql.pop(ident, None)
+
+    def _sample_loop(self) -> None:
+        sampler = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == sampler:
+                    continue
+                if ident not in self.threads:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    if frame.f_code.co_filename not in IGNORED_FILES:
+                        stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.reverse()
+
+                sql = self.active_sql.get(ident)
+                if sql:
+                    stack.append(_sql_label(sql))
+
+                if stack:
+                    self.samples[tuple(stack)] += 1
+                    self.sample_count += 1
+
+
+def _joining(endpoint):
+    @functools.wraps(endpoint)
+    def run(*args, **kwargs):
+        # In the worker thread, under the copy of the request's context it was handed
+        session = _current_session.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        with session.joined():
+            return endpoint(*args, **kwargs)
+
+    run.__profiled__ = True
+    return run
+
+
+def profile_endpoints(routers: list[Any]) -> None:
+    """Have the sync route handlers of `routers` join the request's profile session while they run.
+
+    FastAPI runs them in worker threads; the wrapper registers that thread from inside it, for
+    exactly as long as the handler runs. Call before the routers are included in an app.
+    """
+    for router in routers:
+        for route in router.routes:
+            endpoint = getattr(route, "endpoint", None)
+            if getattr(route, "dependant", None) is None or getattr(endpoint, "__profiled__", False):
+                continue
+            if inspect.isfunction(endpoint) and not (
+                inspect.iscoroutinefunction(endpoint) or inspect.isgeneratorfunction(endpoint)
+            ):
+                route.endpoint = route.dependant.call = _joining(endpoint)
+
+
+def _profile_observer(sql: str):
+    session = _current_session.get()
+    if session is None:
+        return nullcontext()
+    return session.statement(sql)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-")[:80] or "root"
+
+
+def new_profile_id(scope) -> str:
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    return f"{timestamp}-{_slug(scope['method'] + ' ' + scope['path'])}"
+
+
+def list_profiles() -> list[dict]:
+    profiles: dict[str, dict] = {}
+    for path in sorted(get_output_dir().iterdir(), reverse=True):
+        profile_id, _, kind = path.name.partition(".")
+        entry = profiles.setdefault(profile_id, {"id": profile_id, "files": []})
+        entry["files"].append(path.name)
+        if kind == "summary.json":
+            summary = json.loads(path.read_text(encoding="utf-8"))
+            entry.update(route=summary["route"], elapsedMs=summary["elapsedMs"], samples=summary["samples"])
+    return list(profiles.values())
+
+
+def top_allocation_hotspots(limit: int = PROFILE_ALLOC_TOP) -> dict[str, list[dict]]:
+    with _hotspots_lock:
+        return {
+            route: [{"location": location, "bytes": size} for location, size in counter.most_common(limit)]
+            for route, counter in allocation_hotspots.items()
+        }
+
+
+def write_collapsed(path: Path, root: str, samples: Counter) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            frames = [root, *stack]
+            f.write(";".join(frame.replace(";", ",") for frame in frames) + f" {count}\n")
+
+
+def write_speedscope(path: Path, root: str, samples: Counter, interval_ms: float) -> None:
+    frame_index: dict[str, int] = {}
+    frames = []
+    sample_list = []
+    weights = []
+
+    for stack, count in samples.items():
+        indices = []
+        for name in (root, *stack):
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({"name": name})
+            indices.append(frame_index[name])
+        sample_list.append(indices)
+        weights.append(count * interval_ms)
+
+    document = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": root,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": sample_list,
+            "weights": weights,
+        }],
+        "name": root,
+        "exporter": "octocat-supply-api",
+    }
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+
+def summarize(samples: Counter) -> dict[str, dict[str, int]]:
+    """Inclusive sample counts per route handler, repository method and SQL statement."""
+    summary: dict[str, Counter] = {"routes": Counter(), "repositories": Counter(), "sql": Counter()}
+    for stack, count in samples.items():
+        seen = set()
+        for frame in stack:
+            if frame in seen:
+                continue
+            seen.add(frame)
+            if frame.startswith("src.routes."):
+                summary["routes"][frame] += count
+            elif frame.startswith("src.repositories."):
+                summary["repositories"][frame] += count
+            elif frame.startswith("SQL "):
+                summary["sql"][frame[4:]] += count
+    return {name: dict(counter.most_common()) for name, counter in summary.items()}
+
+
+def write_cpu_profile(profile_id: str, root: str, session: ProfileSession, elapsed: float, interval_ms: float) -> None:
+    stem = get_output_dir() / profile_id
+    write_collapsed(stem.with_suffix(".folded"), root, session.samples)
+    write_speedscope(stem.with_suffix(".speedscope.json"), root, session.samples, interval_ms)
+    stem.with_suffix(".summary.json").write_text(json.dumps({
+        "route": root,
+        "elapsedMs": round(elapsed * 1000, 3),
+        "intervalMs": interval_ms,
+        "samples": session.sample_count,
+        **summarize(session.samples),
+    }, indent=2), encoding="utf-8")
+
+
+def write_alloc_profile(profile_id: str, root: str, before, after) -> None:
+    """Write the top allocation differences of one request and add them to the route's hot spots."""
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+        tracemalloc.Filter(False, __file__),
+    ]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    top = [stat for stat in stats if stat.size_diff > 0][:PROFILE_ALLOC_TOP]
+
+    lines = [f"Allocation profile for {root}", ""]
+    with _hotspots_lock:
+        hotspots = allocation_hotspots[root]
+        for stat in top:
+            frame = stat.traceback[0]
+            location = f"{frame.filename}:{frame.lineno}"
+            hotspots[location] += stat.size_diff
+            lines.append(f"{stat.size_diff / 1024:10.1f} KiB  {stat.count_diff:+7d} blocks  {location}")
+
+    (get_output_dir() / profile_id).with_suffix(".alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def route_label(scope) -> str:
+    # Routes of included routers keep their own template; FastAPI records the prefixed one
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None) or scope["path"]
+    return f"{scope['method']} {path}"
+
+
+def _requested_mode(scope) -> str | None:
+    mode = None
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            mode = value.decode("latin-1").strip().lower()
+            break
+
+    if mode is None:
+        query = scope.get("query_string", b"").decode("latin-1")
+        match = re.search(rf"(?:^|&){PROFILE_QUERY_PARAM}=(\w+)", query)
+        mode = match.group(1).lower() if match else None
+
+    return mode if mode in PROFILE_MODES else None
+
+
+def _with_profile_id(send, profile_id: str):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+            message = {**message, "headers": headers}
+        await send(message)
+
+    return wrapped
+
+
+class ProfilingMiddleware:
+    """Profiles individual requests on demand.
+
+    Admins send `X-Profile: cpu|alloc` (or `?__profile=cpu|alloc`) with their admin token;
+    PROFILE_SAMPLE_RATE additionally CPU-profiles that fraction of all requests. CPU profiles
+    are written as collapsed stacks (`.folded`, for flamegraph.pl/inferno) and speedscope
+    JSON; alloc profiles write the top tracemalloc differences and feed per-route hot spots.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+
+        if _profile_observer not in statement_observers:
+            statement_observers.append(_profile_observer)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = _requested_mode(scope)
+        if mode is not None and not is_admin_scope(scope):
+            mode = None
+        if mode is None and self.sample_rate > 0 and random.random() < self.sample_rate:
+            mode = "cpu"
+
+        if mode is None:
+            await self.app(scope, receive, send)
+        elif mode == "cpu":
+            await self._profile_cpu(scope, receive, send)
+        else:
+            await self._profile_alloc(scope, receive, send)
+
+    async def _profile_cpu(self, scope, receive, send):
+        profile_id = new_profile_id(scope)
+        session = ProfileSession(self.interval_ms / 1000.0)
+        token = _current_session.set(session)
+        session.start()
+        try:
+            await self.app(scope, receive, _with_profile_id(send, profile_id))
+        finally:
+            elapsed = session.stop()
+            _current_session.reset(token)
+            await anyio.to_thread.run_sync(
+                write_cpu_profile, profile_id, route_label(scope), session, elapsed, self.interval_ms
+            )
+
+    async def _profile_alloc(self, scope, receive, send):
+        # tracemalloc is process-wide: one allocation profile at a time, others run unprofiled
+        if not _alloc_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id(scope)
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(25)
+
+        try:
+            before = tracemalloc.take_snapshot()
+            await self.app(scope, receive, _with_profile_id(send, profile_id))
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+            _alloc_lock.release()
+
+        await anyio.to_thread.run_sync(write_alloc_profile, profile_id, route_label(scope), before, after)
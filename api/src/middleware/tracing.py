@@ -0,0 +1,94 @@
+import random
+
+from fastapi import APIRouter, FastAPI
+
+from src.db.connection import statement_observers
+from src.middleware.profiling import route_label
+from src.utils import tracing
+from src.utils.tracing import (
+    TRACE_SAMPLE_RATE,
+    create_exporter,
+    dependency_spans,
+    instrument_repositories,
+    parse_traceparent,
+    root_span,
+    statement_span,
+)
+
+TRACEPARENT_HEADER = b"traceparent"
+
+
+def install_tracing(
+    app: FastAPI,
+    routers: list[APIRouter],
+    exporter: tracing.SpanExporter | None = None,
+    sample_rate: float = TRACE_SAMPLE_RATE,
+) -> bool:
+    """Instrument `app` and its `routers` if TRACE_EXPORTER (or `exporter`) enables tracing.
+
+    With tracing off nothing is wrapped or registered, so requests pay nothing for it.
+    """
+    exporter = exporter or create_exporter()
+    if exporter is None:
+        return False
+
+    tracing.exporter = exporter
+    instrument_repositories()
+    app.dependency_overrides.update(dependency_spans(routers))
+    if statement_span not in statement_observers:
+        statement_observers.append(statement_span)
+    app.add_middleware(TracingMiddleware, sample_rate=sample_rate)
+    return True
+
+
+def _with_traceparent(send, span):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            span.attributes["http.response.status_code"] = message["status"]
+            if message["status"] >= 500:
+                span.error = f"HTTP {message['status']}"
+            headers = list(message.get("headers", []))
+            headers.append((TRACEPARENT_HEADER, span.traceparent.encode("latin-1")))
+            message = {**message, "headers": headers}
+        await send(message)
+
+    return wrapped
+
+
+class TracingMiddleware:
+    """Records a span tree for sampled API requests: request, dependencies, repository methods, SQL.
+
+    A `traceparent` header (W3C Trace Context) continues the caller's trace, and its sampled
+    flag decides whether this request is traced; requests without one are sampled at
+    TRACE_SAMPLE_RATE. Traced responses carry their own `traceparent` for correlation.
+    """
+
+    def __init__(self, app, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/") or tracing.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == TRACEPARENT_HEADER:
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        sampled = parent[2] if parent else random.random() < self.sample_rate
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id = parent[:2] if parent else (None, None)
+        with root_span(f"{scope['method']} {scope['path']}", trace_id, parent_id) as span:
+            span.attributes.update({"http.request.method": scope["method"], "url.path": scope["path"]})
+            try:
+                await self.app(scope, receive, _with_traceparent(send, span))
+            finally:
+                # The matched route is only known once routing has run
+                span.name = route_label(scope)
+                span.attributes["http.route"] = span.name.split(" ", 1)[1]
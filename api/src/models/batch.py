@@ -0,0 +1,32 @@
+import os
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_OPERATIONS = int(os.getenv("MAX_BATCH_OPERATIONS", "100"))
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "DELETE"]
+    # e.g. "/api/order-details" or "/api/orders/${order.orderId}"
+    path: str
+    body: Any = None
+    # Name later operations use to reference this one's response: "${<ref>.<field>}"
+    ref: str | None = Field(None, pattern=r"^\w+$")
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    # atomic: stop at the first failure and roll everything back; continue: roll back only the failed operation
+    mode: Literal["atomic", "continue"] = "atomic"
+
+
+class BatchOperationResult(BaseModel):
+    ref: str | None = None
+    status: int
+    body: Any = None
+
+
+class BatchResult(BaseModel):
+    committed: bool
+    results: list[BatchOperationResult]
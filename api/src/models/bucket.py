@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class DateBucket(BaseModel):
+    # "2026-05-01" for day buckets, "2026-05" for month buckets
+    bucket: str
+    count: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Change(BaseModel):
+    seq: int
+    table_name: str = Field(..., alias="tableName")
+    row_id: int = Field(..., alias="rowId")
+    operation: str
+    changed_at: str = Field(..., alias="changedAt")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class ChangeFeed(BaseModel):
+    changes: list[Change]
+    next_since: int = Field(..., alias="nextSince")
+    has_more: bool = Field(..., alias="hasMore")
+
+    model_config = ConfigDict(populate_by_name=True)
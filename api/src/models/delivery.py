@@ -1,12 +1,15 @@
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.models.status import DeliveryStatus
+from src.utils.dates import DateText
+
 
 class DeliveryBase(BaseModel):
     supplier_id: int = Field(..., alias="supplierId")
-    delivery_date: str = Field(..., alias="deliveryDate")
+    delivery_date: DateText = Field(..., alias="deliveryDate")
     name: str
     description: str | None = None
-    status: str = "pending"
+    status: DeliveryStatus = "pending"
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -17,15 +20,18 @@ class DeliveryCreate(DeliveryBase):
 
 class DeliveryUpdate(BaseModel):
     supplier_id: int | None = Field(None, alias="supplierId")
-    delivery_date: str | None = Field(None, alias="deliveryDate")
+    delivery_date: DateText | None = Field(None, alias="deliveryDate")
     name: str | None = None
     description: str | None = None
-    status: str | None = None
+    status: DeliveryStatus | None = None
 
     model_config = ConfigDict(populate_by_name=True)
 
 
 class Delivery(DeliveryBase):
     delivery_id: int = Field(..., alias="deliveryId")
+    # Not re-validated on the way out: rows written before validation may hold other text
+    delivery_date: str = Field(..., alias="deliveryDate")
+    status: str
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,61 @@
+import os
+
+from pydantic import BaseModel, ConfigDict, Field
+
+MAX_STOCK_LINES = int(os.getenv("MAX_STOCK_LINES", "500"))
+
+
+class StockBalance(BaseModel):
+    branch_id: int = Field(..., alias="branchId")
+    product_id: int = Field(..., alias="productId")
+    quantity: int
+    reorder_level: int = Field(..., alias="reorderLevel")
+    last_movement_id: int | None = Field(None, alias="lastMovementId")
+    updated_at: str = Field(..., alias="updatedAt")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class StockMovement(BaseModel):
+    movement_id: int = Field(..., alias="movementId")
+    branch_id: int = Field(..., alias="branchId")
+    product_id: int = Field(..., alias="productId")
+    # Signed: receipts add stock, consumption removes it
+    quantity: int
+    kind: str
+    order_detail_delivery_id: int | None = Field(None, alias="orderDetailDeliveryId")
+    notes: str | None = None
+    created_at: str = Field(..., alias="createdAt")
+    # Stock on hand right after this movement; only set on newly recorded movements
+    balance: int | None = None
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class StockReceipt(BaseModel):
+    movements: list[StockMovement]
+    # Lines of the delivery whose order was archived before they were received; not booked
+    archived_line_ids: list[int] = Field(default_factory=list, alias="archivedLineIds")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class StockLine(BaseModel):
+    product_id: int = Field(..., alias="productId")
+    quantity: int = Field(..., gt=0)
+    notes: str | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class StockConsumption(BaseModel):
+    branch_id: int = Field(..., alias="branchId")
+    lines: list[StockLine] = Field(..., min_length=1, max_length=MAX_STOCK_LINES)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ReorderLevel(BaseModel):
+    reorder_level: int = Field(..., alias="reorderLevel", ge=0)
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,27 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobCreate(BaseModel):
+    job_type: str = Field(..., alias="jobType")
+    params: dict[str, Any] = Field(default_factory=dict)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class Job(BaseModel):
+    job_id: int = Field(..., alias="jobId")
+    job_type: str = Field(..., alias="jobType")
+    status: str
+    params: dict[str, Any] | None = None
+    progress: float = 0.0
+    message: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    cancel_requested: bool = Field(False, alias="cancelRequested")
+    created_at: str = Field(..., alias="createdAt")
+    started_at: str | None = Field(None, alias="startedAt")
+    finished_at: str | None = Field(None, alias="finishedAt")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -1,12 +1,15 @@
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.models.status import OrderStatus
+from src.utils.dates import DateText
+
 
 class OrderBase(BaseModel):
     branch_id: int = Field(..., alias="branchId")
-    order_date: str = Field(..., alias="orderDate")
+    order_date: DateText = Field(..., alias="orderDate")
     name: str
     description: str | None = None
-    status: str = "pending"
+    status: OrderStatus = "pending"
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -17,15 +20,18 @@ class OrderCreate(OrderBase):
 
 class OrderUpdate(BaseModel):
     branch_id: int | None = Field(None, alias="branchId")
-    order_date: str | None = Field(None, alias="orderDate")
+    order_date: DateText | None = Field(None, alias="orderDate")
     name: str | None = None
     description: str | None = None
-    status: str | None = None
+    status: OrderStatus | None = None
 
     model_config = ConfigDict(populate_by_name=True)
 
 
 class Order(OrderBase):
     order_id: int = Field(..., alias="orderId")
+    # Not re-validated on the way out: rows written before validation may hold other text
+    order_date: str = Field(..., alias="orderDate")
+    status: str
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
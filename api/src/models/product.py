@@ -37,6 +37,22 @@ class Product(ProductBase):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
+class ProductImportError(BaseModel):
+    row: int
+    message: str
+
+
+class ProductImportReport(BaseModel):
+    received: int
+    written: int
+    failed: int
+    batches: int
+    errors: list[ProductImportError]
+    errors_truncated: bool = Field(..., alias="errorsTruncated")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
 class ProductCategory:
     """Base product category."""
 
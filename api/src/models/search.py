@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SearchResult(BaseModel):
+    # suppliers | headquarters | branches
+    type: str
+    id: int
+    name: str
+    contact_person: str | None = Field(None, alias="contactPerson")
+    email: str | None = None
+    # 0-1: the share of the query's trigrams found, weighted by the field they were found in
+    score: float
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,103 @@
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.utils.dates import DateText
+from src.utils.errors import ValidationError
+
+# current status -> statuses it may move to; statuses without outgoing transitions are final
+ORDER_STATUS_TRANSITIONS: dict[str, set[str]] = {
+    "pending": {"processing", "cancelled"},
+    "processing": {"shipped", "cancelled"},
+    "shipped": {"delivered"},
+    "delivered": set(),
+    "cancelled": set(),
+}
+
+DELIVERY_STATUS_TRANSITIONS: dict[str, set[str]] = {
+    "pending": {"in_transit", "cancelled"},
+    "in_transit": {"delivered", "cancelled"},
+    "delivered": set(),
+    "cancelled": set(),
+}
+
+
+# Accepted by create and PUT, so every stored row can still be moved by the status endpoints
+OrderStatus = Literal[tuple(ORDER_STATUS_TRANSITIONS)]
+DeliveryStatus = Literal[tuple(DELIVERY_STATUS_TRANSITIONS)]
+
+
+def open_statuses(transitions: dict[str, set[str]]) -> tuple[str, ...]:
+    """Statuses that can still change, in workflow order; final ones make up the history."""
+    return tuple(status for status, targets in transitions.items() if targets)
+
+
+# Covered by the partial indexes of migration 008, which list them in this order
+OPEN_ORDER_STATUSES = open_statuses(ORDER_STATUS_TRANSITIONS)
+OPEN_DELIVERY_STATUSES = open_statuses(DELIVERY_STATUS_TRANSITIONS)
+
+# Upper bound on ids per request; filters have no limit and are applied chunk by chunk
+MAX_STATUS_CHANGE_IDS = 10000
+
+
+def source_statuses(transitions: dict[str, set[str]], status: str, from_status: str | None = None) -> list[str]:
+    """Statuses rows may be in to move to `status`, narrowed to `from_status` when given."""
+    if status not in transitions:
+        raise ValidationError(f"Status must be one of: {', '.join(transitions)}")
+
+    sources = sorted(current for current, targets in transitions.items() if status in targets)
+    if from_status is None:
+        if not sources:
+            raise ValidationError(f"No status can change to {status}")
+        return sources
+
+    if from_status not in sources:
+        raise ValidationError(f"Cannot change status from {from_status} to {status}")
+    return [from_status]
+
+
+class StatusChange(BaseModel):
+    status: str
+    from_status: str | None = Field(None, alias="fromStatus")
+    ids: list[int] | None = Field(None, max_length=MAX_STATUS_CHANGE_IDS)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class OrderStatusFilter(BaseModel):
+    branch_id: int | None = Field(None, alias="branchId")
+    delivery_id: int | None = Field(None, alias="deliveryId")
+    order_date_from: DateText | None = Field(None, alias="orderDateFrom")
+    order_date_to: DateText | None = Field(None, alias="orderDateTo")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class OrderStatusChange(StatusChange):
+    filter: OrderStatusFilter | None = None
+
+
+class DeliveryStatusFilter(BaseModel):
+    supplier_id: int | None = Field(None, alias="supplierId")
+    delivery_date_from: DateText | None = Field(None, alias="deliveryDateFrom")
+    delivery_date_to: DateText | None = Field(None, alias="deliveryDateTo")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class DeliveryStatusChange(StatusChange):
+    filter: DeliveryStatusFilter | None = None
+
+
+class SkippedStatusChange(BaseModel):
+    id: int
+    # None when the row does not exist
+    status: str | None = None
+
+
+class StatusChangeResult(BaseModel):
+    status: str
+    updated_ids: list[int] = Field(..., alias="updatedIds")
+    skipped: list[SkippedStatusChange] = Field(default_factory=list)
+
+    model_config = ConfigDict(populate_by_name=True)
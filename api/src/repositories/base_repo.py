@@ -1,8 +1,14 @@
+import json
+import os
 from typing import Any
 
-from src.db.connection import execute, fetch_all, fetch_one
-from src.utils.errors import ConflictError, NotFoundError, handle_sqlite_error
-from src.utils.sql import build_insert_sql, build_update_sql
+from src.db.cascade import CascadePlan, plan_cascade
+from src.db.connection import execute, fetch_all, fetch_one, transaction
+from src.utils.errors import ConflictError, NotFoundError, ValidationError, handle_sqlite_error
+from src.utils.loader import RowsById, request_loader
+from src.utils.sql import build_insert_sql, build_update_sql, generate_placeholders, id_chunks
+
+STATUS_CHANGE_CHUNK_SIZE = int(os.getenv("STATUS_CHANGE_CHUNK_SIZE", "500"))
 
 
 class BaseRepository:
@@ -19,11 +25,36 @@ class BaseRepository:
 
     def find_by_id(self, id_value: int) -> dict[str, Any] | None:
         try:
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return loader.load(id_value)
+
             sql = f"SELECT * FROM {self.table} WHERE {self.id_column} = ?"
             return fetch_one(sql, (id_value,))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def find_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Rows for `ids` in the order given, skipping ids that do not exist."""
+        try:
+            ids = list(dict.fromkeys(ids))
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return [row for row in loader.load_many(ids) if row is not None]
+
+            found = self._rows_by_ids(ids)
+            return [found[id_value] for id_value in ids if id_value in found]
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def _rows_by_ids(self, ids: list[int], table: str | None = None) -> RowsById:
+        found = {}
+        for chunk in id_chunks(ids):
+            sql = f"SELECT * FROM {table or self.table} WHERE {self.id_column} IN ({generate_placeholders(len(chunk))})"
+            for row in fetch_all(sql, chunk):
+                found[row[self.id_column]] = row
+        return found
+
     def create(self, data: dict[str, Any]) -> dict[str, Any]:
         try:
             sql, values = build_insert_sql(self.table, data)
@@ -51,7 +82,7 @@ class BaseRepository:
 
             sql, values = build_update_sql(
                 self.table, data_copy, self.id_column)
-            cursor = execute(sql, values)
+            cursor = execute(sql, values, idempotent=True)
 
             if cursor.rowcount == 0:
                 raise NotFoundError(
@@ -75,7 +106,16 @@ class BaseRepository:
                     f"{self.table} with id {id_value} not found")
 
             sql = f"DELETE FROM {self.table} WHERE {self.id_column} = ?"
-            execute(sql, (id_value,))
+            execute(sql, (id_value,), idempotent=True)
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def cascade_plan(self, id_value: int, count_limit: int | None = None) -> CascadePlan:
+        """Rows that delete() would take with it through ON DELETE CASCADE, per table."""
+        try:
+            return plan_cascade(self.table, id_value, count_limit)
         except NotFoundError:
             raise
         except Exception as e:
@@ -85,3 +125,107 @@ class BaseRepository:
         sql = f"SELECT 1 FROM {self.table} WHERE {self.id_column} = ?"
         result = fetch_one(sql, (id_value,))
         return result is not None
+
+
+class StatusRepository(BaseRepository):
+    """Tables with a `status` workflow that can be changed in bulk (src.models.status)."""
+
+    # Bulk status filter name -> condition binding its value once
+    status_filters: dict[str, str] = {}
+    # Statuses covered by the table's partial open-status index, in the index's order
+    open_statuses: tuple[str, ...] = ()
+
+    @property
+    def open_condition(self) -> str:
+        """The WHERE term of the partial index; a query can only use the index if it repeats it."""
+        return f"status IN ({', '.join(repr(status) for status in self.open_statuses)})"
+
+    def _status_condition(self, status: str) -> str:
+        if status in self.open_statuses:
+            return f"status = ? AND {self.open_condition}"
+        return "status = ?"
+
+    def find_by_status(self, status: str) -> list[dict[str, Any]]:
+        try:
+            sql = f"SELECT * FROM {self.table} WHERE {self._status_condition(status)} ORDER BY {self.id_column}"
+            return fetch_all(sql, (status,))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_open(self, status: str | None = None) -> list[dict[str, Any]]:
+        """Rows in an open status (or in `status`, which must be open), by status in workflow order, then id.
+
+        One index range per status instead of `status IN (...) ORDER BY id`, which would sort
+        the whole working set.
+        """
+        if status is not None and status not in self.open_statuses:
+            raise ValidationError(f"Open statuses are: {', '.join(self.open_statuses)}")
+
+        try:
+            sql = f"SELECT * FROM {self.table} WHERE status = ? AND {self.open_condition} ORDER BY {self.id_column}"
+            rows: list[dict[str, Any]] = []
+            for open_status in [status] if status else self.open_statuses:
+                rows.extend(fetch_all(sql, (open_status,)))
+            return rows
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def count_open(self) -> dict[str, int]:
+        """Rows per open status, zeros included; reads only the partial index."""
+        try:
+            sql = f"SELECT status, count(*) FROM {self.table} WHERE {self.open_condition} GROUP BY status"
+            counts = dict(fetch_all(sql, row_format="tuple"))
+            return {status: counts.get(status, 0) for status in self.open_statuses}
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_ids_by_status(
+        self, status: str, filters: dict[str, Any], after_id: int = 0, limit: int = STATUS_CHANGE_CHUNK_SIZE
+    ) -> list[int]:
+        """Ids after `after_id` in `status` matching `filters`, for keyset-paged bulk changes.
+
+        One status per call: the open-status index ends in the rowid, so `status = ? AND id > ?
+        ORDER BY id` is a single index range with no sort. Only open statuses can change.
+        """
+        try:
+            conditions = [self._status_condition(status), f"{self.id_column} > ?"]
+            params: list[Any] = [status, after_id]
+            for name, value in filters.items():
+                conditions.append(self.status_filters[name])
+                params.append(value)
+
+            sql = f"SELECT {self.id_column} FROM {self.table} WHERE {' AND '.join(conditions)} ORDER BY {self.id_column} LIMIT ?"
+            return [row[0] for row in fetch_all(sql, (*params, limit), row_format="tuple")]
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_statuses(self, ids: list[int]) -> dict[int, str]:
+        try:
+            sql = f"SELECT {self.id_column}, status FROM {self.table} WHERE {self.id_column} IN (SELECT value FROM json_each(?))"
+            return dict(fetch_all(sql, (json.dumps(ids),), row_format="tuple"))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def transition_status(self, ids: list[int], status: str, from_statuses: list[str]) -> list[int]:
+        """Set `status` on the rows in `ids` currently in one of `from_statuses`; returns the ids changed.
+
+        One `UPDATE ... RETURNING` per chunk of STATUS_CHANGE_CHUNK_SIZE ids instead of a
+        read/update/read per row. Rows in any other status (including ones changed by a
+        concurrent request) are left alone.
+        """
+        sql = (
+            f"UPDATE {self.table} SET status = ? "
+            f"WHERE {self.id_column} IN (SELECT value FROM json_each(?)) AND status IN (SELECT value FROM json_each(?)) "
+            f"RETURNING {self.id_column}"
+        )
+        changed: list[int] = []
+        try:
+            for start in range(0, len(ids), STATUS_CHANGE_CHUNK_SIZE):
+                chunk = ids[start:start + STATUS_CHANGE_CHUNK_SIZE]
+                # RETURNING rows must be read before the commit
+                with transaction():
+                    rows = execute(sql, (status, json.dumps(chunk), json.dumps(from_statuses))).fetchall()
+                changed.extend(row[0] for row in rows)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+        return sorted(changed)
@@ -0,0 +1,105 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from src.db.connection import execute, fetch_all, fetch_one
+from src.utils.errors import handle_sqlite_error
+from src.utils.sql import generate_placeholders
+
+CHANGE_LOG_RETENTION_SECONDS = int(os.getenv("CHANGE_LOG_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+CHANGE_LOG_MAX_ROWS = int(os.getenv("CHANGE_LOG_MAX_ROWS", "1000000"))
+CHANGE_LOG_COMPACT_BATCH = int(os.getenv("CHANGE_LOG_COMPACT_BATCH", "5000"))
+CHANGE_LOG_COMPACT_INTERVAL_SECONDS = int(os.getenv("CHANGE_LOG_COMPACT_INTERVAL_SECONDS", "60"))
+
+
+def retention_cutoff(retain_seconds: int, now: datetime | None = None) -> str:
+    """Oldest changed_at kept, formatted like the column default (SQLite's %f is SS.SSS)."""
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=retain_seconds)
+    return cutoff.strftime("%Y-%m-%dT%H:%M:%S.") + f"{cutoff.microsecond // 1000:03d}Z"
+
+
+class ChangeLogRepository:
+    def __init__(self):
+        self.table = "change_log"
+        self.id_column = "seq"
+
+    def find_since(self, since: int, limit: int, tables: list[str] | None = None) -> list[dict[str, Any]]:
+        try:
+            params: list[Any] = [since]
+            table_filter = ""
+            if tables:
+                table_filter = f"AND table_name IN ({generate_placeholders(len(tables))})"
+                params.extend(tables)
+            params.append(limit)
+
+            sql = f"SELECT * FROM {self.table} WHERE seq > ? {table_filter} ORDER BY seq LIMIT ?"
+            return fetch_all(sql, params)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def latest_seq(self) -> int:
+        try:
+            row = fetch_one(f"SELECT MAX(seq) AS latest FROM {self.table}")
+            return row["latest"] or 0
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def compacted_through(self) -> int:
+        try:
+            row = fetch_one("SELECT compacted_through FROM change_log_compaction WHERE id = 1")
+            return row["compacted_through"] if row else 0
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def compact(self, retain_seconds: int, max_rows: int, batch_size: int) -> int:
+        """Delete at most batch_size of the oldest entries outside the retention window or max_rows.
+
+        seq grows with time, so both limits translate into a "delete seq <= upto" primary key
+        range, and a pass costs O(batch_size) however large the log is.
+        """
+        try:
+            cutoff = retention_cutoff(retain_seconds)
+            row = fetch_one(
+                f"""
+                SELECT
+                    (SELECT MIN(seq) FROM {self.table}) AS oldest,
+                    (SELECT MAX(seq) FROM {self.table}) AS latest,
+                    (SELECT MAX(seq) FROM (
+                        SELECT seq FROM {self.table} WHERE changed_at < ? ORDER BY changed_at LIMIT ?
+                    )) AS expired_through
+                """,
+                (cutoff, batch_size),
+            )
+            if row["oldest"] is None:
+                return 0
+
+            upto = max(row["expired_through"] or 0, row["latest"] - max_rows)
+            upto = min(upto, row["oldest"] + batch_size - 1)
+            if upto < row["oldest"]:
+                return 0
+
+            deleted = execute(f"DELETE FROM {self.table} WHERE seq <= ?", (upto,), idempotent=True).rowcount
+            execute(
+                "UPDATE change_log_compaction SET compacted_through = MAX(compacted_through, ?) WHERE id = 1",
+                (upto,),
+                idempotent=True,
+            )
+            return deleted
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+
+def get_change_log_repository() -> ChangeLogRepository:
+    return ChangeLogRepository()
+
+
+def compact_change_log(max_batches: int = 10) -> int:
+    """Apply the configured retention, a bounded number of batches per call."""
+    repo = get_change_log_repository()
+    deleted = 0
+    for _ in range(max_batches):
+        batch = repo.compact(CHANGE_LOG_RETENTION_SECONDS, CHANGE_LOG_MAX_ROWS, CHANGE_LOG_COMPACT_BATCH)
+        deleted += batch
+        if batch < CHANGE_LOG_COMPACT_BATCH:
+            break
+    return deleted
@@ -1,11 +1,20 @@
 from typing import Any
 
 from src.db.connection import fetch_all
-from src.repositories.base_repo import BaseRepository
+from src.models.status import OPEN_DELIVERY_STATUSES
+from src.repositories.base_repo import StatusRepository
+from src.utils.dates import DAY_OF_PARAM, bucket_label, bucket_query, require_date_text, require_interval
 from src.utils.errors import handle_sqlite_error
 
 
-class DeliveriesRepository(BaseRepository):
+class DeliveriesRepository(StatusRepository):
+    open_statuses = OPEN_DELIVERY_STATUSES
+    status_filters = {
+        "supplier_id": "supplier_id = ?",
+        "delivery_date_from": f"delivery_day >= {DAY_OF_PARAM}",
+        "delivery_date_to": f"delivery_day <= {DAY_OF_PARAM}",
+    }
+
     def __init__(self):
         super().__init__("deliveries", "delivery_id")
 
@@ -16,17 +25,25 @@ class DeliveriesRepository(BaseRepository):
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
-    def find_by_status(self, status: str) -> list[dict[str, Any]]:
+    def find_by_date_range(self, start_date: str, end_date: str) -> list[dict[str, Any]]:
+        """Deliveries dated from start_date through end_date (whole days, UTC), by date then id."""
+        params = (require_date_text(start_date), require_date_text(end_date))
         try:
-            sql = f"SELECT * FROM {self.table} WHERE status = ? ORDER BY {self.id_column}"
-            return fetch_all(sql, (status,))
+            sql = (
+                f"SELECT * FROM {self.table} WHERE delivery_day BETWEEN {DAY_OF_PARAM} AND {DAY_OF_PARAM} "
+                f"ORDER BY delivery_day, {self.id_column}"
+            )
+            return fetch_all(sql, params)
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
-    def find_by_date_range(self, start_date: str, end_date: str) -> list[dict[str, Any]]:
+    def count_by_bucket(self, interval: str, start_date: str, end_date: str) -> list[dict[str, Any]]:
+        """Deliveries per day or month from start_date through end_date, oldest first."""
+        interval = require_interval(interval)
+        start_date, end_date = require_date_text(start_date), require_date_text(end_date)
         try:
-            sql = f"SELECT * FROM {self.table} WHERE delivery_date BETWEEN ? AND ? ORDER BY delivery_date, {self.id_column}"
-            return fetch_all(sql, (start_date, end_date))
+            sql, params = bucket_query(self.table, "delivery_day", "delivery_month", interval, start_date, end_date)
+            return [{"bucket": bucket_label(interval, row["bucket"]), "count": row["count"]} for row in fetch_all(sql, params)]
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
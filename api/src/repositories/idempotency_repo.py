@@ -0,0 +1,114 @@
+import time
+from datetime import datetime
+from typing import Any
+
+from src.db.connection import execute, fetch_one
+from src.utils.errors import handle_sqlite_error
+
+
+class IdempotencyRepository:
+    def __init__(self):
+        self.table = "idempotency_keys"
+
+    def reserve(
+        self,
+        key: str,
+        method: str,
+        path: str,
+        request_hash: str,
+        lease_token: str,
+        ttl_seconds: int,
+        lock_seconds: int,
+    ) -> dict[str, Any] | None:
+        """Reserve a key for a new request, held by `lease_token` for `lock_seconds` while it runs.
+
+        Returns None when the reservation succeeded, otherwise the existing row
+        (completed or still in progress) stored for the key. An expired key, or one
+        still in progress past its lease, is taken over under the new token.
+        """
+        try:
+            now = int(time.time())
+            cursor = execute(
+                f"""
+                INSERT INTO {self.table}
+                    (idempotency_key, method, path, request_hash, created_at, expires_at, locked_until, lease_token)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (idempotency_key, method, path) DO UPDATE SET
+                    request_hash = excluded.request_hash,
+                    status_code = NULL,
+                    content_type = NULL,
+                    response_body = NULL,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at,
+                    locked_until = excluded.locked_until,
+                    lease_token = excluded.lease_token
+                WHERE {self.table}.expires_at < ?
+                   OR ({self.table}.status_code IS NULL AND COALESCE({self.table}.locked_until, 0) < ?)
+                """,
+                (
+                    key, method, path, request_hash, datetime.now().isoformat(), now + ttl_seconds,
+                    now + lock_seconds, lease_token, now, now,
+                ),
+            )
+
+            if cursor.rowcount == 1:
+                return None
+
+            return self.find(key, method, path)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find(self, key: str, method: str, path: str) -> dict[str, Any] | None:
+        try:
+            sql = f"SELECT * FROM {self.table} WHERE idempotency_key = ? AND method = ? AND path = ?"
+            return fetch_one(sql, (key, method, path))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def complete(
+        self,
+        key: str,
+        method: str,
+        path: str,
+        lease_token: str,
+        status_code: int,
+        content_type: str | None,
+        body: bytes,
+    ) -> None:
+        """Store the response, unless the key has since been taken over by another lease."""
+        try:
+            sql = f"""
+            UPDATE {self.table} SET status_code = ?, content_type = ?, response_body = ?
+            WHERE idempotency_key = ? AND method = ? AND path = ? AND lease_token = ? AND status_code IS NULL
+            """
+            execute(sql, (status_code, content_type, body, key, method, path, lease_token), idempotent=True)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def release(self, key: str, method: str, path: str, lease_token: str) -> None:
+        """Free a key still in progress under `lease_token`, so the client can retry for real."""
+        try:
+            sql = f"""
+            DELETE FROM {self.table}
+            WHERE idempotency_key = ? AND method = ? AND path = ? AND lease_token = ? AND status_code IS NULL
+            """
+            execute(sql, (key, method, path, lease_token), idempotent=True)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def prune_expired(self, limit: int) -> int:
+        """Delete at most `limit` expired keys, oldest first, using the expires_at index."""
+        try:
+            sql = f"""
+            DELETE FROM {self.table} WHERE rowid IN (
+                SELECT rowid FROM {self.table} WHERE expires_at < ? ORDER BY expires_at LIMIT ?
+            )
+            """
+            cursor = execute(sql, (int(time.time()), limit), idempotent=True)
+            return cursor.rowcount
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+
+def get_idempotency_repository() -> IdempotencyRepository:
+    return IdempotencyRepository()
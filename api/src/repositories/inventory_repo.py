@@ -0,0 +1,185 @@
+import os
+from datetime import datetime
+from typing import Any
+
+from src.db.connection import execute, fetch_all, fetch_one, transaction
+from src.models.status import DELIVERY_STATUS_TRANSITIONS
+from src.utils.errors import ConflictError, DatabaseError, NotFoundError, handle_sqlite_error
+
+STOCK_HISTORY_PAGE_SIZE = int(os.getenv("STOCK_HISTORY_PAGE_SIZE", "100"))
+# Let consumption take a balance below zero (stock booked out before its receipt is recorded)
+ALLOW_NEGATIVE_STOCK = os.getenv("ALLOW_NEGATIVE_STOCK", "false").lower() == "true"
+
+# Adds the movement's delta to the running balance. The new quantity is computed by SQLite
+# from the stored one under the write lock, never from a value read earlier, so concurrent
+# movements of the same product cannot overwrite each other.
+_APPLY_MOVEMENT = """
+INSERT INTO stock_balances (branch_id, product_id, quantity, last_movement_id, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (branch_id, product_id) DO UPDATE SET
+    quantity = quantity + excluded.quantity,
+    last_movement_id = excluded.last_movement_id,
+    updated_at = excluded.updated_at
+RETURNING quantity
+"""
+
+# Delivered order lines of a delivery not yet received, with the branch that ordered them
+_UNRECEIVED_LINES = """
+SELECT odd.order_detail_delivery_id, o.branch_id, od.product_id, odd.quantity
+FROM order_detail_deliveries AS odd
+JOIN order_details AS od ON od.order_detail_id = odd.order_detail_id
+JOIN orders AS o ON o.order_id = od.order_id
+WHERE odd.delivery_id = ? AND odd.quantity > 0
+AND NOT EXISTS (SELECT 1 FROM stock_movements AS m WHERE m.order_detail_delivery_id = odd.order_detail_delivery_id)
+ORDER BY odd.order_detail_delivery_id
+"""
+
+# Lines of a delivery archived with their order (src.db.archive) before they were received
+_ARCHIVED_UNRECEIVED_LINES = """
+SELECT odd.order_detail_delivery_id
+FROM archive.order_detail_deliveries AS odd
+WHERE odd.delivery_id = ? AND odd.quantity > 0
+AND NOT EXISTS (SELECT 1 FROM stock_movements AS m WHERE m.order_detail_delivery_id = odd.order_detail_delivery_id)
+ORDER BY odd.order_detail_delivery_id
+"""
+
+
+class InventoryRepository:
+    """Stock per (branch, product): an append-only movement ledger and the balance it adds up to."""
+
+    def __init__(self):
+        self.table = "stock_movements"
+        self.id_column = "movement_id"
+
+    def find_balance(self, branch_id: int, product_id: int) -> dict[str, Any] | None:
+        try:
+            sql = "SELECT * FROM stock_balances WHERE branch_id = ? AND product_id = ?"
+            return fetch_one(sql, (branch_id, product_id))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_balances(self, branch_id: int) -> list[dict[str, Any]]:
+        try:
+            sql = "SELECT * FROM stock_balances WHERE branch_id = ? ORDER BY product_id"
+            return fetch_all(sql, (branch_id,))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_low_stock(self, branch_id: int | None = None) -> list[dict[str, Any]]:
+        """Balances at or below their reorder level, read from the partial index of those rows only."""
+        try:
+            if branch_id is None:
+                sql = "SELECT * FROM stock_balances WHERE quantity <= reorder_level ORDER BY branch_id, product_id"
+                return fetch_all(sql)
+
+            sql = "SELECT * FROM stock_balances WHERE quantity <= reorder_level AND branch_id = ? ORDER BY product_id"
+            return fetch_all(sql, (branch_id,))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_movements(
+        self, branch_id: int, product_id: int, after_id: int = 0, limit: int = STOCK_HISTORY_PAGE_SIZE
+    ) -> list[dict[str, Any]]:
+        """One page of a pair's ledger in movement order, after the `after_id` cursor."""
+        try:
+            sql = (
+                f"SELECT * FROM {self.table} WHERE branch_id = ? AND product_id = ? AND {self.id_column} > ? "
+                f"ORDER BY {self.id_column} LIMIT ?"
+            )
+            return fetch_all(sql, (branch_id, product_id, after_id, limit))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def set_reorder_level(self, branch_id: int, product_id: int, reorder_level: int) -> dict[str, Any]:
+        try:
+            execute(
+                "INSERT INTO stock_balances (branch_id, product_id, reorder_level, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (branch_id, product_id) DO UPDATE SET "
+                "reorder_level = excluded.reorder_level, updated_at = excluded.updated_at",
+                (branch_id, product_id, reorder_level, datetime.now().isoformat()),
+            )
+            return self.find_balance(branch_id, product_id)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def receive_delivery(self, delivery_id: int) -> dict[str, Any]:
+        """Book the delivery's order lines into the ordering branches' stock.
+
+        Only a delivered delivery is received; one in transit is marked delivered in the same
+        transaction. Lines received before are skipped, so receiving a delivery again only
+        books lines linked to it since; the unique receipt index backs this up against races.
+        Lines archived with their order are not booked and come back in `archived_line_ids`.
+        """
+        try:
+            with transaction():
+                delivery = fetch_one("SELECT status FROM deliveries WHERE delivery_id = ?", (delivery_id,))
+                if delivery is None:
+                    raise NotFoundError(f"deliveries with id {delivery_id} not found")
+                if delivery["status"] != "delivered":
+                    if "delivered" not in DELIVERY_STATUS_TRANSITIONS.get(delivery["status"], set()):
+                        raise ConflictError(f"Delivery {delivery_id} is {delivery['status']} and cannot be received")
+                    execute("UPDATE deliveries SET status = 'delivered' WHERE delivery_id = ?", (delivery_id,))
+
+                now = datetime.now().isoformat()
+                movements = [
+                    self._append(line["branch_id"], line["product_id"], line["quantity"], "receipt", now,
+                                 order_detail_delivery_id=line["order_detail_delivery_id"])
+                    for line in fetch_all(_UNRECEIVED_LINES, (delivery_id,))
+                ]
+                archived = [row["order_detail_delivery_id"] for row in fetch_all(_ARCHIVED_UNRECEIVED_LINES, (delivery_id,))]
+                return {"movements": movements, "archived_line_ids": archived}
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def consume(self, branch_id: int, lines: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Take `lines` ({product_id, quantity, notes}) out of a branch's stock, all or nothing."""
+        try:
+            with transaction():
+                now = datetime.now().isoformat()
+                return [
+                    self._append(branch_id, line["product_id"], -line["quantity"], "consumption", now, notes=line.get("notes"))
+                    for line in lines
+                ]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def _append(
+        self,
+        branch_id: int,
+        product_id: int,
+        quantity: int,
+        kind: str,
+        now: str,
+        order_detail_delivery_id: int | None = None,
+        notes: str | None = None,
+    ) -> dict[str, Any]:
+        """Append one movement and apply it to the balance; call inside transaction()."""
+        movement = {
+            "branch_id": branch_id,
+            "product_id": product_id,
+            "quantity": quantity,
+            "kind": kind,
+            "order_detail_delivery_id": order_detail_delivery_id,
+            "notes": notes,
+            "created_at": now,
+        }
+        movement["movement_id"] = execute(
+            f"INSERT INTO {self.table} (branch_id, product_id, quantity, kind, order_detail_delivery_id, notes, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            tuple(movement.values()),
+        ).lastrowid
+
+        balance = execute(_APPLY_MOVEMENT, (branch_id, product_id, quantity, movement["movement_id"], now)).fetchone()[0]
+        if balance < 0 and not ALLOW_NEGATIVE_STOCK:
+            raise ConflictError(
+                f"Insufficient stock of product {product_id} at branch {branch_id}: {balance - quantity} on hand"
+            )
+        movement["balance"] = balance
+        return movement
+
+
+def get_inventory_repository() -> InventoryRepository:
+    return InventoryRepository()
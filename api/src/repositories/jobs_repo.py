@@ -0,0 +1,118 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from src.db.connection import execute, fetch_all, fetch_one
+from src.repositories.base_repo import BaseRepository
+from src.utils.errors import handle_sqlite_error
+
+
+class JobsRepository(BaseRepository):
+    def __init__(self):
+        super().__init__("jobs", "job_id")
+
+    def _row_to_dict(self, row: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not row:
+            return row
+
+        result = dict(row)
+        for column in ("params", "result"):
+            if result.get(column):
+                result[column] = json.loads(result[column])
+        result["cancel_requested"] = bool(result["cancel_requested"])
+        return result
+
+    def find_all(self) -> list[dict[str, Any]]:
+        return [self._row_to_dict(row) for row in super().find_all()]
+
+    def find_by_id(self, job_id: int) -> dict[str, Any] | None:
+        return self._row_to_dict(super().find_by_id(job_id))
+
+    def find_by_status(self, status: str) -> list[dict[str, Any]]:
+        try:
+            sql = f"SELECT * FROM {self.table} WHERE status = ? ORDER BY {self.id_column}"
+            return [self._row_to_dict(row) for row in fetch_all(sql, (status,))]
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def enqueue(self, job_type: str, params: dict[str, Any]) -> dict[str, Any]:
+        return self.create({
+            "job_type": job_type,
+            "status": "queued",
+            "params": json.dumps(params),
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def mark_running(self, job_id: int) -> bool:
+        """Move a queued job to running. Returns False if it was cancelled before it started."""
+        try:
+            sql = f"""
+            UPDATE {self.table} SET status = 'running', started_at = ?
+            WHERE {self.id_column} = ? AND status = 'queued' AND cancel_requested = 0
+            """
+            cursor = execute(sql, (datetime.now().isoformat(), job_id))
+            return cursor.rowcount == 1
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def update_progress(self, job_id: int, progress: float, message: str | None) -> None:
+        try:
+            sql = f"UPDATE {self.table} SET progress = ?, message = ? WHERE {self.id_column} = ?"
+            execute(sql, (progress, message, job_id), idempotent=True)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def mark_finished(
+        self,
+        job_id: int,
+        status: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+        message: str | None = None,
+    ) -> None:
+        try:
+            sql = f"""
+            UPDATE {self.table}
+            SET status = ?, result = ?, error = ?, message = COALESCE(?, message), finished_at = ?,
+                progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END
+            WHERE {self.id_column} = ?
+            """
+            execute(sql, (
+                status,
+                json.dumps(result) if result is not None else None,
+                error,
+                message,
+                datetime.now().isoformat(),
+                status,
+                job_id,
+            ), idempotent=True)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def request_cancel(self, job_id: int) -> None:
+        """Flag a job for cancellation; queued jobs are cancelled immediately."""
+        try:
+            execute(f"UPDATE {self.table} SET cancel_requested = 1 WHERE {self.id_column} = ?", (job_id,), idempotent=True)
+            execute(
+                f"UPDATE {self.table} SET status = 'cancelled', finished_at = ? WHERE {self.id_column} = ? AND status = 'queued'",
+                (datetime.now().isoformat(), job_id),
+                idempotent=True,
+            )
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def fail_interrupted(self) -> int:
+        """Jobs left running by a previous process can never finish; mark them failed."""
+        try:
+            sql = f"""
+            UPDATE {self.table} SET status = 'failed', error = 'Interrupted by server restart', finished_at = ?
+            WHERE status = 'running'
+            """
+            cursor = execute(sql, (datetime.now().isoformat(),))
+            return cursor.rowcount
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+
+def get_jobs_repository() -> JobsRepository:
+    return JobsRepository()
@@ -1,21 +1,53 @@
 from typing import Any
 
-from src.db.connection import fetch_all
+from src.db.archive import ensure_not_archived, fetch_all_with_archive, find_archived
 from src.repositories.base_repo import BaseRepository
 from src.utils.errors import handle_sqlite_error
+from src.utils.loader import RowsById, request_loader
 
 
 class OrderDetailsRepository(BaseRepository):
+    """Order details across the hot table and the archive (src.db.archive); archived details are read-only."""
+
     def __init__(self):
         super().__init__("order_details", "order_detail_id")
 
+    def find_all(self) -> list[dict[str, Any]]:
+        try:
+            return fetch_all_with_archive(self.table, self.id_column)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_by_id(self, id_value: int) -> dict[str, Any] | None:
+        try:
+            if request_loader(self.id_column, self._rows_by_ids) is not None:
+                # The loader reads through _rows_by_ids, which already falls back to the archive
+                return super().find_by_id(id_value)
+            return super().find_by_id(id_value) or find_archived(self.table, self.id_column, id_value)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def _rows_by_ids(self, ids: list[int], table: str | None = None) -> RowsById:
+        found = super()._rows_by_ids(ids)
+        archived = [id_value for id_value in ids if id_value not in found]
+        if archived:
+            found.update(super()._rows_by_ids(archived, f"archive.{self.table}"))
+        return found
+
     def find_by_order_id(self, order_id: int) -> list[dict[str, Any]]:
         try:
-            sql = f"SELECT * FROM {self.table} WHERE order_id = ? ORDER BY {self.id_column}"
-            return fetch_all(sql, (order_id,))
+            return fetch_all_with_archive(self.table, self.id_column, "order_id = ?", (order_id,))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def update(self, id_value: int, data: dict[str, Any]) -> dict[str, Any]:
+        ensure_not_archived(self.table, self.id_column, id_value)
+        return super().update(id_value, data)
+
+    def delete(self, id_value: int) -> None:
+        ensure_not_archived(self.table, self.id_column, id_value)
+        super().delete(id_value)
+
 
 def get_order_details_repository() -> OrderDetailsRepository:
     return OrderDetailsRepository()
@@ -1,35 +1,119 @@
 from typing import Any
 
-from src.db.connection import fetch_all
-from src.repositories.base_repo import BaseRepository
+from src.db.archive import ensure_not_archived, fetch_all_with_archive, find_archived
+from src.db.cascade import CascadePlan
+from src.db.connection import fetch_all, fetch_one
+from src.models.status import OPEN_ORDER_STATUSES
+from src.repositories.base_repo import StatusRepository
+from src.utils.dates import DAY_OF_PARAM, bucket_label, bucket_query, require_date_text, require_interval
 from src.utils.errors import handle_sqlite_error
+from src.utils.loader import RowsById, request_loader
 
 
-class OrdersRepository(BaseRepository):
+class OrdersRepository(StatusRepository):
+    """Orders across the hot table and the archive (src.db.archive); archived orders are read-only."""
+
+    open_statuses = OPEN_ORDER_STATUSES
+    status_filters = {
+        "branch_id": "branch_id = ?",
+        "order_date_from": f"order_day >= {DAY_OF_PARAM}",
+        "order_date_to": f"order_day <= {DAY_OF_PARAM}",
+        "delivery_id": (
+            "order_id IN (SELECT od.order_id FROM order_details AS od "
+            "JOIN order_detail_deliveries AS odd ON odd.order_detail_id = od.order_detail_id WHERE odd.delivery_id = ?)"
+        ),
+    }
+
     def __init__(self):
         super().__init__("orders", "order_id")
 
+    def find_all(self) -> list[dict[str, Any]]:
+        try:
+            return fetch_all_with_archive(self.table, self.id_column)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_by_id(self, id_value: int) -> dict[str, Any] | None:
+        try:
+            if request_loader(self.id_column, self._rows_by_ids) is not None:
+                # The loader reads through _rows_by_ids, which already falls back to the archive
+                return super().find_by_id(id_value)
+            return super().find_by_id(id_value) or find_archived(self.table, self.id_column, id_value)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def _rows_by_ids(self, ids: list[int], table: str | None = None) -> RowsById:
+        found = super()._rows_by_ids(ids)
+        archived = [id_value for id_value in ids if id_value not in found]
+        if archived:
+            found.update(super()._rows_by_ids(archived, f"archive.{self.table}"))
+        return found
+
     def find_by_branch_id(self, branch_id: int) -> list[dict[str, Any]]:
         try:
-            sql = f"SELECT * FROM {self.table} WHERE branch_id = ? ORDER BY {self.id_column}"
-            return fetch_all(sql, (branch_id,))
+            return fetch_all_with_archive(self.table, self.id_column, "branch_id = ?", (branch_id,))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
     def find_by_status(self, status: str) -> list[dict[str, Any]]:
         try:
-            sql = f"SELECT * FROM {self.table} WHERE status = ? ORDER BY {self.id_column}"
-            return fetch_all(sql, (status,))
+            return fetch_all_with_archive(self.table, self.id_column, self._status_condition(status), (status,))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
     def find_by_date_range(self, start_date: str, end_date: str) -> list[dict[str, Any]]:
+        """Orders dated from start_date through end_date (whole days, UTC), by date then id."""
+        params = (require_date_text(start_date), require_date_text(end_date))
         try:
-            sql = f"SELECT * FROM {self.table} WHERE order_date BETWEEN ? AND ? ORDER BY order_date, {self.id_column}"
-            return fetch_all(sql, (start_date, end_date))
+            where = f"order_day BETWEEN {DAY_OF_PARAM} AND {DAY_OF_PARAM}"
+            if not self.archive_reaches(start_date):
+                sql = f"SELECT * FROM {self.table} WHERE {where} ORDER BY order_day, {self.id_column}"
+                return fetch_all(sql, params)
+
+            return fetch_all_with_archive(self.table, self.id_column, where, params, f"order_day, {self.id_column}")
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def count_by_bucket(self, interval: str, start_date: str, end_date: str) -> list[dict[str, Any]]:
+        """Orders per day or month from start_date through end_date, hot and archived, oldest first."""
+        interval = require_interval(interval)
+        start_date, end_date = require_date_text(start_date), require_date_text(end_date)
+        try:
+            sql, params = bucket_query(self.table, "order_day", "order_month", interval, start_date, end_date)
+            counts = {row["bucket"]: row["count"] for row in fetch_all(sql, params)}
+
+            if self.archive_reaches(start_date):
+                sql, params = bucket_query(
+                    f"archive.{self.table} AS a", "order_day", "order_month", interval, start_date, end_date,
+                    f" AND NOT EXISTS (SELECT 1 FROM main.{self.table} AS h WHERE h.{self.id_column} = a.{self.id_column})",
+                )
+                for row in fetch_all(sql, params):
+                    counts[row["bucket"]] = counts.get(row["bucket"], 0) + row["count"]
+
+            return [{"bucket": bucket_label(interval, bucket), "count": counts[bucket]} for bucket in sorted(counts)]
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def archive_reaches(self, start_date: str) -> bool:
+        """Whether the archive holds orders dated start_date or later; ranges starting after it only need the hot table."""
+        try:
+            row = fetch_one(f"SELECT max(order_day) >= {DAY_OF_PARAM} AS reaches FROM archive.{self.table}", (start_date,))
+            return bool(row and row["reaches"])
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def update(self, id_value: int, data: dict[str, Any]) -> dict[str, Any]:
+        ensure_not_archived(self.table, self.id_column, id_value)
+        return super().update(id_value, data)
+
+    def delete(self, id_value: int) -> None:
+        ensure_not_archived(self.table, self.id_column, id_value)
+        super().delete(id_value)
+
+    def cascade_plan(self, id_value: int, count_limit: int | None = None) -> CascadePlan:
+        ensure_not_archived(self.table, self.id_column, id_value)
+        return super().cascade_plan(id_value, count_limit)
+
 
 def get_orders_repository() -> OrdersRepository:
     return OrdersRepository()
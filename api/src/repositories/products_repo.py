@@ -1,8 +1,17 @@
+import sqlite3
 from typing import Any
 
-from src.db.connection import execute, fetch_all, fetch_one
+from src.db.catalog import catalog_table, register_catalog_table
+from src.db.connection import execute, execute_many, fetch_all, fetch_one, transaction
 from src.utils.errors import ConflictError, NotFoundError, handle_sqlite_error
-from src.utils.sql import build_insert_sql, build_update_sql
+from src.utils.loader import RowsById, request_loader
+from src.utils.sql import build_insert_sql, build_update_sql, generate_placeholders, id_chunks
+
+
+# Columns an import writes; sku is the natural key rows are matched on
+UPSERT_COLUMNS = ("supplier_id", "name", "description", "price", "sku", "unit", "img_name", "discount")
+
+register_catalog_table("products", "product_id", "SELECT * FROM products ORDER BY product_id")
 
 
 class ProductsRepository:
@@ -12,6 +21,10 @@ class ProductsRepository:
 
     def find_all(self) -> list[dict[str, Any]]:
         try:
+            snapshot = catalog_table(self.table)
+            if snapshot is not None:
+                return snapshot.rows()
+
             sql = f"SELECT * FROM {self.table} ORDER BY {self.id_column}"
             return fetch_all(sql)
         except Exception as e:
@@ -19,11 +32,40 @@ class ProductsRepository:
 
     def find_by_id(self, product_id: int) -> dict[str, Any] | None:
         try:
+            snapshot = catalog_table(self.table)
+            if snapshot is not None:
+                return snapshot.get(product_id)
+
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return loader.load(product_id)
+
             sql = f"SELECT * FROM {self.table} WHERE {self.id_column} = ?"
             return fetch_one(sql, (product_id,))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def find_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Rows for `ids` in the order given, skipping ids that do not exist."""
+        try:
+            ids = list(dict.fromkeys(ids))
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return [row for row in loader.load_many(ids) if row is not None]
+
+            found = self._rows_by_ids(ids)
+            return [found[id_value] for id_value in ids if id_value in found]
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def _rows_by_ids(self, ids: list[int]) -> RowsById:
+        found = {}
+        for chunk in id_chunks(ids):
+            sql = f"SELECT * FROM {self.table} WHERE {self.id_column} IN ({generate_placeholders(len(chunk))})"
+            for row in fetch_all(sql, chunk):
+                found[row[self.id_column]] = row
+        return found
+
     def create(self, data: dict[str, Any]) -> dict[str, Any]:
         try:
             sql, values = build_insert_sql(self.table, data)
@@ -50,7 +92,7 @@ class ProductsRepository:
 
             sql, values = build_update_sql(
                 self.table, data_copy, self.id_column)
-            cursor = execute(sql, values)
+            cursor = execute(sql, values, idempotent=True)
 
             if cursor.rowcount == 0:
                 raise NotFoundError(f"No changes made to product {product_id}")
@@ -72,12 +114,49 @@ class ProductsRepository:
                 raise NotFoundError(f"Product with id {product_id} not found")
 
             sql = f"DELETE FROM {self.table} WHERE {self.id_column} = ?"
-            execute(sql, (product_id,))
+            execute(sql, (product_id,), idempotent=True)
         except NotFoundError:
             raise
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def upsert_many(self, rows: list[dict[str, Any]]) -> list[tuple[int, str]]:
+        """Insert `rows`, updating the product that already has a row's sku, in one transaction.
+
+        The batch runs as one prepared statement. If a row breaks a constraint the batch is
+        undone and replayed row by row so only the offending rows are left out; they are
+        returned as (position in `rows`, error).
+        """
+        columns = ", ".join(UPSERT_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in UPSERT_COLUMNS if column != "sku")
+        sql = (
+            f"INSERT INTO {self.table} ({columns}) VALUES ({generate_placeholders(len(UPSERT_COLUMNS))}) "
+            f"ON CONFLICT (sku) DO UPDATE SET {updates}"
+        )
+        values = [tuple(row.get(column) for column in UPSERT_COLUMNS) for row in rows]
+
+        try:
+            with transaction() as conn:
+                conn.execute("SAVEPOINT upsert_batch")
+                try:
+                    execute_many(sql, values)
+                    return []
+                except sqlite3.IntegrityError:
+                    conn.execute("ROLLBACK TO upsert_batch")
+                finally:
+                    conn.execute("RELEASE upsert_batch")
+
+                # A failed statement only undoes itself, so the good rows stay
+                failures = []
+                for position, row_values in enumerate(values):
+                    try:
+                        execute(sql, row_values)
+                    except sqlite3.IntegrityError as e:
+                        failures.append((position, handle_sqlite_error(e).message))
+                return failures
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
     def exists(self, product_id: int) -> bool:
         sql = f"SELECT 1 FROM {self.table} WHERE {self.id_column} = ?"
         result = fetch_one(sql, (product_id,))
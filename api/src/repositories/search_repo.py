@@ -0,0 +1,117 @@
+import os
+from collections import Counter
+from typing import Any
+
+from src.db.connection import fetch_all
+from src.utils.errors import ValidationError, handle_sqlite_error
+from src.utils.search import (
+    SEARCH_CANDIDATES,
+    SEARCH_COMMON_TRIGRAM_ROWS,
+    SEARCH_MIN_QUERY_LENGTH,
+    SEARCH_MIN_SCORE,
+    score,
+    substring_query,
+    trigrams,
+)
+
+SEARCH_RESULT_LIMIT = int(os.getenv("SEARCH_RESULT_LIMIT", "20"))
+
+# Source table of a search_index row, encoded in its rowid as id * 4 + kind (migration 011)
+SEARCH_TYPES = {"suppliers": 1, "headquarters": 2, "branches": 3}
+_TYPE_BY_KIND = {kind: name for name, kind in SEARCH_TYPES.items()}
+
+# (trigram, kinds) found in more than SEARCH_COMMON_TRIGRAM_ROWS rows. Reading a common
+# trigram's rows is what makes a lookup slow, so each process does it once. A trigram only
+# becomes rare again through deletes, and one wrongly taken as common just stops counting
+# towards candidates.
+_common_trigrams: set[tuple[str, tuple[int, ...]]] = set()
+
+
+class SearchRepository:
+    """Typo-tolerant search over supplier, headquarters and branch names and contacts."""
+
+    def __init__(self):
+        self.table = "search_index"
+
+    def search(self, q: str, types: list[str] | None = None, limit: int = SEARCH_RESULT_LIMIT) -> list[dict[str, Any]]:
+        """Best matches for `q`, highest score first.
+
+        Each query trigram is looked up on its own. Rows sharing the most of them become the
+        candidates, so a typo only costs a row the few trigrams it breaks; trigrams found in
+        more than SEARCH_COMMON_TRIGRAM_ROWS rows are skipped, which bounds the work. Only
+        the SEARCH_CANDIDATES best candidates are read and scored, far cheaper than bm25 over
+        every row sharing any trigram.
+        """
+        q = q.strip()
+        if len(q) < SEARCH_MIN_QUERY_LENGTH:
+            raise ValidationError(f"Search query must be at least {SEARCH_MIN_QUERY_LENGTH} characters")
+
+        unknown = sorted(set(types or ()) - SEARCH_TYPES.keys())
+        if unknown:
+            raise ValidationError(f"Unknown search types: {', '.join(unknown)}")
+
+        kinds = sorted({SEARCH_TYPES[t] for t in types or ()})
+        if not 0 < len(kinds) < len(SEARCH_TYPES):
+            kinds = []
+        query_grams = trigrams(q)
+
+        try:
+            candidates = self._candidates(q, query_grams, kinds)
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+        results = self._score(query_grams, candidates)
+        results.sort(key=lambda result: (-result["score"], result["name"], result["id"]))
+        return results[:limit]
+
+    def _candidates(self, q: str, query_grams: set[str], kinds: list[int]) -> list[dict[str, Any]]:
+        """Rows sharing the most uncommon query trigrams, at most SEARCH_CANDIDATES of them."""
+        kind_filter = f" AND rowid % 4 IN ({', '.join('?' * len(kinds))})" if kinds else ""
+        sql = f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH ?{kind_filter} LIMIT ?"
+        shared: Counter[int] = Counter()
+        for gram in query_grams:
+            if (gram, tuple(kinds)) in _common_trigrams:
+                continue
+            params = (substring_query(gram), *kinds, SEARCH_COMMON_TRIGRAM_ROWS + 1)
+            rowids = [row["rowid"] for row in fetch_all(sql, params)]
+            if len(rowids) > SEARCH_COMMON_TRIGRAM_ROWS:
+                _common_trigrams.add((gram, tuple(kinds)))
+            else:
+                shared.update(rowids)
+
+        if shared:
+            rowids = [rowid for rowid, _ in shared.most_common(SEARCH_CANDIDATES)]
+        else:
+            # Nothing but common trigrams: settle for rows containing the query verbatim
+            rowids = [row["rowid"] for row in fetch_all(sql, (substring_query(q), *kinds, SEARCH_CANDIDATES))]
+        if not rowids:
+            return []
+
+        sql = f"""
+            SELECT rowid, name, contact_person, email FROM {self.table}
+            WHERE rowid IN ({', '.join('?' * len(rowids))})
+        """
+        return fetch_all(sql, tuple(rowids))
+
+    @staticmethod
+    def _score(query_grams: set[str], candidates: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Candidates scoring at least SEARCH_MIN_SCORE, as search results."""
+        results = []
+        for row in candidates:
+            rowid = row["rowid"]
+            row_score = score(query_grams, row)
+            if row_score < SEARCH_MIN_SCORE:
+                continue
+            results.append({
+                "type": _TYPE_BY_KIND[rowid % 4],
+                "id": rowid // 4,
+                "name": row["name"],
+                "contact_person": row["contact_person"],
+                "email": row["email"],
+                "score": round(row_score, 4),
+            })
+        return results
+
+
+def get_search_repository() -> SearchRepository:
+    return SearchRepository()
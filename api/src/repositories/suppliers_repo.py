@@ -3,9 +3,13 @@ import json  # Unused import
 import time  # Another unused import
 from datetime import datetime  # Unused import
 
+from src.db.cascade import CascadePlan, plan_cascade
+from src.db.catalog import catalog_table, register_catalog_table
 from src.db.connection import execute, fetch_all, fetch_one
 from src.utils.errors import ConflictError, NotFoundError, handle_sqlite_error
-from src.utils.sql import build_insert_sql, build_update_sql
+from src.utils.loader import RowsById, request_loader
+from src.utils.search import SEARCH_MIN_QUERY_LENGTH, substring_query
+from src.utils.sql import build_insert_sql, build_update_sql, generate_placeholders, id_chunks
 
 # Old implementation that was replaced
 # def legacy_find_suppliers(name):
@@ -16,38 +20,68 @@ from src.utils.sql import build_insert_sql, build_update_sql
 #     pass
 
 
+# Flags are stored as 0/1; the "bool" converter (src.db.rows) returns them as booleans
+SUPPLIER_COLUMNS = (
+    "supplier_id, name, description, contact_person, email, phone, "
+    'active AS "active [bool]", verified AS "verified [bool]"'
+)
+
+register_catalog_table("suppliers", "supplier_id", f"SELECT {SUPPLIER_COLUMNS} FROM suppliers ORDER BY supplier_id")
+
+
 class SuppliersRepository:
     def __init__(self):
         self.table = "suppliers"
         self.id_column = "supplier_id"
-
-    def _row_to_dict(self, row: dict[str, Any]) -> dict[str, Any]:
-        if not row:
-            return row
-
-        result = dict(row)
-        if "active" in result:
-            result["active"] = bool(result["active"])
-        if "verified" in result:
-            result["verified"] = bool(result["verified"])
-        return result
+        self.columns = SUPPLIER_COLUMNS
 
     def find_all(self) -> list[dict[str, Any]]:
         try:
-            sql = f"SELECT * FROM {self.table} ORDER BY {self.id_column}"
-            rows = fetch_all(sql)
-            return [self._row_to_dict(row) for row in rows]
+            snapshot = catalog_table(self.table)
+            if snapshot is not None:
+                return snapshot.rows()
+
+            sql = f"SELECT {self.columns} FROM {self.table} ORDER BY {self.id_column}"
+            return fetch_all(sql)
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
     def find_by_id(self, supplier_id: int) -> dict[str, Any] | None:
         try:
-            sql = f"SELECT * FROM {self.table} WHERE {self.id_column} = ?"
-            row = fetch_one(sql, (supplier_id,))
-            return self._row_to_dict(row) if row else None
+            snapshot = catalog_table(self.table)
+            if snapshot is not None:
+                return snapshot.get(supplier_id)
+
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return loader.load(supplier_id)
+
+            sql = f"SELECT {self.columns} FROM {self.table} WHERE {self.id_column} = ?"
+            return fetch_one(sql, (supplier_id,))
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def find_by_ids(self, ids: list[int]) -> list[dict[str, Any]]:
+        """Rows for `ids` in the order given, skipping ids that do not exist."""
+        try:
+            ids = list(dict.fromkeys(ids))
+            loader = request_loader(self.id_column, self._rows_by_ids)
+            if loader is not None:
+                return [row for row in loader.load_many(ids) if row is not None]
+
+            found = self._rows_by_ids(ids)
+            return [found[id_value] for id_value in ids if id_value in found]
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
+    def _rows_by_ids(self, ids: list[int]) -> RowsById:
+        found = {}
+        for chunk in id_chunks(ids):
+            sql = f"SELECT {self.columns} FROM {self.table} WHERE {self.id_column} IN ({generate_placeholders(len(chunk))})"
+            for row in fetch_all(sql, chunk):
+                found[row[self.id_column]] = row
+        return found
+
     def create(self, data: dict[str, Any]) -> dict[str, Any]:
         try:
             data_copy = dict(data)
@@ -86,7 +120,7 @@ class SuppliersRepository:
 
             sql, values = build_update_sql(
                 self.table, data_copy, self.id_column)
-            cursor = execute(sql, values)
+            cursor = execute(sql, values, idempotent=True)
 
             if cursor.rowcount == 0:
                 raise NotFoundError(
@@ -110,7 +144,16 @@ class SuppliersRepository:
                     f"Supplier with id {supplier_id} not found")
 
             sql = f"DELETE FROM {self.table} WHERE {self.id_column} = ?"
-            execute(sql, (supplier_id,))
+            execute(sql, (supplier_id,), idempotent=True)
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise handle_sqlite_error(e) from e
+
+    def cascade_plan(self, supplier_id: int, count_limit: int | None = None) -> CascadePlan:
+        """Products, deliveries and order rows that delete() would take with it."""
+        try:
+            return plan_cascade(self.table, supplier_id, count_limit)
         except NotFoundError:
             raise
         except Exception as e:
@@ -122,10 +165,24 @@ class SuppliersRepository:
         return result is not None
 
     def find_by_name(self, name: str) -> list[dict[str, Any]]:
+        """Suppliers whose name contains `name`, case-insensitively.
+
+        Three characters or more are looked up in the trigram index (migration 011); shorter
+        names have no trigram to look up and fall back to scanning with LIKE.
+        """
         try:
-            sql = f"SELECT * FROM {self.table} WHERE name LIKE ? ORDER BY {self.id_column}"
-            rows = fetch_all(sql, (f"%{name}%",))
-            return [self._row_to_dict(row) for row in rows]
+            if len(name) < SEARCH_MIN_QUERY_LENGTH:
+                sql = f"SELECT {self.columns} FROM {self.table} WHERE name LIKE ? ORDER BY {self.id_column}"
+                return fetch_all(sql, (f"%{name}%",))
+
+            sql = f"""
+                SELECT {self.columns} FROM {self.table}
+                WHERE {self.id_column} IN (
+                    SELECT rowid / 4 FROM search_index WHERE search_index MATCH ? AND rowid % 4 = 1
+                )
+                ORDER BY {self.id_column}
+            """
+            return fetch_all(sql, (f"name : {substring_query(name)}",))
         except Exception as e:
             raise handle_sqlite_error(e) from e
 
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from src.db.backup import find_snapshot, list_snapshots
+from src.db.maintenance import collect_stats, maintenance
+from src.jobs.runner import job_runner
+from src.models.job import Job
+from src.middleware.profiling import get_output_dir, list_profiles, top_allocation_hotspots
+from src.utils.admin import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+def get_profiles() -> list[dict]:
+    """List captured request profiles, newest first."""
+    return list_profiles()
+
+
+@router.get("/profiles/allocations")
+def get_allocation_hotspots(limit: int = Query(10, ge=1, le=100)) -> dict[str, list[dict]]:
+    """Get the top allocation sites per route, accumulated across alloc-mode profiles."""
+    return top_allocation_hotspots(limit)
+
+
+@router.get("/profiles/{filename}")
+def download_profile(filename: str) -> FileResponse:
+    """Download a profile file (.folded, .speedscope.json, .summary.json or .alloc.txt)."""
+    output_dir = get_output_dir().resolve()
+    path = (output_dir / filename).resolve()
+
+    if path.parent != output_dir or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile file {filename} not found"
+        )
+
+    return FileResponse(path)
+
+
+@router.get("/maintenance")
+def get_maintenance_status() -> dict:
+    """Get database size, WAL size, page cache hit ratio and the state of each maintenance task."""
+    return {"leader": maintenance.leader, "stats": collect_stats(), "tasks": maintenance.status()}
+
+
+@router.post("/maintenance/{task_name}")
+def run_maintenance_task(task_name: str) -> dict:
+    """Run one maintenance task now (checkpoint, optimize, analyze, incremental_vacuum, vacuum, ...)."""
+    if task_name not in maintenance.tasks:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Maintenance task {task_name} not found"
+        )
+
+    task = maintenance.run_task(task_name)
+    if task.last_error:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=task.last_error)
+    return {"name": task.name, "result": task.last_result}
+
+
+@router.get("/backups")
+def get_backups() -> list[dict]:
+    """List database snapshots with their checksums and copy throughput, newest first."""
+    return list_snapshots()
+
+
+@router.post("/backups", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def create_backup() -> Job:
+    """Start an online backup as a background job; poll /api/jobs/{id} for progress."""
+    return job_runner.submit("backup")
+
+
+@router.get("/backups/{name}")
+def download_backup(name: str) -> FileResponse:
+    """Download a compressed snapshot, e.g. to provision a new node with `api-backup restore`."""
+    return FileResponse(find_snapshot(name), media_type="application/gzip", filename=f"{name}.db.gz")
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from src.models.batch import BatchRequest, BatchResult
+from src.routes import (
+    branch,
+    delivery,
+    headquarters,
+    inventory,
+    order,
+    order_detail,
+    order_detail_delivery,
+    product,
+    supplier,
+)
+from src.utils.batch import run_batch
+from src.utils.errors import DatabaseError
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# Routers whose operations may appear in a batch
+BATCH_ROUTERS = tuple(
+    module.router
+    for module in (supplier, headquarters, branch, product, order, order_detail, delivery, order_detail_delivery, inventory)
+)
+
+
+@router.post(
+    "",
+    response_model=BatchResult,
+    responses={"4XX": {"model": BatchResult, "description": "Atomic batch rolled back; status of the failing operation"}},
+)
+def run_batch_operations(request: BatchRequest):
+    """Run several API operations in one round trip and one transaction.
+
+    Operations reference earlier responses with `${ref.field}`, e.g. `"orderId": "${order.orderId}"`.
+    """
+    try:
+        status_code, result = run_batch(BATCH_ROUTERS, request)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+    return JSONResponse(BatchResult.model_validate(result).model_dump(mode="json"), status_code=status_code)
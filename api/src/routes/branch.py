@@ -3,14 +3,21 @@ from fastapi import APIRouter, HTTPException, status
 from src.models.branch import Branch, BranchCreate, BranchUpdate
 from src.repositories.branches_repo import get_branches_repository
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
 
 router = APIRouter(prefix="/branches", tags=["branches"])
 
 
 @router.get("", response_model=list[Branch])
-def get_all_branches():
+def get_all_branches(ids: IdsQuery = None):
     repo = get_branches_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{branch_id}", response_model=Branch)
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.models.change import Change, ChangeFeed
+from src.repositories.change_log_repo import get_change_log_repository
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+CHANGE_POLL_INTERVAL_SECONDS = float(os.getenv("CHANGE_POLL_INTERVAL_SECONDS", "0.25"))
+CHANGE_MAX_WAIT_SECONDS = 30
+CHANGE_STREAM_HEARTBEAT_SECONDS = 15
+CHANGE_PAGE_SIZE = 500
+
+
+def _parse_tables(tables: str | None) -> list[str] | None:
+    if not tables:
+        return None
+    return [t.strip() for t in tables.split(",") if t.strip()]
+
+
+def _check_cursor(since: int) -> None:
+    repo = get_change_log_repository()
+    if since < repo.compacted_through():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Changes since this cursor have been compacted; re-sync from the full lists",
+        )
+
+
+def _fetch(since: int, limit: int, tables: list[str] | None) -> list[dict]:
+    return get_change_log_repository().find_since(since, limit, tables)
+
+
+@router.get("", response_model=ChangeFeed)
+async def get_changes(
+    since: int = Query(0, ge=0, description="Return changes with seq greater than this cursor"),
+    limit: int = Query(CHANGE_PAGE_SIZE, ge=1, le=5000),
+    wait: float = Query(0, ge=0, le=CHANGE_MAX_WAIT_SECONDS, description="Long-poll for up to this many seconds"),
+    tables: str | None = Query(None, description="Comma-separated table names to include"),
+) -> ChangeFeed:
+    """Get row mutations after a cursor, optionally long-polling until one arrives."""
+    await run_in_threadpool(_check_cursor, since)
+    table_list = _parse_tables(tables)
+    deadline = time.monotonic() + wait
+
+    changes = await run_in_threadpool(_fetch, since, limit + 1, table_list)
+    while not changes and time.monotonic() < deadline:
+        await asyncio.sleep(CHANGE_POLL_INTERVAL_SECONDS)
+        changes = await run_in_threadpool(_fetch, since, limit + 1, table_list)
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return ChangeFeed(
+        changes=changes,
+        next_since=changes[-1]["seq"] if changes else since,
+        has_more=has_more,
+    )
+
+
+@router.get("/stream")
+async def stream_changes(
+    since: int | None = Query(None, ge=0),
+    tables: str | None = Query(None),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Stream row mutations as Server-Sent Events; reconnects resume from Last-Event-ID."""
+    cursor = since
+    if cursor is None:
+        cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    await run_in_threadpool(_check_cursor, cursor)
+    table_list = _parse_tables(tables)
+
+    async def events():
+        position = cursor
+        last_sent = time.monotonic()
+        yield "retry: 2000\n\n"
+
+        while True:
+            changes = await run_in_threadpool(_fetch, position, CHANGE_PAGE_SIZE, table_list)
+            for change in changes:
+                payload = Change.model_validate(change).model_dump_json(by_alias=True)
+                yield f"id: {change['seq']}\nevent: change\ndata: {payload}\n\n"
+                position = change["seq"]
+                last_sent = time.monotonic()
+
+            if len(changes) == CHANGE_PAGE_SIZE:
+                continue
+
+            if time.monotonic() - last_sent >= CHANGE_STREAM_HEARTBEAT_SECONDS:
+                yield ": heartbeat\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(CHANGE_POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
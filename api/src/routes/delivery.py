@@ -1,16 +1,75 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated, Literal
 
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.models.bucket import DateBucket
 from src.models.delivery import Delivery, DeliveryCreate, DeliveryUpdate
+from src.models.status import DELIVERY_STATUS_TRANSITIONS, DeliveryStatusChange, StatusChangeResult
 from src.repositories.deliveries_repo import get_deliveries_repository
+from src.utils.dates import DateText
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
+from src.utils.status_changes import apply_status_change
 
 router = APIRouter(prefix="/deliveries", tags=["deliveries"])
 
 
 @router.get("", response_model=list[Delivery])
-def get_all_deliveries():
+def get_all_deliveries(ids: IdsQuery = None):
     repo = get_deliveries_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.post("/status", response_model=StatusChangeResult)
+def change_delivery_status(change: DeliveryStatusChange):
+    repo = get_deliveries_repository()
+
+    try:
+        return apply_status_change(repo, DELIVERY_STATUS_TRANSITIONS, change)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/open", response_model=list[Delivery])
+def get_open_deliveries(open_status: str | None = Query(None, alias="status", description="One open status only")):
+    """Deliveries that can still change status, grouped by status in workflow order, then by id."""
+    repo = get_deliveries_repository()
+
+    try:
+        return repo.find_open(open_status)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/open/counts", response_model=dict[str, int])
+def count_open_deliveries():
+    repo = get_deliveries_repository()
+
+    try:
+        return repo.count_open()
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/buckets", response_model=list[DateBucket])
+def count_deliveries_by_bucket(
+    start_date: Annotated[DateText, Query(alias="from", description="First date, inclusive")],
+    end_date: Annotated[DateText, Query(alias="to", description="Last date, inclusive")],
+    interval: Literal["day", "month"] = "day",
+):
+    """Number of deliveries per day or month; empty buckets are left out."""
+    repo = get_deliveries_repository()
+
+    try:
+        return repo.count_by_bucket(interval, start_date, end_date)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{delivery_id}", response_model=Delivery)
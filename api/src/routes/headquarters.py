@@ -1,16 +1,25 @@
 from fastapi import APIRouter, HTTPException, status
 
 from src.models.headquarters import Headquarters, HeadquartersCreate, HeadquartersUpdate
+from src.models.job import Job
 from src.repositories.headquarters_repo import get_headquarters_repository
+from src.utils.deletes import delete_or_schedule
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
 
 router = APIRouter(prefix="/headquarters", tags=["headquarters"])
 
 
 @router.get("", response_model=list[Headquarters])
-def get_all_headquarters():
+def get_all_headquarters(ids: IdsQuery = None):
     repo = get_headquarters_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{headquarters_id}", response_model=Headquarters)
@@ -50,12 +59,16 @@ def update_headquarters(headquarters_id: int, hq_data: HeadquartersUpdate):
         raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
-@router.delete("/{headquarters_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{headquarters_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": Job, "description": "Large cascade queued as a background job"}},
+)
 def delete_headquarters(headquarters_id: int):
     repo = get_headquarters_repository()
 
     try:
-        repo.delete(headquarters_id)
+        return delete_or_schedule(repo, headquarters_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=e.message) from e
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.models.inventory import ReorderLevel, StockBalance, StockConsumption, StockMovement, StockReceipt
+from src.repositories.inventory_repo import STOCK_HISTORY_PAGE_SIZE, get_inventory_repository
+from src.utils.errors import DatabaseError
+
+router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+@router.get("/low-stock", response_model=list[StockBalance])
+def get_low_stock(branch_id: int | None = Query(None, alias="branchId")):
+    """Products at or below their reorder level, per branch."""
+    repo = get_inventory_repository()
+
+    try:
+        return repo.find_low_stock(branch_id)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/branches/{branch_id}", response_model=list[StockBalance])
+def get_branch_stock(branch_id: int):
+    repo = get_inventory_repository()
+
+    try:
+        return repo.find_balances(branch_id)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/branches/{branch_id}/products/{product_id}", response_model=StockBalance)
+def get_stock_balance(branch_id: int, product_id: int):
+    repo = get_inventory_repository()
+    balance = repo.find_balance(branch_id, product_id)
+
+    if not balance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No stock recorded for product {product_id} at branch {branch_id}"
+        )
+
+    return balance
+
+
+@router.put("/branches/{branch_id}/products/{product_id}/reorder-level", response_model=StockBalance)
+def set_reorder_level(branch_id: int, product_id: int, level: ReorderLevel):
+    repo = get_inventory_repository()
+
+    try:
+        return repo.set_reorder_level(branch_id, product_id, level.reorder_level)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/branches/{branch_id}/products/{product_id}/movements", response_model=list[StockMovement])
+def get_stock_movements(
+    branch_id: int,
+    product_id: int,
+    after: int = Query(0, ge=0, description="Return movements with movementId greater than this cursor"),
+    limit: int = Query(STOCK_HISTORY_PAGE_SIZE, ge=1, le=1000),
+):
+    """The product's stock ledger at the branch, oldest first."""
+    repo = get_inventory_repository()
+
+    try:
+        return repo.find_movements(branch_id, product_id, after, limit)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.post("/receipts/{delivery_id}", response_model=StockReceipt, status_code=status.HTTP_201_CREATED)
+def receive_delivery(delivery_id: int):
+    """Add the delivery's order lines to the stock of the branches that ordered them.
+
+    A delivery in transit is marked delivered; pending or cancelled ones answer 409. Lines
+    already received are skipped, so repeating a receipt books nothing twice, and lines
+    archived with their order are listed in archivedLineIds instead of being booked.
+    """
+    repo = get_inventory_repository()
+
+    try:
+        return repo.receive_delivery(delivery_id)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.post("/consumption", response_model=list[StockMovement], status_code=status.HTTP_201_CREATED)
+def consume_stock(consumption: StockConsumption):
+    """Take stock out of a branch; fails as a whole (409) if any line exceeds the stock on hand."""
+    repo = get_inventory_repository()
+
+    try:
+        return repo.consume(consumption.branch_id, [line.model_dump() for line in consumption.lines])
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
@@ -0,0 +1,60 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.jobs.runner import job_runner
+from src.models.job import Job, JobCreate
+from src.repositories.jobs_repo import JobsRepository, get_jobs_repository
+from src.utils.admin import require_admin
+from src.utils.errors import DatabaseError
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+JobsRepo = Annotated[JobsRepository, Depends(get_jobs_repository)]
+
+
+@router.get("", response_model=list[Job])
+def get_all_jobs(repo: JobsRepo, job_status: str | None = Query(None, alias="status")) -> list[Job]:
+    """Get all jobs, optionally filtered by status."""
+    if job_status:
+        return repo.find_by_status(job_status)
+    return repo.find_all()
+
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(job_id: int, repo: JobsRepo) -> Job:
+    """Get a job's status and progress."""
+    job = repo.find_by_id(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+
+    return job
+
+
+@router.post("", response_model=Job, status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+def submit_job(job_data: JobCreate) -> Job:
+    """Queue a background job (admin only)."""
+    try:
+        return job_runner.submit(job_data.job_type, job_data.params)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.post("/{job_id}/cancel", response_model=Job, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(require_admin)])
+def cancel_job(job_id: int, repo: JobsRepo) -> Job:
+    """Request cancellation of a queued or running job (admin only)."""
+    job = repo.find_by_id(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+
+    job_runner.cancel(job_id)
+    return repo.find_by_id(job_id)
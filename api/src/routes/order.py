@@ -1,16 +1,77 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated, Literal
 
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.models.bucket import DateBucket
+from src.models.job import Job
 from src.models.order import Order, OrderCreate, OrderUpdate
+from src.models.status import ORDER_STATUS_TRANSITIONS, OrderStatusChange, StatusChangeResult
 from src.repositories.orders_repo import get_orders_repository
+from src.utils.dates import DateText
+from src.utils.deletes import delete_or_schedule
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
+from src.utils.status_changes import apply_status_change
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
 @router.get("", response_model=list[Order])
-def get_all_orders():
+def get_all_orders(ids: IdsQuery = None):
     repo = get_orders_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.post("/status", response_model=StatusChangeResult)
+def change_order_status(change: OrderStatusChange):
+    repo = get_orders_repository()
+
+    try:
+        return apply_status_change(repo, ORDER_STATUS_TRANSITIONS, change)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/open", response_model=list[Order])
+def get_open_orders(open_status: str | None = Query(None, alias="status", description="One open status only")):
+    """Orders that can still change status, grouped by status in workflow order, then by id."""
+    repo = get_orders_repository()
+
+    try:
+        return repo.find_open(open_status)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/open/counts", response_model=dict[str, int])
+def count_open_orders():
+    repo = get_orders_repository()
+
+    try:
+        return repo.count_open()
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
+@router.get("/buckets", response_model=list[DateBucket])
+def count_orders_by_bucket(
+    start_date: Annotated[DateText, Query(alias="from", description="First date, inclusive")],
+    end_date: Annotated[DateText, Query(alias="to", description="Last date, inclusive")],
+    interval: Literal["day", "month"] = "day",
+):
+    """Number of orders per day or month; empty buckets are left out."""
+    repo = get_orders_repository()
+
+    try:
+        return repo.count_by_bucket(interval, start_date, end_date)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{order_id}", response_model=Order)
@@ -50,12 +111,16 @@ def update_order(order_id: int, order_data: OrderUpdate):
         raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
-@router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{order_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": Job, "description": "Large cascade queued as a background job"}},
+)
 def delete_order(order_id: int):
     repo = get_orders_repository()
 
     try:
-        repo.delete(order_id)
+        return delete_or_schedule(repo, order_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=e.message) from e
@@ -3,14 +3,21 @@ from fastapi import APIRouter, HTTPException, status
 from src.models.order_detail import OrderDetail, OrderDetailCreate, OrderDetailUpdate
 from src.repositories.order_details_repo import get_order_details_repository
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
 
 router = APIRouter(prefix="/order-details", tags=["order-details"])
 
 
 @router.get("", response_model=list[OrderDetail])
-def get_all_order_details():
+def get_all_order_details(ids: IdsQuery = None):
     repo = get_order_details_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{order_detail_id}", response_model=OrderDetail)
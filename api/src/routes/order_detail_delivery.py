@@ -7,15 +7,22 @@ from src.models.order_detail_delivery import (
 )
 from src.repositories.order_detail_deliveries_repo import get_order_detail_deliveries_repository
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
 
 router = APIRouter(prefix="/order-detail-deliveries",
                    tags=["order-detail-deliveries"])
 
 
 @router.get("", response_model=list[OrderDetailDelivery])
-def get_all_order_detail_deliveries():
+def get_all_order_detail_deliveries(ids: IdsQuery = None):
     repo = get_order_detail_deliveries_repository()
-    return repo.find_all()
+    if ids is None:
+        return repo.find_all()
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{order_detail_delivery_id}", response_model=OrderDetailDelivery)
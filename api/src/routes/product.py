@@ -1,11 +1,13 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
-from src.db.connection import get_db
-from src.models.product import Product, ProductCreate, ProductUpdate
+from src.db.connection import get_db, read_slot
+from src.models.product import Product, ProductCreate, ProductImportReport, ProductUpdate
 from src.repositories.products_repo import ProductsRepository, get_products_repository
-from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.errors import DatabaseError, NotFoundError, ValidationError
+from src.utils.ids import IdsQuery, parse_ids
+from src.utils.ingest import ingest, ingest_format
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -14,10 +16,16 @@ ProductsRepo = Annotated[ProductsRepository, Depends(get_products_repository)]
 
 
 @router.get("", response_model=list[Product])
-def get_all_products(repo: ProductsRepo) -> list[Product]:
-    """Get all products."""
-    products = repo.find_all()
-    return products
+def get_all_products(repo: ProductsRepo, ids: IdsQuery = None) -> list[Product]:
+    """Get all products, or only those listed in ?ids=."""
+    if ids is None:
+        products = repo.find_all()
+        return products
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/search")
@@ -31,7 +39,7 @@ def search_products(
     DO NOT use in production!
     """
     # VULNERABLE: Direct string concatenation in SQL query - CodeQL should detect this
-    with get_db() as conn:
+    with get_db() as conn, read_slot():
         cursor = conn.cursor()
         # This is intentionally vulnerable - user input directly in query string
         query = f"SELECT * FROM products WHERE name LIKE '%{q}%'"
@@ -71,6 +79,26 @@ def create_product(product_data: ProductCreate, repo: ProductsRepo) -> Product:
         raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
+@router.post("/import", response_model=ProductImportReport)
+async def import_products(request: Request, repo: ProductsRepo) -> ProductImportReport:
+    """Create or update products (matched by sku) from a streamed CSV or NDJSON body.
+
+    Rows are validated and written in batches as the body arrives; rows that fail are
+    listed by row number and the rest are kept.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        ingest_format(content_type)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=e.message) from e
+
+    try:
+        report = await ingest(request.stream(), content_type, ProductCreate, repo.upsert_many)
+        return report.as_dict()
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
+
+
 @router.put("/{product_id}", response_model=Product)
 def update_product(
     product_id: int, product_data: ProductUpdate, repo: ProductsRepo
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from src.models.search import SearchResult
+from src.repositories.search_repo import SEARCH_RESULT_LIMIT, get_search_repository
+from src.utils.errors import DatabaseError
+from src.utils.search import SEARCH_MIN_QUERY_LENGTH
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _parse_types(types: str | None) -> list[str] | None:
+    if not types:
+        return None
+    return [t.strip() for t in types.split(",") if t.strip()]
+
+
+@router.get("", response_model=list[SearchResult])
+def search(
+    q: str = Query(..., min_length=SEARCH_MIN_QUERY_LENGTH, max_length=100),
+    types: str | None = Query(None, description="Comma-separated: suppliers, headquarters, branches"),
+    limit: int = Query(SEARCH_RESULT_LIMIT, ge=1, le=100),
+):
+    """Suppliers, headquarters and branches whose name, contact or email resembles `q`, best first.
+
+    Matching tolerates typos: "whiskrware" finds "WhiskerWare Systems".
+    """
+    repo = get_search_repository()
+
+    try:
+        return repo.search(q, _parse_types(types), limit)
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
@@ -1,10 +1,13 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
+from src.models.job import Job
 from src.models.supplier import Supplier, SupplierCreate, SupplierUpdate
 from src.repositories.suppliers_repo import SuppliersRepository, get_suppliers_repository
+from src.utils.deletes import delete_or_schedule
 from src.utils.errors import DatabaseError, NotFoundError
+from src.utils.ids import IdsQuery, parse_ids
 
 router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
@@ -14,10 +17,16 @@ SuppliersRepo = Annotated[SuppliersRepository,
 
 
 @router.get("", response_model=list[Supplier])
-def get_all_suppliers(repo: SuppliersRepo) -> list[Supplier]:
-    """Get all suppliers."""
-    suppliers = repo.find_all()
-    return suppliers
+def get_all_suppliers(repo: SuppliersRepo, ids: IdsQuery = None) -> list[Supplier]:
+    """Get all suppliers, or only those listed in ?ids=."""
+    if ids is None:
+        suppliers = repo.find_all()
+        return suppliers
+
+    try:
+        return repo.find_by_ids(parse_ids(ids))
+    except DatabaseError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
 @router.get("/{supplier_id}", response_model=Supplier)
@@ -61,11 +70,15 @@ def update_supplier(
         raise HTTPException(status_code=e.status_code, detail=e.message) from e
 
 
-@router.delete("/{supplier_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_supplier(supplier_id: int, repo: SuppliersRepo) -> None:
-    """Delete a supplier by ID."""
+@router.delete(
+    "/{supplier_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": Job, "description": "Large cascade queued as a background job"}},
+)
+def delete_supplier(supplier_id: int, repo: SuppliersRepo) -> Response:
+    """Delete a supplier by ID; deletes cascading to many rows run as a background job (202)."""
     try:
-        repo.delete(supplier_id)
+        return delete_or_schedule(repo, supplier_id)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=e.message) from e
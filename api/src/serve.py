@@ -0,0 +1,158 @@
+"""Production entry point: migrate once, then serve with one or more worker processes.
+
+Modes:
+  --workers 1                 single process (uvicorn)
+  --workers N                 uvicorn's supervisor: workers share one listening socket
+  --workers N --reuse-port    each worker binds its own SO_REUSEPORT socket and the kernel
+                              balances connections across their accept queues
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from src.db.connection import DatabaseConnection
+from src.db.migrate import MigrationRunner
+from src.db.seed import Seeder
+from src.settings import get_settings
+
+APP_FACTORY = "src.main:create_app"
+
+# Worker restarts faster than this are treated as a crash loop
+MIN_WORKER_UPTIME_SECONDS = 5
+
+
+def prepare_database(seed: bool) -> None:
+    """Apply migrations (and seed) once in the parent so workers don't race to do it."""
+    applied = MigrationRunner().run_migrations()
+    if applied:
+        print(f"Applied migrations: {', '.join(applied)}")
+
+    if seed:
+        seeded = Seeder().seed_database()
+        if seeded:
+            print(f"Seeded tables: {', '.join(seeded)}")
+
+    # Nothing opened here may leak into the workers
+    DatabaseConnection.close()
+
+
+def reuse_port_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_reuse_port_worker(host: str, port: int, backlog: int) -> None:
+    sock = reuse_port_socket(host, port, backlog)
+    config = uvicorn.Config(APP_FACTORY, factory=True, backlog=backlog)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class ReusePortWorkers:
+    """Worker processes that each bind their own SO_REUSEPORT socket, restarted when they exit."""
+
+    def __init__(self, host: str, port: int, backlog: int):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        # Spawned, not forked: workers start from a clean interpreter with no inherited state
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.started: dict[int, float] = {}
+        self.stopping = False
+
+    def start(self, slot: int) -> None:
+        process = self.context.Process(
+            target=run_reuse_port_worker, args=(self.host, self.port, self.backlog), name=f"worker-{slot}"
+        )
+        process.start()
+        self.processes[slot] = process
+        self.started[slot] = time.monotonic()
+
+    def stop(self, signum=None, frame=None) -> None:
+        self.stopping = True
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    def restart_exited(self) -> None:
+        """Restart workers that exited, or stop everything if one dies right after starting."""
+        for slot, process in list(self.processes.items()):
+            if process.is_alive() or self.stopping:
+                continue
+            if time.monotonic() - self.started[slot] < MIN_WORKER_UPTIME_SECONDS:
+                print(f"Worker {slot} exited with {process.exitcode} right after starting; shutting down")
+                self.stop()
+                return
+            print(f"Worker {slot} exited with {process.exitcode}; restarting")
+            self.start(slot)
+
+    def join(self) -> None:
+        for process in self.processes.values():
+            process.join()
+
+
+def serve_reuse_port(host: str, port: int, workers: int, backlog: int) -> None:
+    supervisor = ReusePortWorkers(host, port, backlog)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    signal.signal(signal.SIGINT, supervisor.stop)
+
+    for slot in range(workers):
+        supervisor.start(slot)
+    print(f"Serving on {host}:{port} with {workers} SO_REUSEPORT workers")
+
+    while not supervisor.stopping:
+        time.sleep(0.5)
+        supervisor.restart_exited()
+
+    supervisor.join()
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Serve the OctoCAT Supply API")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers, help="Worker processes (default: WORKERS or 1)")
+    parser.add_argument("--reuse-port", action="store_true", default=settings.reuse_port, help="One SO_REUSEPORT socket per worker")
+    parser.add_argument("--backlog", type=int, default=settings.backlog)
+    parser.add_argument("--no-seed", action="store_true", help="Apply migrations without seeding")
+    args = parser.parse_args()
+
+    if args.reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+        parser.error("SO_REUSEPORT is not supported on this platform")
+
+    prepare_database(seed=settings.seed_database and not args.no_seed)
+
+    # Already done above; workers (spawned with this environment) skip it
+    os.environ["RUN_MIGRATIONS"] = "false"
+    os.environ["SEED_DATABASE"] = "false"
+    get_settings.cache_clear()
+
+    if args.workers > 1 and args.reuse_port:
+        serve_reuse_port(args.host, args.port, args.workers, args.backlog)
+    else:
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            backlog=args.backlog,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application-level settings, read from the environment when create_app() runs.
+
+    Subsystem tuning knobs (DB_*, ADMISSION_*, CHANGE_LOG_*, ...) stay as module-level
+    environment constants next to the code they tune.
+    """
+
+    title: str = "OctoCAT Supply Chain Management API"
+    version: str = "1.0.0"
+    cors_origins: str = ""
+
+    # Startup work done in each worker's lifespan
+    run_migrations: bool = True
+    seed_database: bool = True
+    background_jobs: bool = True
+
+    # Serving (src.serve)
+    host: str = "0.0.0.0"
+    port: int = 3000
+    workers: int = 1
+    reuse_port: bool = False
+    backlog: int = 2048
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
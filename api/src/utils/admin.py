@@ -0,0 +1,35 @@
+import hmac
+import os
+
+from fastapi import Header, HTTPException, Request, status
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+ADMIN_HEADER = "X-Admin-Token"
+
+
+def is_admin_request(request: Request) -> bool:
+    token = request.headers.get(ADMIN_HEADER, "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def is_admin_scope(scope) -> bool:
+    """is_admin_request() for ASGI middleware, which only has the raw scope."""
+    if not ADMIN_TOKEN:
+        return False
+    header = ADMIN_HEADER.lower().encode("latin-1")
+    for name, value in scope["headers"]:
+        if name == header:
+            return hmac.compare_digest(value, ADMIN_TOKEN.encode("latin-1"))
+    return False
+
+
+def require_admin(x_admin_token: str = Header("", alias=ADMIN_HEADER)) -> None:
+    """Dependency for admin-only endpoints. Disabled entirely when ADMIN_TOKEN is not set."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them",
+        )
+
+    if not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
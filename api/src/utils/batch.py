@@ -0,0 +1,179 @@
+import inspect
+import json
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from src.db.connection import transaction
+from src.models.batch import BatchOperation, BatchRequest
+from src.utils.errors import DatabaseError, ValidationError
+from src.utils.loader import prime
+
+BATCH_PATH_PREFIX = "/api"
+
+# "${order.orderId}": field `orderId` of the response of the operation with ref "order"
+_REFERENCE = re.compile(r"\$\{(\w+)\.(\w+)\}")
+
+
+class _OperationFailedError(Exception):
+    """Unwinds the batch transaction in atomic mode."""
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _substitute(value: Any, responses: dict[str, Any]) -> Any:
+    """Replace ${ref.field} in strings; a string that is only a reference keeps the field's type."""
+    if isinstance(value, dict):
+        return {key: _substitute(item, responses) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, responses) for item in value]
+    if not isinstance(value, str) or "${" not in value:
+        return value
+
+    def lookup(match: re.Match) -> Any:
+        ref, field = match.groups()
+        body = responses.get(ref)
+        if not isinstance(body, dict) or field not in body:
+            raise ValidationError(f"Reference {match[0]} does not match an earlier successful operation")
+        return body[field]
+
+    whole = _REFERENCE.fullmatch(value)
+    if whole:
+        return lookup(whole)
+    return _REFERENCE.sub(lambda match: str(lookup(match)), value)
+
+
+def _match(routers: Iterable[APIRouter], method: str, path: str) -> tuple[APIRoute, dict[str, str]]:
+    path_matched = False
+    for router in routers:
+        for route in router.routes:
+            match = route.path_regex.match(path)
+            if not match:
+                continue
+            if method in route.methods:
+                params = {name: route.param_convertors[name].convert(value) for name, value in match.groupdict().items()}
+                return route, params
+            path_matched = True
+    if path_matched:
+        raise HTTPException(status_code=405, detail=f"Method {method} not allowed for {BATCH_PATH_PREFIX}{path}")
+    raise HTTPException(status_code=404, detail=f"No batchable route for {method} {BATCH_PATH_PREFIX}{path}")
+
+
+def _arguments(route: APIRoute, path_params: dict[str, str], query: dict[str, str], body: Any) -> dict[str, Any]:
+    """Validate the operation's inputs the way FastAPI would for a real request to `route`."""
+    dependant = route.dependant
+    if inspect.iscoroutinefunction(route.endpoint) or any(
+        dependency.path_params or dependency.query_params or dependency.body_params or dependency.dependencies
+        for dependency in dependant.dependencies
+    ):
+        raise ValidationError(f"{route.path} cannot run inside a batch")
+
+    arguments: dict[str, Any] = {}
+    for param in dependant.path_params:
+        arguments[param.name] = _adapter(param.field_info.annotation).validate_python(path_params[param.name])
+    for param in dependant.query_params:
+        if param.alias in query:
+            arguments[param.name] = _adapter(param.field_info.annotation).validate_python(query[param.alias])
+        elif param.field_info.is_required():
+            raise ValidationError(f"Query parameter {param.alias} is required")
+    for param in dependant.body_params:
+        arguments[param.name] = _adapter(param.field_info.annotation).validate_python(body)
+    for dependency in dependant.dependencies:
+        arguments[dependency.name] = dependency.call()
+    return arguments
+
+
+def _render(route: APIRoute, result: Any) -> tuple[int, Any]:
+    if isinstance(result, Response):
+        return result.status_code, json.loads(result.body) if result.body else None
+    if route.response_model is None:
+        return route.status_code or 200, jsonable_encoder(result)
+    adapter = _adapter(route.response_model)
+    return route.status_code or 200, adapter.dump_python(adapter.validate_python(result), mode="json", by_alias=True)
+
+
+def _prime_reads(routers: Iterable[APIRouter], operations: list[BatchOperation]) -> None:
+    """Queue the ids of GET /api/<resource>/<id> operations so each resource loads them in one query."""
+    for operation in operations:
+        path = urlsplit(operation.path).path
+        if operation.method != "GET" or "${" in path or not path.startswith(f"{BATCH_PATH_PREFIX}/"):
+            continue
+        try:
+            _, path_params = _match(routers, "GET", path.removeprefix(BATCH_PATH_PREFIX))
+        except HTTPException:
+            continue
+        # Item routes name their parameter after the repository's id column, which keys its loader
+        if len(path_params) == 1:
+            name, value = next(iter(path_params.items()))
+            if value.isdigit():
+                prime(name, [int(value)])
+
+
+def _run_operation(routers: Iterable[APIRouter], operation: BatchOperation, responses: dict[str, Any]) -> tuple[int, Any]:
+    """Call the route handler an operation addresses; returns (status code, JSON body) like the HTTP response."""
+    try:
+        path = _substitute(operation.path, responses)
+        body = _substitute(operation.body, responses)
+        url = urlsplit(path)
+        if not url.path.startswith(f"{BATCH_PATH_PREFIX}/"):
+            raise ValidationError(f"Batch paths must start with {BATCH_PATH_PREFIX}/")
+
+        route, path_params = _match(routers, operation.method, url.path.removeprefix(BATCH_PATH_PREFIX))
+        arguments = _arguments(route, path_params, dict(parse_qsl(url.query)), body)
+        return _render(route, route.endpoint(**arguments))
+    except HTTPException as e:
+        return e.status_code, {"detail": e.detail}
+    except PydanticValidationError as e:
+        return 422, {"detail": jsonable_encoder(e.errors(include_url=False))}
+    except DatabaseError as e:
+        return e.status_code, {"message": e.message}
+
+
+def run_batch(routers: Iterable[APIRouter], request: BatchRequest) -> tuple[int, dict[str, Any]]:
+    """Run every operation of the batch in one transaction on the shared connection.
+
+    Operations call the same handlers the HTTP routes do, in order. In atomic mode the
+    first failing operation rolls the whole batch back and its status becomes the batch
+    status; in continue mode each operation runs in its own savepoint, so a failure only
+    undoes that operation and the rest still commit together. Returns (status, BatchResult).
+    """
+    routers = tuple(routers)
+    results: list[dict[str, Any]] = []
+    responses: dict[str, Any] = {}
+    failed_status = None
+    _prime_reads(routers, request.operations)
+
+    try:
+        with transaction() as conn:
+            for operation in request.operations:
+                if request.mode == "continue":
+                    conn.execute("SAVEPOINT batch_operation")
+                status_code, body = _run_operation(routers, operation, responses)
+                results.append({"ref": operation.ref, "status": status_code, "body": body})
+
+                if status_code < 400:
+                    if operation.ref:
+                        responses[operation.ref] = body
+                    if request.mode == "continue":
+                        conn.execute("RELEASE batch_operation")
+                elif request.mode == "continue":
+                    conn.execute("ROLLBACK TO batch_operation")
+                    conn.execute("RELEASE batch_operation")
+                else:
+                    failed_status = status_code
+                    raise _OperationFailedError
+    except _OperationFailedError:
+        return failed_status, {"committed": False, "results": results}
+
+    return 200, {"committed": True, "results": results}
@@ -0,0 +1,75 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+from src.utils.errors import ValidationError
+
+# The generated-column expressions of migration 007 applied to a bound parameter, so a
+# filter value lands on exactly the day / month the row's column holds
+DAY_OF_PARAM = "CAST(julianday(date(?)) - 2440587.5 AS INTEGER)"
+MONTH_OF_PARAM = "CAST(strftime('%Y%m', ?) AS INTEGER)"
+
+BUCKET_INTERVALS = ("day", "month")
+
+_EPOCH = date(1970, 1, 1)
+
+# The ISO-8601 subset SQLite's date functions parse: a date, optionally a time and a UTC offset
+_DATE_TEXT = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)?")
+
+
+def parse_date_text(value: str) -> str:
+    """Check that `value` is a date SQLite can normalize, e.g. "2026-05-01" or "2026-05-01T09:30:00Z"."""
+    if not _DATE_TEXT.fullmatch(value):
+        raise ValueError("Dates must be ISO-8601, e.g. 2026-05-01 or 2026-05-01T09:30:00Z")
+    try:
+        datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"{value} is not a valid date") from e
+    return value
+
+
+# Date fields of request models; stored as given, indexed through the *_day / *_month columns
+DateText = Annotated[str, AfterValidator(parse_date_text)]
+
+
+def require_date_text(value: str) -> str:
+    try:
+        return parse_date_text(value)
+    except ValueError as e:
+        raise ValidationError(str(e)) from e
+
+
+def require_interval(interval: str) -> str:
+    if interval not in BUCKET_INTERVALS:
+        raise ValidationError(f"Interval must be one of: {', '.join(BUCKET_INTERVALS)}")
+    return interval
+
+
+def bucket_label(interval: str, bucket: int) -> str:
+    """Label of a day number (days since 1970-01-01) as 2026-05-01, of a YYYYMM month as 2026-05."""
+    if interval == "day":
+        return (_EPOCH + timedelta(days=bucket)).isoformat()
+    return f"{bucket // 100:04d}-{bucket % 100:02d}"
+
+
+def bucket_query(
+    source: str, day_column: str, month_column: str, interval: str, start_date: str, end_date: str, extra_where: str = ""
+) -> tuple[str, tuple[str, ...]]:
+    """SQL and parameters counting rows of `source` per day or month from start_date to end_date.
+
+    Grouping on the indexed integer column walks the index range in order, so there is no
+    sort. Month buckets seek the (month, day) index by month and check the day in the entry.
+    """
+    if interval == "day":
+        where = f"{day_column} BETWEEN {DAY_OF_PARAM} AND {DAY_OF_PARAM}"
+        params = (start_date, end_date)
+    else:
+        where = (
+            f"{month_column} BETWEEN {MONTH_OF_PARAM} AND {MONTH_OF_PARAM} "
+            f"AND {day_column} BETWEEN {DAY_OF_PARAM} AND {DAY_OF_PARAM}"
+        )
+        params = (start_date, end_date, start_date, end_date)
+    column = day_column if interval == "day" else month_column
+    return f"SELECT {column} AS bucket, count(*) AS count FROM {source} WHERE {where}{extra_where} GROUP BY {column}", params
@@ -0,0 +1,24 @@
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+
+from src.db.cascade import CASCADE_DELETE_JOB_THRESHOLD
+from src.jobs.runner import job_runner
+from src.models.job import Job
+from src.repositories.base_repo import BaseRepository
+from src.repositories.suppliers_repo import SuppliersRepository
+
+
+def delete_or_schedule(repo: BaseRepository | SuppliersRepository, id_value: int) -> Response:
+    """Delete inline when few rows cascade from the row, otherwise hand the delete to a job.
+
+    Answers 204 for an inline delete, or 202 with the queued `cascade_delete` job to poll
+    at /api/jobs/{id}. Counting stops once the threshold is exceeded, so the check stays
+    cheap for big tenants.
+    """
+    plan = repo.cascade_plan(id_value, count_limit=CASCADE_DELETE_JOB_THRESHOLD + 1)
+    if plan.dependent_rows <= CASCADE_DELETE_JOB_THRESHOLD:
+        repo.delete(id_value)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    job = job_runner.submit("cascade_delete", {"table": repo.table, "id": id_value})
+    return JSONResponse(Job.model_validate(job).model_dump(mode="json", by_alias=True), status_code=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,24 @@
+import os
+from typing import Annotated
+
+from fastapi import Query
+
+from src.utils.errors import ValidationError
+
+# Upper bound on ids in one ?ids= list
+MAX_LIST_IDS = int(os.getenv("MAX_LIST_IDS", "1000"))
+
+# ?ids= on list routes: only these rows, in this order
+IdsQuery = Annotated[str | None, Query(description="Comma-separated ids to return instead of the whole list, e.g. 3,7,12")]
+
+
+def parse_ids(ids: str) -> list[int]:
+    """Parse a comma-separated ?ids= value such as "3,7,12"."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError as e:
+        raise ValidationError("ids must be a comma-separated list of integers") from e
+
+    if len(parsed) > MAX_LIST_IDS:
+        raise ValidationError(f"At most {MAX_LIST_IDS} ids per request")
+    return parsed
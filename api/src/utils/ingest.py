@@ -0,0 +1,232 @@
+import codecs
+import csv
+import json
+import os
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio.from_thread
+import anyio.to_thread
+from pydantic import BaseModel
+from pydantic import ValidationError as PydanticValidationError
+
+from src.utils.errors import ValidationError
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+# Row errors listed in the report; later ones are only counted
+INGEST_MAX_ERRORS = int(os.getenv("INGEST_MAX_ERRORS", "1000"))
+# Characters; a longer line (or CSV record, quoted newlines included) is reported as an error instead of being buffered
+INGEST_MAX_LINE_LENGTH = int(os.getenv("INGEST_MAX_LINE_LENGTH", str(1024 * 1024)))
+
+CSV_CONTENT_TYPES = {"text/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# (row number, record or the reason it could not be read)
+Record = tuple[int, dict[str, Any] | str]
+# Writes a batch of validated rows; returns (position in the batch, error) for rows it rejected
+BatchWriter = Callable[[list[dict[str, Any]]], list[tuple[int, str]]]
+
+
+@dataclass
+class IngestReport:
+    received: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < INGEST_MAX_ERRORS:
+            self.errors.append({"row": row, "message": message})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+        }
+
+
+def ingest_format(content_type: str) -> str:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    raise ValidationError(
+        f"Content-Type must be one of: {', '.join(sorted(CSV_CONTENT_TYPES | NDJSON_CONTENT_TYPES))}"
+    )
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str | None]:
+    """UTF-8 lines of a streamed body, newline kept; None stands for a line over INGEST_MAX_LINE_LENGTH."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    oversized = False
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield None if oversized else f"{line}\n"
+            oversized = False
+        if len(pending) > INGEST_MAX_LINE_LENGTH:
+            # Drop the partial line instead of buffering it; it is reported once it ends
+            pending, oversized = "", True
+    pending += decoder.decode(b"", final=True)
+    if pending or oversized:
+        yield None if oversized else pending
+
+
+class _RecordTooLong(Exception):  # noqa: N818 - control flow between _RecordLines and _csv_records, never raised to callers
+    pass
+
+
+class _RecordLines:
+    """The lines csv.reader pulls, cut off once the record being read passes INGEST_MAX_LINE_LENGTH.
+
+    A quoted field may span lines, so an unterminated quote would otherwise make the rest
+    of the upload one record held in memory.
+    """
+
+    def __init__(self, lines: Iterable[str | None]):
+        self.lines = iter(lines)
+        self.record_length = 0
+
+    def __iter__(self) -> "_RecordLines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.lines)
+        self.record_length += INGEST_MAX_LINE_LENGTH + 1 if line is None else len(line)
+        if self.record_length > INGEST_MAX_LINE_LENGTH:
+            self.record_length = 0
+            raise _RecordTooLong
+        return line
+
+
+def _csv_records(lines: Iterable[str | None]) -> Iterator[Record]:
+    """Records keyed by the header; csv.reader handles quoting, so quoted fields may span lines."""
+    source = _RecordLines(lines)
+    reader = csv.reader(source)
+    header: list[str] | None = None
+    row = 0
+    while True:
+        try:
+            fields = next(reader)
+        except StopIteration:
+            return
+        except _RecordTooLong:
+            row += 1
+            yield row, f"Record longer than {INGEST_MAX_LINE_LENGTH} characters"
+            continue
+        except csv.Error as e:
+            row += 1
+            yield row, f"Invalid CSV: {e}"
+            continue
+        finally:
+            source.record_length = 0
+
+        if not fields:
+            continue
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+
+        row += 1
+        if len(fields) != len(header):
+            yield row, f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield row, {name: value for name, value in zip(header, fields, strict=True) if value != ""}
+
+
+def _ndjson_records(lines: Iterable[str | None]) -> Iterator[Record]:
+    row = 0
+    for line in lines:
+        if line is not None and not line.strip():
+            continue
+        row += 1
+        if line is None:
+            yield row, f"Line longer than {INGEST_MAX_LINE_LENGTH} characters"
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"Invalid JSON: {e.msg}"
+            continue
+        yield row, value if isinstance(value, dict) else "Each line must be a JSON object"
+
+
+def iter_records(lines: Iterable[str | None], data_format: str) -> Iterator[Record]:
+    """Parse lines into records keyed by the CSV header or the JSON object's keys.
+
+    Empty CSV fields are left out, letting the model apply its defaults.
+    """
+    return _csv_records(lines) if data_format == "csv" else _ndjson_records(lines)
+
+
+def _blocking_chunks(chunks: AsyncIterator[bytes]) -> Iterator[bytes]:
+    """Iterate an async body from a worker thread, fetching each chunk on the event loop."""
+    while True:
+        try:
+            yield anyio.from_thread.run(chunks.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+def _validate_and_write(model: type[BaseModel], write: BatchWriter, batch: list[Record], report: IngestReport) -> None:
+    rows: list[int] = []
+    values: list[dict[str, Any]] = []
+    for row, record in batch:
+        if isinstance(record, str):
+            report.add_error(row, record)
+            continue
+        try:
+            values.append(model.model_validate(record).model_dump())
+            rows.append(row)
+        except PydanticValidationError as e:
+            report.add_error(row, "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()))
+
+    failures = write(values) if values else []
+    for position, message in failures:
+        report.add_error(rows[position], message)
+    report.written += len(values) - len(failures)
+    report.batches += 1
+
+
+def _ingest_blocking(
+    chunks: AsyncIterator[bytes], data_format: str, model: type[BaseModel], write: BatchWriter, batch_size: int
+) -> IngestReport:
+    report = IngestReport()
+    batch: list[Record] = []
+    for record in iter_records(iter_lines(_blocking_chunks(chunks)), data_format):
+        report.received += 1
+        batch.append(record)
+        if len(batch) >= batch_size:
+            _validate_and_write(model, write, batch, report)
+            batch = []
+    if batch:
+        _validate_and_write(model, write, batch, report)
+    return report
+
+
+async def ingest(
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    model: type[BaseModel],
+    write: BatchWriter,
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> IngestReport:
+    """Stream a CSV or NDJSON body into `write` in batches of validated rows.
+
+    Parsing, validation and writes run in one worker thread that asks the event loop for the
+    next chunk of the body only when it needs more: nothing more is read while a batch is
+    being stored, so the server's flow control slows the client down instead of the body
+    piling up in memory. Bad rows are reported by row number and do not stop the rest.
+    """
+    data_format = ingest_format(content_type)
+    return await anyio.to_thread.run_sync(_ingest_blocking, chunks, data_format, model, write, batch_size)
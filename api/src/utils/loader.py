@@ -0,0 +1,85 @@
+import contextvars
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from typing import Any, Generator
+
+from src.db.connection import db_stats
+
+# id -> row for the ids that exist
+RowsById = dict[int, dict[str, Any]]
+
+
+class Loader:
+    """Request-scoped batching and memoization of lookups by id for one repository.
+
+    Ids queued with prime() are fetched together with the next id that misses the cache, so
+    a request that will read many rows one at a time pays for one query per chunk instead of
+    one per row. Rows are kept for the rest of the request, but any write through execute()
+    drops them: a row read before the write may have been changed by it.
+    """
+
+    def __init__(self, fetch: Callable[[list[int]], RowsById], pending: set[int]):
+        self._fetch = fetch
+        self._rows: dict[int, dict[str, Any] | None] = {}
+        # Shared with the scope, so ids primed before this loader existed are included
+        self._pending = pending
+        self._writes = db_stats.writes
+        self.queries = 0
+
+    def load(self, id_value: int) -> dict[str, Any] | None:
+        return self.load_many([id_value])[0]
+
+    def load_many(self, ids: Iterable[int]) -> list[dict[str, Any] | None]:
+        """Rows for `ids` in order, None for ids that do not exist."""
+        ids = list(ids)
+        if db_stats.writes != self._writes:
+            self._rows.clear()
+            self._writes = db_stats.writes
+
+        missing = [id_value for id_value in ids if id_value not in self._rows]
+        if missing:
+            wanted = list(dict.fromkeys([*missing, *(id_value for id_value in self._pending if id_value not in self._rows)]))
+            self._pending.clear()
+            found = self._fetch(wanted)
+            self.queries += 1
+            for id_value in wanted:
+                self._rows[id_value] = found.get(id_value)
+
+        return [self._rows[id_value] for id_value in ids]
+
+
+class LoaderScope:
+    def __init__(self):
+        self.loaders: dict[str, Loader] = {}
+        self.pending: dict[str, set[int]] = {}
+
+
+_current_scope: contextvars.ContextVar[LoaderScope | None] = contextvars.ContextVar("loader_scope", default=None)
+
+
+@contextmanager
+def loader_scope() -> Generator[LoaderScope, None, None]:
+    """Memoize and batch repository lookups until the block ends (one HTTP request)."""
+    token = _current_scope.set(LoaderScope())
+    try:
+        yield _current_scope.get()
+    finally:
+        _current_scope.reset(token)
+
+
+def request_loader(key: str, fetch: Callable[[list[int]], RowsById]) -> Loader | None:
+    """The current request's loader for `key` (a repository's id column), or None outside a request."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    loader = scope.loaders.get(key)
+    if loader is None:
+        loader = scope.loaders[key] = Loader(fetch, scope.pending.setdefault(key, set()))
+    return loader
+
+
+def prime(key: str, ids: Iterable[int]) -> None:
+    """Queue ids to be fetched with the next miss of `key`'s loader in this request."""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.pending.setdefault(key, set()).update(ids)
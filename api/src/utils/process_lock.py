@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+from typing import IO
+
+from src.db.config import get_database_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process serving only
+    fcntl = None
+
+# Held open for the life of the process; the OS releases the lock when the process exits
+_held: dict[str, IO] = {}
+
+
+def acquire_process_lock(name: str) -> bool:
+    """Try to become the one process (among workers sharing a database) that owns `name`.
+
+    Used for work that must not run in every worker, such as the background job runner.
+    Returns True if this process holds the lock. In-memory databases are private to their
+    process, so the lock is always granted.
+    """
+    if name in _held:
+        return True
+
+    database_path = get_database_path()
+    if database_path == ":memory:" or fcntl is None:
+        return True
+
+    lock_path = Path(database_path).with_name(f".{Path(database_path).name}.{name}.lock")
+    handle = open(lock_path, "a+")
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    _held[name] = handle
+    return True
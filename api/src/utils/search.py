@@ -0,0 +1,50 @@
+import os
+
+# Shortest query the trigram index can answer
+SEARCH_MIN_QUERY_LENGTH = 3
+# Rows pre-ranked by shared trigrams that are scored in Python
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "50"))
+# Trigrams in more rows than this say little about a match and are not looked up
+SEARCH_COMMON_TRIGRAM_ROWS = int(os.getenv("SEARCH_COMMON_TRIGRAM_ROWS", "300"))
+# Results scoring below this are dropped as unrelated
+SEARCH_MIN_SCORE = float(os.getenv("SEARCH_MIN_SCORE", "0.3"))
+
+# A match in the name counts for more than one in the contact or the email address
+FIELD_WEIGHTS = {"name": 1.0, "contact_person": 0.8, "email": 0.6}
+
+
+def trigrams(text: str) -> set[str]:
+    """Lower-cased three-character substrings, as the FTS5 trigram tokenizer indexes them."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def substring_query(q: str) -> str:
+    """FTS5 expression matching rows where `q` occurs verbatim in any indexed column."""
+    return _quote(q)
+
+
+def similarity(query_grams: set[str], text: str | None) -> float:
+    """How well `text` matches the query: mostly the share of query trigrams it contains.
+
+    A smaller part rewards texts that are mostly query, so "Acme" outranks "Acme Holdings
+    International" for the query "acme". Containment is tested on the string itself rather
+    than on its trigram set, which is several times cheaper per candidate.
+    """
+    if not text or not query_grams:
+        return 0.0
+    text = text.lower()
+    shared = sum(1 for gram in query_grams if gram in text)
+    if not shared:
+        return 0.0
+    text_grams = max(len(text) - 2, shared)
+    return 0.8 * shared / len(query_grams) + 0.2 * shared / (len(query_grams) + text_grams - shared)
+
+
+def score(query_grams: set[str], row: dict) -> float:
+    """Best weighted similarity over the indexed fields of `row`."""
+    return max(weight * similarity(query_grams, row.get(field)) for field, weight in FIELD_WEIGHTS.items())
@@ -1,6 +1,11 @@
+import os
 import re
+from collections.abc import Iterator
 from typing import Any
 
+# Ids per `IN (...)` list in find_by_ids; well under SQLite's bound-parameter limit
+IN_LIST_CHUNK_SIZE = int(os.getenv("IN_LIST_CHUNK_SIZE", "500"))
+
 
 def camel_to_snake(name: str) -> str:
     name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
@@ -24,6 +29,18 @@ def generate_placeholders(count: int) -> str:
     return ", ".join(["?" for _ in range(count)])
 
 
+def id_chunks(ids: list[Any], chunk_size: int = IN_LIST_CHUNK_SIZE) -> Iterator[list[Any]]:
+    """Split ids into IN lists, padding each to a power of two by repeating its last id.
+
+    Padding keeps the number of distinct statements small, so they stay in sqlite3's
+    statement cache instead of being prepared again for every list length.
+    """
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        size = 1 << (len(chunk) - 1).bit_length()
+        yield chunk + [chunk[-1]] * (min(size, chunk_size) - len(chunk))
+
+
 def build_insert_sql(table: str, data: dict[str, Any]) -> tuple[str, list[Any]]:
     snake_data = dict_keys_to_snake(data)
     columns = list(snake_data.keys())
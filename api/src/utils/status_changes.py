@@ -0,0 +1,42 @@
+from typing import Any
+
+from src.models.status import StatusChange, source_statuses
+from src.repositories.base_repo import STATUS_CHANGE_CHUNK_SIZE, StatusRepository
+from src.utils.errors import ValidationError
+
+
+def apply_status_change(repo: StatusRepository, transitions: dict[str, set[str]], change: StatusChange) -> dict[str, Any]:
+    """Apply a bulk status change to explicit ids or to every row matching a filter.
+
+    Only rows whose current status may move to the target are touched. For ids, the rest
+    are reported back as skipped with their current status; for a filter, matching rows
+    are found a chunk at a time (keyset on id) and each chunk updated in its own commit.
+    """
+    sources = source_statuses(transitions, change.status, change.from_status)
+    filters = change.filter.model_dump(exclude_none=True) if getattr(change, "filter", None) else {}
+
+    if change.ids is not None and filters:
+        raise ValidationError("Provide either ids or a filter, not both")
+
+    if change.ids is not None:
+        ids = list(dict.fromkeys(change.ids))
+        updated = repo.transition_status(ids, change.status, sources)
+        changed = set(updated)
+        unchanged = [id_value for id_value in ids if id_value not in changed]
+        current = repo.find_statuses(unchanged) if unchanged else {}
+        skipped = [{"id": id_value, "status": current.get(id_value)} for id_value in unchanged]
+        return {"status": change.status, "updated_ids": updated, "skipped": skipped}
+
+    if not filters:
+        raise ValidationError("Provide ids or at least one filter")
+
+    updated = []
+    for source in sources:
+        after_id = 0
+        while ids := repo.find_ids_by_status(source, filters, after_id, STATUS_CHANGE_CHUNK_SIZE):
+            updated.extend(repo.transition_status(ids, change.status, [source]))
+            after_id = ids[-1]
+            if len(ids) < STATUS_CHANGE_CHUNK_SIZE:
+                break
+
+    return {"status": change.status, "updated_ids": sorted(updated), "skipped": []}
@@ -0,0 +1,331 @@
+import contextvars
+import functools
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import random
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.utils.metrics import metrics
+
+# none | file | otlp; "none" leaves every code path uninstrumented
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+# Share of requests without a sampled `traceparent` that are traced
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_OUTPUT_PATH = os.getenv("TRACE_OUTPUT_PATH", "./data/traces/spans.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "octocat-supply-api")
+TRACE_EXPORT_BATCH = int(os.getenv("TRACE_EXPORT_BATCH", "512"))
+TRACE_EXPORT_INTERVAL_SECONDS = float(os.getenv("TRACE_EXPORT_INTERVAL_SECONDS", "2"))
+# Finished spans waiting for export; spans beyond this are dropped and counted
+TRACE_MAX_QUEUE = int(os.getenv("TRACE_MAX_QUEUE", "8192"))
+TRACE_MAX_STATEMENT_LENGTH = 1000
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# W3C Trace Context: version-traceid-parentid-flags
+TRACEPARENT_PATTERN = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+spans_dropped = metrics.counter("trace_spans_dropped_total", "Finished spans dropped because the export queue was full")
+export_failures = metrics.counter("trace_export_failures_total", "Span batches the exporter failed to write")
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    error: str | None = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """(trace id, parent span id, sampled) from a `traceparent` header, or None if it is invalid."""
+    match = TRACEPARENT_PATTERN.match((value or "").strip().lower())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+class FileSink:
+    """Appends each batch as one OTLP/JSON export request per line (the collector's file format)."""
+
+    def __init__(self, path: str = TRACE_OUTPUT_PATH):
+        self.path = Path(path)
+        # flush() may run in a request thread while the exporter thread writes
+        self._lock = threading.Lock()
+
+    def write(self, document: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(document, separators=(",", ":")) + "\n")
+
+
+class OtlpSink:
+    """POSTs each batch to an OTLP/HTTP collector as JSON."""
+
+    def __init__(self, endpoint: str = TRACE_OTLP_ENDPOINT, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def write(self, document: dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(document).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class SpanExporter:
+    """Queues finished spans and hands them to a sink in batches from a background thread.
+
+    Requests only append to the queue; a slow or unreachable collector costs dropped spans
+    (trace_spans_dropped_total), never request latency.
+    """
+
+    def __init__(
+        self,
+        sink: FileSink | OtlpSink,
+        batch_size: int = TRACE_EXPORT_BATCH,
+        interval: float = TRACE_EXPORT_INTERVAL_SECONDS,
+        max_queue: int = TRACE_MAX_QUEUE,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queue = max_queue
+        self._queue: deque[Span] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # First span in this process (or in a forked worker): the parent's thread is not ours
+                self._queue, self._pid = deque(), os.getpid()
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+            if len(self._queue) >= self.max_queue:
+                spans_dropped.inc()
+                return
+            self._queue.append(span)
+            if len(self._queue) >= self.batch_size:
+                self._wake.set()
+
+    def flush(self) -> None:
+        """Write every queued span now, in the calling thread."""
+        while self._write_batch():
+            pass
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write_batch(self) -> bool:
+        with self._lock:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        if not batch:
+            return False
+
+        document = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": TRACE_SERVICE_NAME, "process.pid": os.getpid()})},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in batch]}],
+            }]
+        }
+        try:
+            self.sink.write(document)
+        except Exception as e:
+            export_failures.inc()
+            print(f"Span export failed: {e}")
+        return True
+
+
+def create_exporter(kind: str = TRACE_EXPORTER) -> SpanExporter | None:
+    if kind == "none":
+        return None
+    if kind == "file":
+        return SpanExporter(FileSink())
+    if kind == "otlp":
+        return SpanExporter(OtlpSink())
+    raise ValueError(f"TRACE_EXPORTER must be none, file or otlp, not {kind!r}")
+
+
+# Set by src.middleware.tracing.install_tracing(); None while tracing is off
+exporter: SpanExporter | None = None
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("trace_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        if exporter is not None:
+            exporter.export(span)
+
+
+def root_span(
+    name: str, trace_id: str | None = None, parent_id: str | None = None, kind: int = SPAN_KIND_SERVER
+) -> AbstractContextManager[Span]:
+    """Start a trace, or continue the caller's when `trace_id`/`parent_id` come from a traceparent."""
+    return _activate(Span(trace_id or _new_id(128), _new_id(64), parent_id, name, kind))
+
+
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, attributes: dict[str, Any] | None = None):
+    """A child of the current span; a no-op outside a traced request."""
+    parent = _current_span.get()
+    if parent is None:
+        return nullcontext()
+    return _activate(Span(parent.trace_id, _new_id(64), parent.span_id, name, kind, attributes or {}))
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a sync function to run in a span called `name` when its caller is traced."""
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorate
+
+
+def statement_span(sql: str):
+    """Statement observer (src.db.connection.statement_observers) recording each statement as a span."""
+    if _current_span.get() is None:
+        return nullcontext()
+    statement = " ".join(sql.split())
+    return span(
+        f"SQL {statement.split(' ', 1)[0].upper()}",
+        SPAN_KIND_CLIENT,
+        {"db.system": "sqlite", "db.statement": statement[:TRACE_MAX_STATEMENT_LENGTH]},
+    )
+
+
+def _plain_function(value: Any) -> bool:
+    return inspect.isfunction(value) and not (
+        inspect.iscoroutinefunction(value) or inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value)
+    )
+
+
+def instrument_repositories(package: str = "src.repositories") -> None:
+    """Wrap the public methods of every *Repository class, naming spans after the concrete class.
+
+    Inherited methods are wrapped again on each subclass, so `OrdersRepository.update` and
+    `DeliveriesRepository.update` show up as themselves rather than as the base method.
+    """
+    module = importlib.import_module(package)
+    for module_info in pkgutil.iter_modules(module.__path__):
+        repositories = importlib.import_module(f"{package}.{module_info.name}")
+        for class_name, cls in inspect.getmembers(repositories, inspect.isclass):
+            if not class_name.endswith("Repository") or cls.__module__ != repositories.__name__:
+                continue
+            for name in dir(cls):
+                member = inspect.getattr_static(cls, name)
+                if name.startswith("_") or not _plain_function(member):
+                    continue
+                if getattr(member, "__traced__", False):
+                    member = member.__wrapped__
+                setattr(cls, name, traced(f"{class_name}.{name}")(member))
+
+
+def dependency_spans(routers: list[Any]) -> dict[Callable, Callable]:
+    """Traced stand-ins for the sync dependencies (get_*_repository, ...) of `routers`' routes.
+
+    Meant for `app.dependency_overrides`, so FastAPI resolves each one inside a span.
+    """
+    overrides: dict[Callable, Callable] = {}
+
+    def visit(dependant) -> None:
+        for dependency in dependant.dependencies:
+            call = dependency.call
+            if _plain_function(call) and call not in overrides:
+                overrides[call] = traced(f"Depends {call.__name__}")(call)
+            visit(dependency)
+
+    for router in routers:
+        for route in router.routes:
+            if getattr(route, "dependant", None) is not None:
+                visit(route.dependant)
+    return overrides
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from unittest.mock import Mock
 
 import pytest
@@ -7,6 +8,87 @@ from httpx import ASGITransport, AsyncClient
 # Set environment variable to use in-memory database for tests
 os.environ["DATABASE_PATH"] = ":memory:"
 
+from src.db.archive import sync_archive_schema  # noqa: E402
+from src.db.connection import DatabaseConnection, connect  # noqa: E402
+from src.db.migrate import MigrationRunner  # noqa: E402
+from src.db.seed import Seeder  # noqa: E402
+
+
+class SavepointConnection(sqlite3.Connection):
+    """While `pinned`, commit() and rollback() leave the per-test savepoint open.
+
+    Repositories commit after every statement; pinning keeps all of a test's writes inside
+    one savepoint that the `db` fixture rolls back afterwards.
+    """
+
+    pinned = False
+
+    def commit(self) -> None:
+        if not self.pinned:
+            super().commit()
+
+    def rollback(self) -> None:
+        if not self.pinned:
+            super().rollback()
+
+
+def _clone(template: sqlite3.Connection) -> SavepointConnection:
+    """Copy the template into a new in-memory database with the backup API (about a millisecond)."""
+    conn = connect(":memory:", factory=SavepointConnection)
+    template.backup(conn)
+    DatabaseConnection.use_connection(conn)
+    DatabaseConnection.get_connection()
+    # The archive is a separate attached database; backup() only copies main
+    sync_archive_schema()
+    return conn
+
+
+@pytest.fixture(scope="session")
+def template_db():
+    """Migrated and seeded database, built once per session (once per xdist worker, all in memory)."""
+    conn = connect(":memory:")
+    DatabaseConnection.use_connection(conn)
+    MigrationRunner().run_migrations()
+    Seeder().seed_database()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def shared_db(template_db):
+    """The clone tests run against, each inside its own savepoint."""
+    conn = _clone(template_db)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def db(request, template_db):
+    """Give every test the migrated, seeded database and undo its writes afterwards.
+
+    Tests marked `fresh_db` get a private clone with real commits instead, for code that
+    needs them (online backups, other connections reading the same data).
+    """
+    previous = DatabaseConnection._instance, DatabaseConnection._pid, DatabaseConnection._test_mode
+
+    if request.node.get_closest_marker("fresh_db"):
+        conn = _clone(template_db)
+        yield conn
+        conn.close()
+    else:
+        conn = request.getfixturevalue("shared_db")
+        DatabaseConnection.use_connection(conn)
+        conn.execute("SAVEPOINT test")
+        conn.pinned = True
+        try:
+            yield conn
+        finally:
+            conn.pinned = False
+            conn.execute("ROLLBACK TO test")
+            conn.execute("RELEASE test")
+
+    DatabaseConnection._instance, DatabaseConnection._pid, DatabaseConnection._test_mode = previous
+
 
 @pytest.fixture
 async def client():
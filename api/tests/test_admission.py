@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from src.db.connection import DatabaseStats
+from src.db.retry import busy_retries, is_busy_error, retry_on_busy
+from src.middleware.admission import AdmissionController
+from src.utils import admin
+
+
+class FakeStats(DatabaseStats):
+    def __init__(self, waiting_writers: int = 0, wait_average: float = 0.0):
+        super().__init__()
+        self.waiting_writers = waiting_writers
+        self.wait_average = wait_average
+
+    def write_wait_average(self) -> float:
+        return self.wait_average
+
+
+@pytest.mark.asyncio
+async def test_everything_is_admitted_when_healthy():
+    """Test that no request is shed while the database keeps up."""
+    controller = AdmissionController(stats=FakeStats(), max_waiting_writers=4)
+    assert await controller.acquire("low") == "pass"
+    assert await controller.acquire("normal") == "pass"
+
+
+@pytest.mark.asyncio
+async def test_low_priority_is_shed_when_saturated():
+    """Test shedding of low priority work under a long write-lock queue."""
+    controller = AdmissionController(stats=FakeStats(waiting_writers=10), max_waiting_writers=4)
+    assert await controller.acquire("low") == "shed"
+    assert await controller.acquire("high") == "pass"
+
+
+@pytest.mark.asyncio
+async def test_shed_response_reaches_browsers(client, monkeypatch):
+    """Test that a 503 from load shedding carries CORS headers and a readable Retry-After."""
+
+    async def saturated(self, priority):
+        return "shed"
+
+    monkeypatch.setattr(AdmissionController, "acquire", saturated)
+    response = await client.get("/api/products", headers={"Origin": "http://localhost:5137"})
+
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5137"
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
+
+
+@pytest.mark.asyncio
+async def test_high_priority_needs_the_admin_token(client, monkeypatch):
+    """Test that X-Request-Priority: high only skips shedding when sent with a valid admin token."""
+    monkeypatch.setattr(AdmissionController, "saturated", lambda self: True)
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+
+    response = await client.get("/api/changes", headers={"X-Request-Priority": "high"})
+    assert response.status_code == 503
+
+    response = await client.get("/api/changes", headers={"X-Request-Priority": "high", "X-Admin-Token": "wrong"})
+    assert response.status_code == 503
+
+    response = await client.get("/api/changes", headers={"X-Request-Priority": "high", "X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_normal_priority_queues_for_bounded_slots():
+    """Test that normal requests queue and are shed once the queue wait times out."""
+    controller = AdmissionController(
+        stats=FakeStats(wait_average=1.0), max_write_wait_ms=100, max_concurrent=1, queue_timeout=0.05
+    )
+    assert await controller.acquire("normal") == "slot"
+    assert await controller.acquire("normal") == "shed"
+
+    controller.release()
+    assert await controller.acquire("normal") == "slot"
+
+
+def test_busy_errors_are_retried_with_backoff():
+    """Test that transient SQLITE_BUSY failures are retried for idempotent work."""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return "ok"
+
+    before = busy_retries.value(kind="test")
+    assert retry_on_busy(flaky, "test", attempts=3) == "ok"
+    assert len(attempts) == 3
+    assert busy_retries.value(kind="test") == before + 2
+
+
+def test_non_busy_errors_are_not_retried():
+    """Test that other operational errors surface immediately."""
+    attempts = []
+
+    def missing_table():
+        attempts.append(1)
+        raise sqlite3.OperationalError("no such table: nope")
+
+    assert not is_busy_error(sqlite3.OperationalError("no such table: nope"))
+    with pytest.raises(sqlite3.OperationalError):
+        retry_on_busy(missing_table, "test")
+    assert len(attempts) == 1
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.db.connection import DatabaseConnection
+from src.main import create_app
+from src.settings import Settings
+
+
+@pytest.mark.asyncio
+async def test_create_app_builds_independent_apps_from_settings():
+    """Test that each factory call gets its own app configured from the given settings."""
+    first = create_app(Settings(title="First", run_migrations=False, seed_database=False))
+    second = create_app(Settings(title="Second", run_migrations=False, seed_database=False))
+    assert first is not second
+
+    async with AsyncClient(transport=ASGITransport(app=first), base_url="http://test") as client:
+        response = await client.get("/")
+    assert response.json()["message"] == "First"
+
+
+def test_cors_origins_come_from_settings():
+    """Test that CORS_ORIGINS is read through the settings object."""
+    app = create_app(Settings(cors_origins="https://shop.example.com"))
+    cors = next(m for m in app.user_middleware if m.cls.__name__ == "CORSMiddleware")
+    assert cors.kwargs["allow_origins"] == ["https://shop.example.com"]
+
+
+def test_connection_inherited_from_another_process_is_not_reused(monkeypatch):
+    """Test that a connection opened before fork is replaced in the child."""
+    monkeypatch.setattr(DatabaseConnection, "_test_mode", False)
+    monkeypatch.setattr(DatabaseConnection, "_instance", None)
+    parent_conn = DatabaseConnection.get_connection()
+
+    # Simulate running in a forked child
+    monkeypatch.setattr(DatabaseConnection, "_pid", os.getpid() + 1)
+    child_conn = DatabaseConnection.get_connection()
+
+    assert child_conn is not parent_conn
+    assert DatabaseConnection._pid == os.getpid()
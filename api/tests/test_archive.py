@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.db.archive import archive_closed_orders
+from src.db.connection import execute, fetch_all, fetch_one
+from src.repositories.order_details_repo import get_order_details_repository
+from src.repositories.orders_repo import get_orders_repository
+from src.utils.errors import ConflictError
+
+OLD = (date.today() - timedelta(days=400)).isoformat()
+RECENT = date.today().isoformat()
+
+
+@pytest.fixture
+def branch_id():
+    """A branch with one old delivered order, one old pending order and one recent delivered order."""
+    hq_id = execute("INSERT INTO headquarters (name) VALUES ('Archive HQ')").lastrowid
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (?, 'Archive Branch')", (hq_id,)).lastrowid
+    supplier_id = execute("INSERT INTO suppliers (name) VALUES ('Archive Supplier')").lastrowid
+    product_id = execute(
+        "INSERT INTO products (supplier_id, name, price, sku, unit) VALUES (?, 'Crate', 1.0, ?, 'each')",
+        (supplier_id, f"ARC-{branch_id}"),
+    ).lastrowid
+
+    for name, order_date, status in [("old", OLD, "delivered"), ("open", OLD, "pending"), ("new", RECENT, "delivered")]:
+        order_id = execute(
+            "INSERT INTO orders (branch_id, order_date, name, status) VALUES (?, ?, ?, ?)",
+            (branch_id, order_date, name, status),
+        ).lastrowid
+        execute(
+            "INSERT INTO order_details (order_id, product_id, quantity, unit_price) VALUES (?, ?, 1, 1.0)",
+            (order_id, product_id),
+        )
+    return branch_id
+
+
+def _order(branch_id: int, name: str) -> dict:
+    return fetch_one("SELECT * FROM orders WHERE branch_id = ? AND name = ?", (branch_id, name))
+
+
+def test_closed_old_orders_move_to_the_archive(branch_id):
+    """Test that only closed orders past the cutoff leave the hot tables, details included."""
+    old = _order(branch_id, "old")
+
+    result = archive_closed_orders(older_than_days=90)
+
+    assert result["archived_orders"] >= 1
+    assert _order(branch_id, "old") is None
+    assert _order(branch_id, "open") is not None
+    assert _order(branch_id, "new") is not None
+    assert fetch_one("SELECT 1 FROM main.order_details WHERE order_id = ?", (old["order_id"],)) is None
+    assert fetch_one("SELECT 1 FROM archive.order_details WHERE order_id = ?", (old["order_id"],)) is not None
+
+    operations = fetch_all(
+        "SELECT operation FROM change_log WHERE table_name = 'orders' AND row_id = ? ORDER BY seq", (old["order_id"],)
+    )
+    assert [row["operation"] for row in operations] == ["insert", "archive"]
+
+
+def test_reads_union_hot_and_archived_rows(branch_id):
+    """Test that repository reads return archived orders alongside hot ones."""
+    old = _order(branch_id, "old")
+    archive_closed_orders(older_than_days=90)
+    orders = get_orders_repository()
+
+    assert [o["name"] for o in orders.find_by_branch_id(branch_id)] == ["old", "open", "new"]
+    assert orders.find_by_id(old["order_id"])["name"] == "old"
+    assert [o["name"] for o in orders.find_by_date_range(OLD, OLD) if o["branch_id"] == branch_id] == ["old", "open"]
+    assert [o["name"] for o in orders.find_by_date_range(RECENT, RECENT) if o["branch_id"] == branch_id] == ["new"]
+    assert len(get_order_details_repository().find_by_order_id(old["order_id"])) == 1
+
+
+def test_interrupted_batch_is_read_once_and_finished_by_next_run(branch_id):
+    """Test that a batch copied but not yet deleted is neither duplicated nor lost."""
+    old = _order(branch_id, "old")
+    execute("INSERT INTO archive.orders SELECT * FROM main.orders WHERE order_id = ?", (old["order_id"],))
+
+    assert [o["name"] for o in get_orders_repository().find_by_branch_id(branch_id)] == ["old", "open", "new"]
+
+    archive_closed_orders(older_than_days=90)
+    assert _order(branch_id, "old") is None
+    assert fetch_one("SELECT count(*) AS n FROM archive.orders WHERE order_id = ?", (old["order_id"],))["n"] == 1
+
+
+def test_archived_orders_are_read_only(branch_id):
+    """Test that writes to archived orders are refused rather than reported missing."""
+    old = _order(branch_id, "old")
+    archive_closed_orders(older_than_days=90)
+
+    with pytest.raises(ConflictError):
+        get_orders_repository().update(old["order_id"], {"name": "changed"})
+    with pytest.raises(ConflictError):
+        get_orders_repository().delete(old["order_id"])
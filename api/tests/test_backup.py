@@ -0,0 +1,93 @@
+import gzip
+import sqlite3
+
+import pytest
+
+from src.db.archive import archive_closed_orders
+from src.db.backup import create_snapshot, find_snapshot, list_snapshots, restore_snapshot
+from src.db.connection import execute
+from src.utils.errors import ConflictError, NotFoundError, ValidationError
+
+# Online backups read committed pages, so these tests need real commits
+pytestmark = pytest.mark.fresh_db
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Snapshot the migrated in-memory database with a couple of suppliers."""
+    execute("DELETE FROM suppliers")
+    execute("INSERT INTO suppliers (name) VALUES ('Backup Co'), ('Restore Ltd')")
+    return create_snapshot(tmp_path / "backups", pages_per_step=4, step_sleep_ms=0)
+
+
+def test_snapshot_restores_into_a_fresh_file(tmp_path, snapshot):
+    """Test that a restored snapshot contains the rows present at backup time."""
+    backup_dir = tmp_path / "backups"
+    assert [m["name"] for m in list_snapshots(backup_dir)] == [snapshot["name"]]
+
+    target = tmp_path / "restored" / "app.db"
+    result = restore_snapshot(find_snapshot(snapshot["name"], backup_dir), target)
+
+    assert result["sizeBytes"] == snapshot["sizeBytes"]
+    conn = sqlite3.connect(target)
+    names = [row[0] for row in conn.execute("SELECT name FROM suppliers ORDER BY name")]
+    conn.close()
+    assert names == ["Backup Co", "Restore Ltd"]
+
+
+def test_restore_refuses_existing_target(tmp_path, snapshot):
+    """Test that restore never overwrites a database unless asked to."""
+    snapshot_path = find_snapshot(snapshot["name"], tmp_path / "backups")
+    target = tmp_path / "app.db"
+    target.write_bytes(b"live data")
+
+    with pytest.raises(ConflictError):
+        restore_snapshot(snapshot_path, target)
+    assert target.read_bytes() == b"live data"
+
+    restore_snapshot(snapshot_path, target, overwrite=True)
+    assert target.read_bytes().startswith(b"SQLite format 3")
+
+
+def test_restore_rejects_tampered_snapshot(tmp_path, snapshot):
+    """Test that a snapshot that no longer matches its manifest is not restored."""
+    snapshot_path = find_snapshot(snapshot["name"], tmp_path / "backups")
+    with gzip.open(snapshot_path, "ab") as f:
+        f.write(b"garbage")
+
+    with pytest.raises(ValidationError):
+        restore_snapshot(snapshot_path, tmp_path / "app.db")
+    assert not (tmp_path / "app.db").exists()
+
+
+def test_find_snapshot_stays_inside_backup_dir(tmp_path, snapshot):
+    """Test that snapshot names cannot escape the backup directory."""
+    with pytest.raises(NotFoundError):
+        find_snapshot("../backups/" + snapshot["name"], tmp_path / "backups" / "nested")
+
+
+def test_snapshot_includes_archived_orders(tmp_path):
+    """Test that archived orders survive a snapshot and restore, in an archive file beside the target."""
+    order_id = execute(
+        "INSERT INTO orders (branch_id, order_date, name, status) VALUES (1, '2020-01-01', 'Archived Order', 'delivered')"
+    ).lastrowid
+    assert archive_closed_orders()["archived_orders"] >= 1
+    manifest = create_snapshot(tmp_path / "backups", pages_per_step=4, step_sleep_ms=0)
+    assert manifest["archive"]["file"] == f"{manifest['name']}.archive.db.gz"
+
+    target = tmp_path / "restored" / "app.db"
+    result = restore_snapshot(find_snapshot(manifest["name"], tmp_path / "backups"), target)
+
+    assert result["archiveTarget"] == str(tmp_path / "restored" / "app.archive.db")
+    conn = sqlite3.connect(target)
+    conn.execute("ATTACH DATABASE ? AS archive", (result["archiveTarget"],))
+    assert conn.execute("SELECT name FROM archive.orders WHERE order_id = ?", (order_id,)).fetchone() == ("Archived Order",)
+    assert conn.execute("SELECT 1 FROM main.orders WHERE order_id = ?", (order_id,)).fetchone() is None
+    conn.close()
+
+    # A damaged archive copy fails the restore as a whole
+    with gzip.open(tmp_path / "backups" / manifest["archive"]["file"], "ab") as f:
+        f.write(b"garbage")
+    with pytest.raises(ValidationError):
+        restore_snapshot(find_snapshot(manifest["name"], tmp_path / "backups"), tmp_path / "again.db")
+    assert not (tmp_path / "again.db").exists()
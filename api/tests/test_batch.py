@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from src.db.connection import fetch_one
+from src.utils import batch as batch_module
+
+ORDER_WITH_LINES = [
+    {"method": "POST", "path": "/api/orders", "ref": "order",
+     "body": {"branchId": 1, "orderDate": "2026-06-01", "name": "Batch Order"}},
+    {"method": "POST", "path": "/api/order-details", "ref": "line",
+     "body": {"orderId": "${order.orderId}", "productId": 1, "quantity": 2, "unitPrice": 4.5}},
+    {"method": "POST", "path": "/api/order-details",
+     "body": {"orderId": "${order.orderId}", "productId": 2, "quantity": 1, "unitPrice": 9.0}},
+    {"method": "PUT", "path": "/api/orders/${order.orderId}", "body": {"description": "Line ${line.orderDetailId}"}},
+]
+
+
+def _order_count(name: str) -> int:
+    return fetch_one("SELECT count(*) AS count FROM orders WHERE name = ?", (name,))["count"]
+
+
+@pytest.mark.asyncio
+async def test_operations_reference_earlier_results(client):
+    """Test an order and its lines created in one request, with ids substituted."""
+    response = await client.post("/api/batch", json={"operations": ORDER_WITH_LINES})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is True
+    assert [result["status"] for result in body["results"]] == [201, 201, 201, 200]
+    order_id = body["results"][0]["body"]["orderId"]
+    line_id = body["results"][1]["body"]["orderDetailId"]
+    assert body["results"][1]["body"]["orderId"] == order_id
+    assert body["results"][3]["body"]["description"] == f"Line {line_id}"
+
+    details = await client.get(f"/api/order-details/{line_id}")
+    assert details.json()["orderId"] == order_id
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_rolls_back_on_first_failure(client):
+    """Test that a failing operation undoes the earlier ones and stops the batch."""
+    operations = [
+        ORDER_WITH_LINES[0],
+        {"method": "POST", "path": "/api/order-details",
+         "body": {"orderId": "${order.orderId}", "productId": 999999, "quantity": 1, "unitPrice": 1.0}},
+        ORDER_WITH_LINES[2],
+    ]
+
+    response = await client.post("/api/batch", json={"operations": operations})
+
+    assert response.status_code == 400
+    body = response.json()
+    assert body["committed"] is False
+    assert [result["status"] for result in body["results"]] == [201, 400]
+    assert _order_count("Batch Order") == 0
+
+
+@pytest.mark.asyncio
+async def test_continue_mode_keeps_successful_operations(client):
+    """Test that only the failed operation is rolled back when continuing on error."""
+    operations = [
+        ORDER_WITH_LINES[0],
+        {"method": "GET", "path": "/api/orders/999999"},
+        {"method": "POST", "path": "/api/orders", "body": {"branchId": 1, "name": "Missing date"}},
+        {"method": "DELETE", "path": "/api/nowhere/1"},
+        {"method": "POST", "path": "/api/order-details",
+         "body": {"orderId": "${missing.orderId}", "productId": 1, "quantity": 1, "unitPrice": 1.0}},
+        ORDER_WITH_LINES[2],
+    ]
+
+    response = await client.post("/api/batch", json={"operations": operations, "mode": "continue"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is True
+    assert [result["status"] for result in body["results"]] == [201, 404, 422, 404, 400, 201]
+    assert _order_count("Batch Order") == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_from_other_threads_never_see_an_open_batch(client, monkeypatch):
+    """Test that a read issued mid-batch waits for the rollback instead of seeing its rows."""
+    run_operation = batch_module._run_operation
+    inserted = threading.Event()
+
+    def pause_after_order(routers, operation, responses):
+        result = run_operation(routers, operation, responses)
+        if operation.ref == "order":
+            inserted.set()
+            # Leave the order uncommitted while the reader queries
+            time.sleep(0.2)
+        return result
+
+    monkeypatch.setattr(batch_module, "_run_operation", pause_after_order)
+    seen = []
+    reader = threading.Thread(target=lambda: inserted.wait(5) and seen.append(_order_count("Batch Order")))
+    reader.start()
+
+    operations = [
+        ORDER_WITH_LINES[0],
+        {"method": "POST", "path": "/api/order-details",
+         "body": {"orderId": "${order.orderId}", "productId": 999999, "quantity": 1, "unitPrice": 1.0}},
+    ]
+    response = await client.post("/api/batch", json={"operations": operations})
+    reader.join(5)
+
+    assert response.json()["committed"] is False
+    assert seen == [0]
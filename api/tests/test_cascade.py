@@ -0,0 +1,99 @@
+import pytest
+
+from src.db.cascade import delete_in_chunks, plan_cascade
+from src.db.connection import execute, fetch_one
+from src.jobs.handlers import register_default_handlers
+from src.jobs.runner import job_runner
+
+
+@pytest.fixture
+def supplier_id():
+    """A supplier with 3 products, 1 delivery, 6 order details and 2 delivery links."""
+    supplier_id = execute("INSERT INTO suppliers (name) VALUES ('Cascade Supplier')").lastrowid
+    hq_id = execute("INSERT INTO headquarters (name) VALUES ('Cascade HQ')").lastrowid
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (?, 'Cascade Branch')", (hq_id,)).lastrowid
+    order_id = execute(
+        "INSERT INTO orders (branch_id, order_date, name) VALUES (?, '2026-01-01', 'Cascade Order')", (branch_id,)
+    ).lastrowid
+    delivery_id = execute(
+        "INSERT INTO deliveries (supplier_id, delivery_date, name) VALUES (?, '2026-01-02', 'Cascade Delivery')",
+        (supplier_id,),
+    ).lastrowid
+
+    for i in range(3):
+        product_id = execute(
+            "INSERT INTO products (supplier_id, name, price, sku, unit) VALUES (?, 'Part', 1.0, ?, 'each')",
+            (supplier_id, f"CAS-{supplier_id}-{i}"),
+        ).lastrowid
+        for _ in range(2):
+            detail_id = execute(
+                "INSERT INTO order_details (order_id, product_id, quantity, unit_price) VALUES (?, ?, 1, 1.0)",
+                (order_id, product_id),
+            ).lastrowid
+        if i < 2:
+            execute(
+                "INSERT INTO order_detail_deliveries (order_detail_id, delivery_id, quantity) VALUES (?, ?, 1)",
+                (detail_id, delivery_id),
+            )
+    return supplier_id
+
+
+def test_plan_counts_rows_reached_through_every_cascade_path(supplier_id):
+    """Test per-table counts, leaves-first order and capped counting."""
+    plan = plan_cascade("suppliers", supplier_id)
+
+    assert {step.table: step.rows for step in plan.steps} == {
+        "products": 3,
+        "deliveries": 1,
+        "order_details": 6,
+        "order_detail_deliveries": 2,
+        "stock_movements": 0,
+        "stock_balances": 0,
+    }
+    assert plan.steps[0].table == "order_detail_deliveries"
+    assert plan.dependent_rows == 12
+    assert plan_cascade("suppliers", supplier_id, count_limit=2).dependent_rows == 7
+
+
+def test_chunked_delete_removes_the_whole_tree(supplier_id):
+    """Test that small chunks delete everything the cascade would have."""
+    progress = []
+
+    plan = plan_cascade("suppliers", supplier_id)
+    result = delete_in_chunks(plan, chunk_size=2, on_progress=lambda done, total: progress.append((done, total)))
+
+    assert result["deleted"] == {
+        "order_detail_deliveries": 2,
+        "order_details": 6,
+        "deliveries": 1,
+        "products": 3,
+        "stock_movements": 0,
+        "stock_balances": 0,
+        "suppliers": 1,
+    }
+    assert progress[-1] == (13, 13)
+    assert fetch_one("SELECT 1 FROM products WHERE supplier_id = ?", (supplier_id,)) is None
+
+
+@pytest.mark.asyncio
+async def test_small_delete_runs_inline(client, supplier_id):
+    """Test that a delete under the threshold answers 204."""
+    response = await client.delete(f"/api/suppliers/{supplier_id}")
+
+    assert response.status_code == 204
+    assert fetch_one("SELECT 1 FROM suppliers WHERE supplier_id = ?", (supplier_id,)) is None
+
+
+@pytest.mark.asyncio
+async def test_large_delete_is_queued_as_a_job(client, supplier_id, monkeypatch):
+    """Test that a delete over the threshold answers 202 with a job and leaves rows in place."""
+    monkeypatch.setattr("src.utils.deletes.CASCADE_DELETE_JOB_THRESHOLD", 5)
+    register_default_handlers(job_runner)
+
+    response = await client.delete(f"/api/suppliers/{supplier_id}")
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["jobType"] == "cascade_delete"
+    assert job["params"] == {"table": "suppliers", "id": supplier_id}
+    assert fetch_one("SELECT 1 FROM suppliers WHERE supplier_id = ?", (supplier_id,)) is not None
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from src.db import catalog
+from src.db.catalog import CatalogSnapshot, CatalogStore, catalog_table, encode_snapshot
+from src.db.connection import get_db, transaction
+from src.repositories.products_repo import get_products_repository
+from src.repositories.suppliers_repo import get_suppliers_repository
+
+
+@pytest.fixture
+def store(tmp_path):
+    """The catalog snapshot enabled at a temporary path, built once."""
+    enabled = catalog.enable_catalog(str(tmp_path / "supply.catalog"))
+    assert enabled.rebuild()
+    yield enabled
+    catalog.disable_catalog()
+
+
+def _wait_for_snapshot(table: str = "products"):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        snapshot = catalog_table(table)
+        if snapshot is not None:
+            return snapshot
+        time.sleep(0.01)
+    raise AssertionError("catalog snapshot was not rebuilt")
+
+
+def test_encoding_round_trips_nulls_flags_and_text(tmp_path):
+    """Test that every column kind, nulls included, reads back as it was written."""
+    rows = [
+        {"id": 1, "name": "Tabby Tower", "price": 9.5, "active": True, "notes": None},
+        {"id": 4, "name": "Ünïcødé 🐈", "price": 0.0, "active": False, "notes": "x" * 300},
+        {"id": 7, "name": "", "price": None, "active": True, "notes": None},
+    ]
+    path = tmp_path / "test.catalog"
+    path.write_bytes(encode_snapshot({"things": ("id", rows), "empty": ("id", [])}, seq=42))
+
+    snapshot = CatalogSnapshot(path)
+    assert snapshot.seq == 42
+    assert snapshot.tables["things"].rows() == rows
+    assert [snapshot.tables["things"].get(i) for i in (1, 4, 7)] == rows
+    assert snapshot.tables["things"].get(5) is None
+    assert snapshot.tables["empty"].rows() == [] and snapshot.tables["empty"].get(1) is None
+
+
+def test_repositories_serve_the_same_rows_from_the_snapshot(tmp_path):
+    """Test that find_all/find_by_id return identical rows with and without the snapshot."""
+    products, suppliers = get_products_repository(), get_suppliers_repository()
+    expected = products.find_all(), suppliers.find_all(), products.find_by_id(3), suppliers.find_by_id(2)
+
+    catalog.enable_catalog(str(tmp_path / "supply.catalog")).rebuild()
+    try:
+        assert catalog_table("products") is not None
+        assert (products.find_all(), suppliers.find_all(), products.find_by_id(3), suppliers.find_by_id(2)) == expected
+        assert products.find_by_id(999_999) is None
+        assert suppliers.find_by_id(2)["active"] is True
+    finally:
+        catalog.disable_catalog()
+
+
+def test_writes_drop_the_snapshot_for_every_worker_until_rebuilt(store):
+    """Test read-your-writes across workers: a commit deletes the file, a rebuild brings it back."""
+    other_worker = CatalogStore(store.path)
+    assert other_worker.current() is not None
+    repo = get_products_repository()
+
+    repo.update(3, {"price": 1.25})
+    assert not store.path.exists()
+    assert other_worker.current() is None
+    assert repo.find_by_id(3)["price"] == 1.25
+
+    assert _wait_for_snapshot().get(3)["price"] == 1.25
+    assert other_worker.current().tables["products"].get(3)["price"] == 1.25
+    other_worker.close()
+
+    # Inside a transaction its own uncommitted rows come from SQLite
+    with transaction():
+        created = repo.create({"supplier_id": 1, "name": "Snapshot Feeder", "price": 3.0, "sku": "SNAP-1", "unit": "each"})
+        assert repo.find_by_id(created["product_id"])["name"] == "Snapshot Feeder"
+    assert _wait_for_snapshot().get(created["product_id"])["sku"] == "SNAP-1"
+
+
+def test_writes_bypassing_the_app_are_caught_by_verification(store):
+    """Test that a snapshot older than the change log is dropped on its next verification."""
+    store.verify_seconds = 0
+    with get_db() as conn:
+        conn.execute("UPDATE suppliers SET name = 'Renamed Outside' WHERE supplier_id = 2")
+
+    assert catalog_table("suppliers") is None
+    assert get_suppliers_repository().find_by_id(2)["name"] == "Renamed Outside"
+    assert _wait_for_snapshot("suppliers").get(2)["name"] == "Renamed Outside"
+
+
+def test_failed_background_build_is_counted_and_logged(store, monkeypatch, caplog):
+    """Test that a build raising in the builder thread keeps its traceback and bumps the failure counter."""
+    before = catalog.build_failures.value(error="OSError")
+
+    def fail():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "rebuild", fail)
+    with caplog.at_level("ERROR", logger="src.db.catalog"):
+        store.schedule_rebuild()
+        deadline = time.monotonic() + 5
+        while catalog.build_failures.value(error="OSError") == before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        store.close()
+
+    assert catalog.build_failures.value(error="OSError") == before + 1
+    assert [record.exc_info[1].args for record in caplog.records if record.name == "src.db.catalog"] == [("disk full",)]
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.db.connection import execute
+from src.utils import batch as batch_module
+from src.repositories.change_log_repo import get_change_log_repository, retention_cutoff
+
+
+def _insert_supplier(name: str) -> int:
+    return execute("INSERT INTO suppliers (name) VALUES (?)", (name,)).lastrowid
+
+
+@pytest.mark.asyncio
+async def test_changes_are_returned_after_cursor(client):
+    """Test that row mutations show up in the feed in order."""
+    since = get_change_log_repository().latest_seq()
+    supplier_id = _insert_supplier("Change Feed Supplier")
+    execute("UPDATE suppliers SET phone = '555' WHERE supplier_id = ?", (supplier_id,))
+
+    response = await client.get("/api/changes", params={"since": since})
+    assert response.status_code == 200
+
+    feed = response.json()
+    assert [(c["tableName"], c["rowId"], c["operation"]) for c in feed["changes"]] == [
+        ("suppliers", supplier_id, "insert"),
+        ("suppliers", supplier_id, "update"),
+    ]
+    assert feed["nextSince"] == feed["changes"][-1]["seq"]
+    assert feed["hasMore"] is False
+
+
+@pytest.mark.asyncio
+async def test_long_poll_skips_a_rolled_back_batch(client, monkeypatch):
+    """Test that a poll during a batch that rolls back neither returns its changes nor moves past them.
+
+    The rolled-back rows' seq values are handed out again, so a cursor past them would skip real changes.
+    """
+    run_operation = batch_module._run_operation
+
+    def slow(routers, operation, responses):
+        result = run_operation(routers, operation, responses)
+        # Several poll intervals with the supplier uncommitted
+        time.sleep(0.6)
+        return result
+
+    monkeypatch.setattr(batch_module, "_run_operation", slow)
+    since = get_change_log_repository().latest_seq()
+    poll = asyncio.create_task(client.get("/api/changes", params={"since": since, "wait": 5, "tables": "suppliers"}))
+    await asyncio.sleep(0.05)
+
+    operations = [
+        {"method": "POST", "path": "/api/suppliers", "body": {"name": "Rolled Back Supplier"}},
+        {"method": "PUT", "path": "/api/suppliers/999999", "body": {"name": "Missing"}},
+    ]
+    response = await client.post("/api/batch", json={"operations": operations})
+    assert response.json()["committed"] is False
+    execute("UPDATE suppliers SET phone = '555' WHERE supplier_id = 1")
+
+    feed = (await poll).json()
+    assert [(c["rowId"], c["operation"]) for c in feed["changes"]] == [(1, "update")]
+    assert feed["nextSince"] == get_change_log_repository().latest_seq()
+
+
+@pytest.mark.asyncio
+async def test_changes_pagination_and_table_filter(client):
+    """Test limit/hasMore and filtering by table."""
+    since = get_change_log_repository().latest_seq()
+    for i in range(3):
+        _insert_supplier(f"Paged Supplier {i}")
+
+    response = await client.get("/api/changes", params={"since": since, "limit": 2})
+    feed = response.json()
+    assert len(feed["changes"]) == 2
+    assert feed["hasMore"] is True
+
+    response = await client.get("/api/changes", params={"since": since, "tables": "orders"})
+    assert response.json()["changes"] == []
+
+
+@pytest.mark.asyncio
+async def test_compacted_cursor_returns_gone(client):
+    """Test that cursors older than the compaction watermark get 410."""
+    repo = get_change_log_repository()
+    _insert_supplier("Compacted Supplier")
+    _insert_supplier("Retained Supplier")
+
+    repo.compact(retain_seconds=3600, max_rows=1, batch_size=1000)
+
+    response = await client.get("/api/changes", params={"since": 0})
+    assert response.status_code == 410
+
+    response = await client.get("/api/changes", params={"since": repo.compacted_through()})
+    assert response.status_code == 200
+    assert len(response.json()["changes"]) == 1
+
+
+def test_retention_cutoff_matches_changed_at_format():
+    """Test that the cutoff has whole seconds and milliseconds, like SQLite's %f."""
+    now = datetime(2026, 10, 19, 13, 24, 3, 837507, tzinfo=timezone.utc)
+    assert retention_cutoff(30, now) == "2026-10-19T13:23:33.837Z"
+
+
+def test_compaction_keeps_entries_newer_than_the_cutoff():
+    """Test that retention drops an entry older than the cutoff and keeps one a few seconds newer."""
+    repo = get_change_log_repository()
+    execute("DELETE FROM change_log")
+    expired, kept = _insert_supplier("Expired Supplier"), _insert_supplier("Kept Supplier")
+    now = datetime.now(timezone.utc)
+    for row_id, age in ((expired, 70), (kept, 50)):
+        changed_at = (now - timedelta(seconds=age)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        execute("UPDATE change_log SET changed_at = ? WHERE table_name = 'suppliers' AND row_id = ?", (changed_at, row_id))
+
+    repo.compact(retain_seconds=60, max_rows=1000, batch_size=1000)
+
+    assert [change["row_id"] for change in repo.find_since(0, 10)] == [kept]
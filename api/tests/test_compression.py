@@ -0,0 +1,79 @@
+import gzip
+
+import pytest
+
+from src.main import app
+from src.middleware.compression import compressed_body_cache, negotiate_encoding
+from src.repositories.products_repo import get_products_repository
+
+
+def _mock_products(count: int) -> list[dict]:
+    return [
+        {
+            "product_id": i,
+            "supplier_id": 1,
+            "name": f"Product {i}",
+            "description": f"Description {i}",
+            "price": 100.0 + i,
+            "sku": f"SKU-{i:03d}",
+            "unit": "piece",
+            "discount": 0.0,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def test_negotiate_encoding_respects_quality_values():
+    """Test that client q-values win over server preference."""
+    assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", ["gzip"]) is None
+    assert negotiate_encoding("*;q=0", ["gzip"]) is None
+    assert negotiate_encoding("*", ["gzip"]) == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_large_list_is_gzip_compressed(client, mock_products_repo):
+    """Test that large JSON lists are compressed and cached for reuse."""
+    mock_products_repo.find_all.return_value = _mock_products(50)
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+    compressed_body_cache.clear()
+
+    try:
+        response = await client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()) == 50
+
+        misses = compressed_body_cache.misses
+        hits = compressed_body_cache.hits
+        response = await client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert compressed_body_cache.hits == hits + 1
+        assert compressed_body_cache.misses == misses
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed(client, mock_products_repo):
+    """Test that responses below the minimum size are sent as-is."""
+    mock_products_repo.find_all.return_value = _mock_products(1)
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+
+    try:
+        response = await client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_gzip_output_is_deterministic():
+    """Test that identical bodies produce identical gzip output (cache-friendly)."""
+    from src.middleware.compression import compress
+
+    body = b'{"hello": "world"}' * 100
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip")) == body
@@ -0,0 +1,95 @@
+import pytest
+
+from src.db.archive import _generated_expression, archive_closed_orders
+from src.db.connection import execute, fetch_one
+from src.repositories.deliveries_repo import get_deliveries_repository
+from src.repositories.orders_repo import get_orders_repository
+from src.utils.errors import ValidationError
+
+
+def _add_order(order_date: str, status: str = "pending", name: str = "Dated") -> int:
+    return execute(
+        "INSERT INTO orders (branch_id, order_date, name, status) VALUES (1, ?, ?, ?)", (order_date, name, status)
+    ).lastrowid
+
+
+def test_generated_columns_normalize_date_text():
+    """Test day and month columns for plain dates, date-times and UTC offsets."""
+    cases = {
+        "2024-06-01": (19875, 202406),
+        "2024-06-01T08:15:00": (19875, 202406),
+        "2024-06-01 23:59:59.500": (19875, 202406),
+        # 2024-06-02T04:30Z: offsets are normalized to UTC
+        "2024-06-01T23:30:00-05:00": (19876, 202406),
+    }
+    for order_date, expected in cases.items():
+        row = fetch_one("SELECT order_day, order_month FROM orders WHERE order_id = ?", (_add_order(order_date),))
+        assert (row["order_day"], row["order_month"]) == expected, order_date
+
+
+@pytest.mark.asyncio
+async def test_models_reject_unparseable_dates(client):
+    """Test that create, update and status filters refuse text SQLite's date functions cannot read."""
+    for order_date in ["06/01/2024", "2024-6-1", "2024-02-30", "20240601", "yesterday"]:
+        response = await client.post("/api/orders", json={"branchId": 1, "orderDate": order_date, "name": "Bad"})
+        assert response.status_code == 422, order_date
+
+    response = await client.post("/api/deliveries", json={"supplierId": 1, "deliveryDate": "2024-06-01T09:30:00Z", "name": "Ok"})
+    assert response.status_code == 201
+    response = await client.put(f"/api/deliveries/{response.json()['deliveryId']}", json={"deliveryDate": "next week"})
+    assert response.status_code == 422
+
+    response = await client.post("/api/orders/status", json={"status": "cancelled", "filter": {"orderDateFrom": "June"}})
+    assert response.status_code == 422
+
+    with pytest.raises(ValidationError):
+        get_orders_repository().find_by_date_range("2024-06-01", "June")
+
+
+def test_date_range_covers_whole_days():
+    """Test that date-times on the end day are included and results come back by date, then id."""
+    late = _add_order("2011-05-03T18:00:00", name="late")
+    first = _add_order("2011-05-01", name="first")
+    _add_order("2011-05-04", name="after")
+
+    orders = get_orders_repository().find_by_date_range("2011-05-01", "2011-05-03")
+
+    assert [order["order_id"] for order in orders] == [first, late]
+
+
+@pytest.mark.asyncio
+async def test_buckets_count_hot_and_archived_orders(client):
+    """Test day and month buckets across the archive boundary."""
+    _add_order("2001-03-05", status="delivered")
+    _add_order("2001-03-05T12:00:00")
+    _add_order("2001-04-10")
+    archive_closed_orders(older_than_days=90)
+    assert fetch_one("SELECT count(*) AS count FROM archive.orders WHERE order_date = '2001-03-05'")["count"] == 1
+
+    response = await client.get("/api/orders/buckets", params={"from": "2001-01-01", "to": "2001-12-31", "interval": "month"})
+    assert response.status_code == 200
+    assert response.json() == [{"bucket": "2001-03", "count": 2}, {"bucket": "2001-04", "count": 1}]
+
+    response = await client.get("/api/orders/buckets", params={"from": "2001-03-01", "to": "2001-03-31"})
+    assert response.json() == [{"bucket": "2001-03-05", "count": 2}]
+
+    response = await client.get("/api/orders/buckets", params={"from": "2001-01-01", "to": "2001-12-31", "interval": "week"})
+    assert response.status_code == 422
+
+
+def test_delivery_month_buckets_trim_partial_months():
+    """Test that month buckets only count the days inside the range."""
+    for delivery_date in ["2002-01-31", "2002-02-01", "2002-02-20", "2002-03-01"]:
+        execute("INSERT INTO deliveries (supplier_id, delivery_date, name) VALUES (1, ?, 'Bucketed')", (delivery_date,))
+
+    buckets = get_deliveries_repository().count_by_bucket("month", "2002-01-31", "2002-02-10")
+
+    assert buckets == [{"bucket": "2002-01", "count": 1}, {"bucket": "2002-02", "count": 1}]
+
+
+def test_archive_sync_reads_generated_expressions():
+    """Test the expression used to backfill generated columns added to existing archive tables."""
+    table_sql = fetch_one("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'orders'")["sql"]
+
+    assert _generated_expression(table_sql, "order_day") == "CAST(julianday(date(order_date)) - 2440587.5 AS INTEGER)"
+    assert _generated_expression(table_sql, "order_month") == "CAST(strftime('%Y%m', order_date) AS INTEGER)"
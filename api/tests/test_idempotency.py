@@ -0,0 +1,128 @@
+import pytest
+
+from src.db.connection import execute
+from src.main import app
+from src.repositories.idempotency_repo import get_idempotency_repository
+from src.repositories.products_repo import get_products_repository
+
+NEW_PRODUCT = {
+    "supplierId": 1,
+    "name": "Test Product",
+    "price": 99.99,
+    "sku": "TEST-001",
+    "unit": "piece",
+}
+
+CREATED_PRODUCT = {
+    "product_id": 13,
+    "supplier_id": 1,
+    "name": "Test Product",
+    "price": 99.99,
+    "sku": "TEST-001",
+    "unit": "piece",
+    "discount": 0.0,
+}
+
+
+@pytest.mark.asyncio
+async def test_retry_with_same_key_replays_response(client, mock_products_repo):
+    """Test that a retried POST returns the stored response without re-executing."""
+    mock_products_repo.create.return_value = CREATED_PRODUCT
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+
+    try:
+        headers = {"Idempotency-Key": "retry-same-key"}
+        first = await client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+        second = await client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+
+        assert first.status_code == 201
+        assert second.status_code == 201
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+        mock_products_repo.create.assert_called_once()
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_payload_is_rejected(client, mock_products_repo):
+    """Test that reusing a key for a different payload returns 422."""
+    mock_products_repo.create.return_value = CREATED_PRODUCT
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+
+    try:
+        headers = {"Idempotency-Key": "reused-key"}
+        await client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+        response = await client.post("/api/products", json={**NEW_PRODUCT, "sku": "OTHER"}, headers=headers)
+
+        assert response.status_code == 422
+        mock_products_repo.create.assert_called_once()
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_post_without_key_is_not_deduplicated(client, mock_products_repo):
+    """Test that requests without the header execute every time."""
+    mock_products_repo.create.return_value = CREATED_PRODUCT
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+
+    try:
+        await client.post("/api/products", json=NEW_PRODUCT)
+        await client.post("/api/products", json=NEW_PRODUCT)
+
+        assert mock_products_repo.create.call_count == 2
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_replayed_response_carries_cors_headers(client, mock_products_repo):
+    """Test that a replay built by the middleware still passes through CORS."""
+    mock_products_repo.create.return_value = CREATED_PRODUCT
+    app.dependency_overrides[get_products_repository] = lambda: mock_products_repo
+
+    try:
+        headers = {"Idempotency-Key": "cors-replay", "Origin": "http://localhost:5137"}
+        await client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+        replay = await client.post("/api/products", json=NEW_PRODUCT, headers=headers)
+
+        assert replay.headers["idempotent-replayed"] == "true"
+        assert replay.headers["access-control-allow-origin"] == "http://localhost:5137"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_abandoned_reservation_is_taken_over_after_its_lease():
+    """Test that a key left in progress by a dead worker is only held until its lease ends."""
+    repo = get_idempotency_repository()
+    args = ("crashed-worker", "POST", "/api/products", "hash")
+
+    assert repo.reserve(*args, "lease-1", ttl_seconds=3600, lock_seconds=60) is None
+    assert repo.reserve(*args, "lease-2", ttl_seconds=3600, lock_seconds=60)["status_code"] is None
+
+    execute("UPDATE idempotency_keys SET locked_until = locked_until - 61 WHERE idempotency_key = 'crashed-worker'")
+    assert repo.reserve(*args, "lease-2", ttl_seconds=3600, lock_seconds=60) is None
+
+    repo.complete("crashed-worker", "POST", "/api/products", "lease-2", 201, "application/json", b"{}")
+    # A completed key is never taken over, whatever its lease said
+    assert repo.reserve(*args, "lease-3", ttl_seconds=3600, lock_seconds=60)["status_code"] == 201
+
+
+def test_late_original_request_cannot_touch_a_taken_over_key():
+    """Test that after a takeover the original lease can neither store its response nor release the key."""
+    repo = get_idempotency_repository()
+    key = ("slow-request", "POST", "/api/products")
+
+    assert repo.reserve(*key, "hash", "original", ttl_seconds=3600, lock_seconds=60) is None
+    execute("UPDATE idempotency_keys SET locked_until = locked_until - 61 WHERE idempotency_key = 'slow-request'")
+    assert repo.reserve(*key, "hash", "retry", ttl_seconds=3600, lock_seconds=60) is None
+
+    repo.release(*key, "original")
+    assert repo.find(*key)["lease_token"] == "retry"
+    repo.complete(*key, "original", 500, "application/json", b"stale")
+    assert repo.find(*key)["status_code"] is None
+
+    repo.complete(*key, "retry", 201, "application/json", b"{}")
+    repo.complete(*key, "retry", 201, "application/json", b"overwritten")
+    assert repo.find(*key)["response_body"] == b"{}"
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from src.db.connection import fetch_one
+from src.models.product import ProductCreate
+from src.repositories.products_repo import get_products_repository
+from src.utils import ingest as ingest_module
+from src.utils.ingest import ingest
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def _product(sku: str) -> dict | None:
+    return fetch_one("SELECT * FROM products WHERE sku = ?", (sku,))
+
+
+@pytest.mark.asyncio
+async def test_csv_import_creates_and_updates_by_sku(client):
+    """Test that a CSV import inserts new SKUs, updates existing ones and keeps quoted newlines."""
+    body = (
+        "supplierId,name,description,price,sku,unit,discount\r\n"
+        '1,"Laser Pointer","Red dot,\nnow with ""turbo""",9.5,IMP-001,piece,\r\n'
+        "1,Feeder Renamed,,139.99,CAT-FEED-001,piece,0.1\r\n"
+    )
+
+    response = await client.post("/api/products/import", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "received": 2, "written": 2, "failed": 0, "batches": 1, "errors": [], "errorsTruncated": False
+    }
+    created = _product("IMP-001")
+    assert created["description"] == 'Red dot,\nnow with "turbo"'
+    assert created["discount"] == 0.0
+    assert _product("CAT-FEED-001")["product_id"] == 1
+    assert _product("CAT-FEED-001")["name"] == "Feeder Renamed"
+
+
+@pytest.mark.asyncio
+async def test_import_reports_bad_rows_and_keeps_the_rest(client):
+    """Test that invalid, malformed and constraint-breaking rows are reported by row number."""
+    lines = [
+        {"supplierId": 1, "name": "Good", "price": 1.0, "sku": "IMP-GOOD", "unit": "piece"},
+        {"supplierId": 1, "name": "No price", "sku": "IMP-BAD", "unit": "piece"},
+        {"supplierId": 999999, "name": "Orphan", "price": 1.0, "sku": "IMP-ORPHAN", "unit": "piece"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n{not json\n[1, 2]\n"
+
+    response = await client.post(
+        "/api/products/import", content=body, headers={"Content-Type": "application/x-ndjson; charset=utf-8"}
+    )
+
+    report = response.json()
+    assert (report["received"], report["written"], report["failed"]) == (5, 1, 4)
+    assert [error["row"] for error in sorted(report["errors"], key=lambda e: e["row"])] == [2, 3, 4, 5]
+    assert "price" in next(e["message"] for e in report["errors"] if e["row"] == 2)
+    assert "Foreign key" in next(e["message"] for e in report["errors"] if e["row"] == 3)
+    assert _product("IMP-GOOD") is not None
+    assert _product("IMP-ORPHAN") is None
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_other_content_types(client):
+    """Test that a body that is neither CSV nor NDJSON is refused before it is read."""
+    response = await client.post("/api/products/import", json=[{"sku": "X"}])
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_ingest_writes_in_batches_across_chunk_boundaries(db):
+    """Test that small chunks are reassembled into lines and rows are written batch by batch."""
+    header = "supplierId,name,price,sku,unit\n"
+    rows = "".join(f"2,Batch {n},{n}.5,IMP-B{n:03},box\n" for n in range(7))
+    batches = []
+
+    def write(values):
+        batches.append(len(values))
+        return get_products_repository().upsert_many(values)
+
+    report = await ingest(_chunks((header + rows).encode(), 5), "text/csv", ProductCreate, write, batch_size=3)
+
+    assert batches == [3, 3, 1]
+    assert (report.received, report.written, report.batches) == (7, 7, 3)
+    assert _product("IMP-B006")["price"] == 6.5
+
+
+@pytest.mark.asyncio
+async def test_csv_bare_quote_and_runaway_record_do_not_swallow_the_file(db, monkeypatch):
+    """Test that a quote inside an unquoted field is data and an unterminated quote is cut off."""
+    monkeypatch.setattr(ingest_module, "INGEST_MAX_LINE_LENGTH", 80)
+    body = (
+        "supplierId,name,price,sku,unit\n"
+        '2,5" hex bolt,1.5,IMP-Q1,box\n'
+        '2,"Never closed,1.5,IMP-Q2,box\n'
+        + "".join(f"filler line {n}\n" for n in range(10))
+        + "2,After,2.5,IMP-Q3,box\n"
+    )
+
+    report = await ingest(_chunks(body.encode(), 7), "text/csv", ProductCreate, get_products_repository().upsert_many)
+
+    assert _product("IMP-Q1")["name"] == '5" hex bolt'
+    assert _product("IMP-Q2") is None
+    assert _product("IMP-Q3")["price"] == 2.5
+    assert report.errors[0] == {"row": 2, "message": "Record longer than 80 characters"}
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_idempotency_key(client):
+    """Test that the streaming import refuses an Idempotency-Key rather than buffering the body."""
+    response = await client.post(
+        "/api/products/import",
+        content="supplierId,name,price,sku,unit\n2,Keyed,1.0,IMP-KEY,box\n",
+        headers={"Content-Type": "text/csv", "Idempotency-Key": "import-1"},
+    )
+
+    assert response.status_code == 400
+    assert _product("IMP-KEY") is None
@@ -0,0 +1,150 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.db.connection import execute, fetch_one
+from src.repositories.inventory_repo import get_inventory_repository
+from src.utils.errors import ConflictError
+
+
+@pytest.fixture
+def delivery():
+    """A delivery carrying 100 units of product 1 and 20 of product 2, ordered by a new branch."""
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (1, 'Stock Branch')").lastrowid
+    order_id = execute(
+        "INSERT INTO orders (branch_id, order_date, name) VALUES (?, '2026-03-01', 'Restock')", (branch_id,)
+    ).lastrowid
+    delivery_id = execute(
+        "INSERT INTO deliveries (supplier_id, delivery_date, name, status) VALUES (1, '2026-03-04', 'Truck', 'delivered')"
+    ).lastrowid
+    for product_id, quantity in [(1, 100), (2, 20)]:
+        detail_id = execute(
+            "INSERT INTO order_details (order_id, product_id, quantity, unit_price) VALUES (?, ?, ?, 1.0)",
+            (order_id, product_id, quantity),
+        ).lastrowid
+        execute(
+            "INSERT INTO order_detail_deliveries (order_detail_id, delivery_id, quantity) VALUES (?, ?, ?)",
+            (detail_id, delivery_id, quantity),
+        )
+    return {"branch_id": branch_id, "delivery_id": delivery_id}
+
+
+def _ledger_total(branch_id: int, product_id: int) -> int:
+    return fetch_one(
+        "SELECT coalesce(sum(quantity), 0) AS total FROM stock_movements WHERE branch_id = ? AND product_id = ?",
+        (branch_id, product_id),
+    )["total"]
+
+
+@pytest.mark.asyncio
+async def test_receipt_books_each_line_once(client, delivery):
+    """Test that a receipt adds stock at the ordering branch and repeating it adds nothing."""
+    branch_id = delivery["branch_id"]
+
+    response = await client.post(f"/api/inventory/receipts/{delivery['delivery_id']}")
+    assert response.status_code == 201
+    movements = response.json()["movements"]
+    assert [(m["productId"], m["quantity"], m["balance"]) for m in movements] == [(1, 100, 100), (2, 20, 20)]
+
+    response = await client.post(f"/api/inventory/receipts/{delivery['delivery_id']}")
+    assert response.json() == {"movements": [], "archivedLineIds": []}
+
+    response = await client.get(f"/api/inventory/branches/{branch_id}/products/1")
+    assert response.json()["quantity"] == 100 == _ledger_total(branch_id, 1)
+
+    response = await client.post("/api/inventory/receipts/999999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_receipt_requires_a_delivered_delivery(client, delivery):
+    """Test that receiving marks an in-transit delivery delivered and refuses pending or cancelled ones."""
+    delivery_id = delivery["delivery_id"]
+    for refused in ("pending", "cancelled"):
+        execute("UPDATE deliveries SET status = ? WHERE delivery_id = ?", (refused, delivery_id))
+        response = await client.post(f"/api/inventory/receipts/{delivery_id}")
+        assert response.status_code == 409
+        assert _ledger_total(delivery["branch_id"], 1) == 0
+
+    execute("UPDATE deliveries SET status = 'in_transit' WHERE delivery_id = ?", (delivery_id,))
+    response = await client.post(f"/api/inventory/receipts/{delivery_id}")
+    assert response.status_code == 201
+    assert len(response.json()["movements"]) == 2
+    assert fetch_one("SELECT status FROM deliveries WHERE delivery_id = ?", (delivery_id,))["status"] == "delivered"
+
+
+def test_receipt_reports_lines_archived_before_they_were_received(delivery):
+    """Test that lines moved to the archive with their order are reported rather than dropped."""
+    archived_id = execute(
+        "INSERT INTO archive.order_detail_deliveries (order_detail_delivery_id, order_detail_id, delivery_id, quantity) "
+        "VALUES (900001, 900001, ?, 5)",
+        (delivery["delivery_id"],),
+    ).lastrowid
+
+    receipt = get_inventory_repository().receive_delivery(delivery["delivery_id"])
+
+    assert len(receipt["movements"]) == 2
+    assert receipt["archived_line_ids"] == [archived_id]
+
+
+@pytest.mark.asyncio
+async def test_consumption_is_all_or_nothing(client, delivery):
+    """Test that a consumption exceeding the stock of any line records none of its lines."""
+    branch_id = delivery["branch_id"]
+    get_inventory_repository().receive_delivery(delivery["delivery_id"])
+
+    response = await client.post(
+        "/api/inventory/consumption",
+        json={"branchId": branch_id, "lines": [{"productId": 1, "quantity": 30}, {"productId": 2, "quantity": 21}]},
+    )
+    assert response.status_code == 409
+    assert _ledger_total(branch_id, 1) == 100
+
+    response = await client.post(
+        "/api/inventory/consumption",
+        json={"branchId": branch_id, "lines": [{"productId": 1, "quantity": 30, "notes": "Display"}]},
+    )
+    assert response.status_code == 201
+    assert response.json()[0]["balance"] == 70
+
+    response = await client.get(f"/api/inventory/branches/{branch_id}/products/1/movements", params={"limit": 1})
+    assert [m["kind"] for m in response.json()] == ["receipt"]
+    after = response.json()[0]["movementId"]
+    response = await client.get(f"/api/inventory/branches/{branch_id}/products/1/movements", params={"after": after})
+    assert [(m["kind"], m["quantity"]) for m in response.json()] == [("consumption", -30)]
+
+
+@pytest.mark.asyncio
+async def test_low_stock_follows_reorder_levels(client, delivery):
+    """Test that pairs enter and leave the low-stock list as stock and reorder levels change."""
+    branch_id = delivery["branch_id"]
+    repo = get_inventory_repository()
+    repo.receive_delivery(delivery["delivery_id"])
+
+    response = await client.put(f"/api/inventory/branches/{branch_id}/products/2/reorder-level", json={"reorderLevel": 15})
+    assert response.json()["reorderLevel"] == 15
+    assert (await client.get("/api/inventory/low-stock", params={"branchId": branch_id})).json() == []
+
+    repo.consume(branch_id, [{"product_id": 2, "quantity": 5}])
+    low = (await client.get("/api/inventory/low-stock", params={"branchId": branch_id})).json()
+    assert [(row["productId"], row["quantity"]) for row in low] == [(2, 15)]
+
+
+def test_concurrent_consumption_keeps_the_balance_exact(delivery):
+    """Test that concurrent movements of one product neither lose updates nor oversell."""
+    branch_id = delivery["branch_id"]
+    repo = get_inventory_repository()
+    repo.receive_delivery(delivery["delivery_id"])
+
+    def take_one(_):
+        try:
+            repo.consume(branch_id, [{"product_id": 1, "quantity": 1}])
+            return True
+        except ConflictError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        taken = sum(pool.map(take_one, range(120)))
+
+    assert taken == 100
+    assert repo.find_balance(branch_id, 1)["quantity"] == 0 == _ledger_total(branch_id, 1)
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from src.jobs.runner import JobRunner
+
+
+@pytest.fixture
+def runner():
+    """Create a started job runner against the migrated in-memory database."""
+    job_runner = JobRunner(max_workers=1)
+    job_runner.start()
+    yield job_runner
+    job_runner.shutdown(wait=True)
+
+
+def test_job_reports_progress_and_result(runner):
+    """Test that a job runs off-thread and stores its result."""
+
+    def count_rows(context, params):
+        for i in range(params["rows"]):
+            context.report_progress((i + 1) / params["rows"], force=True)
+        return {"rows": params["rows"]}
+
+    runner.register("count", count_rows)
+    job = runner.submit("count", {"rows": 3})
+    runner.wait(job["job_id"], timeout=5)
+
+    finished = runner.repo.find_by_id(job["job_id"])
+    assert finished["status"] == "succeeded"
+    assert finished["progress"] == 1.0
+    assert finished["result"] == {"rows": 3}
+
+
+def test_running_job_can_be_cancelled(runner):
+    """Test cooperative cancellation of a running job."""
+    started = threading.Event()
+
+    def wait_forever(context, params):
+        started.set()
+        while True:
+            context.check_cancelled()
+            context.cancel_event.wait(0.01)
+
+    runner.register("wait", wait_forever)
+    job = runner.submit("wait")
+    assert started.wait(timeout=5)
+
+    runner.cancel(job["job_id"])
+    runner.wait(job["job_id"], timeout=5)
+
+    assert runner.repo.find_by_id(job["job_id"])["status"] == "cancelled"
+
+
+def test_failing_job_records_error(runner):
+    """Test that handler exceptions mark the job failed."""
+
+    def explode(context, params):
+        raise RuntimeError("boom")
+
+    runner.register("explode", explode)
+    job = runner.submit("explode")
+    runner.wait(job["job_id"], timeout=5)
+
+    failed = runner.repo.find_by_id(job["job_id"])
+    assert failed["status"] == "failed"
+    assert failed["error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_submitting_jobs_requires_admin(client):
+    """Test that job submission is rejected without an admin token."""
+    response = await client.post("/api/jobs", json={"jobType": "reseed"})
+    assert response.status_code == 403
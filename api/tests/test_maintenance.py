@@ -0,0 +1,84 @@
+import pytest
+
+from src.db import maintenance
+from src.db.connection import DatabaseConnection, connect, execute
+from src.db.maintenance import MaintenanceScheduler, MaintenanceTask
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Route the helpers through a WAL-mode file database with incremental auto_vacuum."""
+    previous = DatabaseConnection._instance, DatabaseConnection._pid, DatabaseConnection._test_mode
+    conn = connect(str(tmp_path / "maintenance.db"))
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE blobs (id INTEGER PRIMARY KEY, data BLOB)")
+    DatabaseConnection.use_connection(conn)
+
+    yield conn
+
+    conn.close()
+    DatabaseConnection._instance, DatabaseConnection._pid, DatabaseConnection._test_mode = previous
+
+
+def test_incremental_vacuum_releases_pages_freed_by_deletes(file_db):
+    """Test that free pages left by a large delete are returned to the filesystem."""
+    for _ in range(200):
+        execute("INSERT INTO blobs (data) VALUES (zeroblob(4096))")
+    execute("DELETE FROM blobs")
+
+    result = maintenance.incremental_vacuum(min_free_pages=10, step_pages=50)
+
+    assert result["released_pages"] > 100
+    assert file_db.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_checkpoint_truncates_the_wal(file_db):
+    """Test that a forced checkpoint empties the WAL file."""
+    execute("INSERT INTO blobs (data) VALUES (zeroblob(65536))")
+    assert maintenance.wal_size(file_db) > 0
+
+    result = maintenance.checkpoint_wal(force=True)
+
+    assert result["mode"] == "TRUNCATE"
+    assert result["wal_bytes"] == 0
+
+
+def test_stats_report_cache_hit_ratio(file_db, monkeypatch):
+    """Test the size, WAL and (opted in) page cache statistics."""
+    monkeypatch.setattr(maintenance, "DB_CACHE_STATS", True)
+    monkeypatch.setattr(maintenance, "_db_status", maintenance._load_db_status())
+    execute("INSERT INTO blobs (data) VALUES (zeroblob(4096))")
+    for _ in range(5):
+        file_db.execute("SELECT count(*) FROM blobs").fetchone()
+
+    stats = maintenance.collect_stats()
+
+    assert stats["auto_vacuum"] == "incremental"
+    assert stats["page_count"] > 0
+    if stats["cache_hits"] is not None:
+        assert 0 < stats["cache_hit_ratio"] <= 1
+
+
+def test_cache_counters_are_off_by_default():
+    """Test that nothing touches the connection's private layout unless DB_CACHE_STATS is set."""
+    assert maintenance._db_status is None
+    assert maintenance.collect_stats()["cache_hits"] is None
+
+
+def test_scheduler_runs_due_tasks_and_respects_leadership():
+    """Test that writing tasks only run in the leader process."""
+    now = [0.0]
+    runs = []
+    scheduler = MaintenanceScheduler(clock=lambda: now[0])
+    scheduler.add(MaintenanceTask("stats", 10, lambda: runs.append("stats") or {}, leader_only=False))
+    scheduler.add(MaintenanceTask("vacuum", 10, lambda: runs.append("vacuum") or {}))
+
+    now[0] = 11
+    assert scheduler.run_due() == ["stats"]
+
+    scheduler.leader = True
+    now[0] = 22
+    assert scheduler.run_due() == ["stats", "vacuum"]
+    assert scheduler.run_due() == []
+    assert runs == ["stats", "stats", "vacuum"]
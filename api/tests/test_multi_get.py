@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+
+import pytest
+
+from src.db import connection
+from src.db.connection import execute
+from src.repositories.orders_repo import get_orders_repository
+from src.repositories.products_repo import get_products_repository
+from src.utils.loader import loader_scope, prime, request_loader
+from src.utils.sql import id_chunks
+
+
+@pytest.fixture
+def product_queries(monkeypatch):
+    """Statements that read the products table, captured through the statement observers."""
+    seen = []
+
+    @contextmanager
+    def observe(sql):
+        if "FROM products" in sql:
+            seen.append(sql)
+        yield
+
+    monkeypatch.setattr(connection, "statement_observers", [observe])
+    return seen
+
+
+def test_id_chunks_pad_to_powers_of_two():
+    """Test chunk sizes and that padding only repeats ids already in the chunk."""
+    assert [len(chunk) for chunk in id_chunks(list(range(11)), chunk_size=4)] == [4, 4, 4]
+    assert list(id_chunks([5, 6, 7], chunk_size=4)) == [[5, 6, 7, 7]]
+    assert list(id_chunks([], chunk_size=4)) == []
+
+
+def test_find_by_ids_keeps_requested_order():
+    """Test order, de-duplication and missing ids, including archived orders."""
+    repo = get_products_repository()
+    assert [row["product_id"] for row in repo.find_by_ids([3, 1, 999999, 3])] == [3, 1]
+
+    order_id = execute("INSERT INTO orders (branch_id, order_date, name) VALUES (1, '2026-01-01', 'Multi')").lastrowid
+    archived_id = order_id + 1000
+    execute(
+        "INSERT INTO archive.orders (order_id, branch_id, order_date, name, status) "
+        "VALUES (?, 1, '2020-01-01', 'Archived', 'delivered')",
+        (archived_id,),
+    )
+    rows = get_orders_repository().find_by_ids([archived_id, order_id])
+    assert [row["order_id"] for row in rows] == [archived_id, order_id]
+
+
+@pytest.mark.asyncio
+async def test_list_routes_accept_ids(client):
+    """Test ?ids= on a list route and rejection of malformed lists."""
+    response = await client.get("/api/products?ids=4,2,999999")
+    assert response.status_code == 200
+    assert [product["productId"] for product in response.json()] == [4, 2]
+
+    response = await client.get("/api/branches?ids=1,two")
+    assert response.status_code == 400
+
+
+def test_loader_coalesces_and_memoizes(product_queries):
+    """Test that primed ids load with the first miss and are served from memory afterwards."""
+    repo = get_products_repository()
+    with loader_scope():
+        prime("product_id", [1, 2, 3])
+        assert [repo.find_by_id(product_id)["product_id"] for product_id in (1, 2, 3, 1)] == [1, 2, 3, 1]
+        assert repo.find_by_id(999999) is None
+        assert len(product_queries) == 2
+
+        execute("UPDATE products SET name = 'Renamed' WHERE product_id = 1")
+        assert repo.find_by_id(1)["name"] == "Renamed"
+        assert request_loader("product_id", repo._rows_by_ids).queries == 3
+
+    assert repo.find_by_id(2)["product_id"] == 2
+
+
+def test_loader_misses_do_not_query_the_archive_again(monkeypatch):
+    """Test that an order id missing from both tables costs one loader query, not one per lookup."""
+    seen = []
+
+    @contextmanager
+    def observe(sql):
+        if "orders" in sql and "order_details" not in sql:
+            seen.append(sql)
+        yield
+
+    monkeypatch.setattr(connection, "statement_observers", [observe])
+    repo = get_orders_repository()
+    with loader_scope():
+        assert repo.find_by_id(999999) is None
+        assert repo.find_by_id(999999) is None
+
+    # One read of the hot table and one of the archive, both through _rows_by_ids
+    assert len(seen) == 2
+    assert repo.find_by_id(999999) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_share_one_query(client, product_queries):
+    """Test that GETs of single products inside a batch are fetched together."""
+    operations = [{"method": "GET", "path": f"/api/products/{product_id}"} for product_id in (1, 2, 3, 4)]
+
+    response = await client.post("/api/batch", json={"operations": operations})
+
+    assert response.status_code == 200
+    assert [result["body"]["productId"] for result in response.json()["results"]] == [1, 2, 3, 4]
+    assert len(product_queries) == 1
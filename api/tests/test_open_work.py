@@ -0,0 +1,69 @@
+import pytest
+
+from src.db.connection import execute, fetch_all, fetch_one
+from src.repositories.deliveries_repo import get_deliveries_repository
+from src.repositories.orders_repo import get_orders_repository
+
+
+@pytest.fixture
+def branch_id():
+    """A branch with orders in every status."""
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (1, 'Open Work Branch')").lastrowid
+    for status in ["shipped", "pending", "delivered", "processing", "pending", "cancelled"]:
+        execute(
+            "INSERT INTO orders (branch_id, order_date, name, status) VALUES (?, '2026-02-01', ?, ?)",
+            (branch_id, status, status),
+        )
+    return branch_id
+
+
+@pytest.mark.parametrize("repo", [get_orders_repository(), get_deliveries_repository()], ids=["orders", "deliveries"])
+def test_open_queries_use_the_partial_index(repo):
+    """Test that the repository repeats the partial index's WHERE term, so the planner can use it."""
+    index = fetch_one(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql LIKE '%WHERE%'", (repo.table,)
+    )
+    assert " ".join(index["sql"].split()).endswith(f"WHERE {repo.open_condition}")
+
+    sql = f"SELECT * FROM {repo.table} WHERE {repo._status_condition(repo.open_statuses[0])} ORDER BY {repo.id_column}"
+    plan = " ".join(row["detail"] for row in fetch_all(f"EXPLAIN QUERY PLAN {sql}", (repo.open_statuses[0],)))
+    assert index["name"] in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_open_orders_by_status_then_id(client, branch_id):
+    """Test that closed orders are left out and open ones come back in workflow order."""
+    response = await client.get("/api/orders/open")
+    assert response.status_code == 200
+    mine = [order for order in response.json() if order["branchId"] == branch_id]
+    assert [order["status"] for order in mine] == ["pending", "pending", "processing", "shipped"]
+    assert mine[0]["orderId"] < mine[1]["orderId"]
+
+    response = await client.get("/api/orders/open", params={"status": "processing"})
+    assert {order["status"] for order in response.json()} == {"processing"}
+
+    response = await client.get("/api/orders/open", params={"status": "delivered"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_open_counts(client, branch_id):
+    """Test per-status counts of open work, zeros included."""
+    before = (await client.get("/api/deliveries/open/counts")).json()
+    assert set(before) == {"pending", "in_transit"}
+    execute("INSERT INTO deliveries (supplier_id, delivery_date, name, status) VALUES (1, '2026-02-02', 'Van', 'in_transit')")
+
+    after = (await client.get("/api/deliveries/open/counts")).json()
+    assert after == {**before, "in_transit": before["in_transit"] + 1}
+
+    counts = (await client.get("/api/orders/open/counts")).json()
+    assert list(counts) == ["pending", "processing", "shipped"]
+    assert counts["pending"] >= 2
+
+
+def test_final_statuses_are_still_found(branch_id):
+    """Test that lookups by a final status, outside the partial index, still work."""
+    delivered = [order for order in get_orders_repository().find_by_status("delivered") if order["branch_id"] == branch_id]
+
+    assert [order["name"] for order in delivered] == ["delivered"]
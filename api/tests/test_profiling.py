@@ -0,0 +1,107 @@
+import json
+import threading
+from collections import Counter
+
+import anyio.to_thread
+import pytest
+from fastapi import APIRouter
+
+from src.middleware import profiling
+from src.middleware.profiling import ProfileSession, profile_endpoints, summarize, write_collapsed
+from src.utils import admin
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    """Write profiles to a temporary directory and enable the admin token."""
+    monkeypatch.setattr(profiling, "PROFILE_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    return tmp_path
+
+
+def test_summary_attributes_samples_to_route_repository_and_sql():
+    """Test that samples are counted inclusively per route, repository method and statement."""
+    samples = Counter({
+        ("src.routes.product.get_products", "src.repositories.products_repo.ProductsRepository.find_all",
+         "SQL SELECT * FROM products"): 3,
+        ("src.routes.product.get_products", "pydantic.main.BaseModel.model_validate"): 1,
+    })
+
+    summary = summarize(samples)
+
+    assert summary["routes"] == {"src.routes.product.get_products": 4}
+    assert summary["repositories"] == {"src.repositories.products_repo.ProductsRepository.find_all": 3}
+    assert summary["sql"] == {"SELECT * FROM products": 3}
+
+
+def test_collapsed_stacks_are_rooted_at_the_route(profile_dir):
+    """Test the flamegraph.pl collapsed-stack format."""
+    path = profile_dir / "out.folded"
+    write_collapsed(path, "GET /api/products", Counter({("a", "b"): 2}))
+    assert path.read_text() == "GET /api/products;a;b 2\n"
+
+
+@pytest.mark.asyncio
+async def test_worker_threads_are_sampled_only_while_running_the_request(client):
+    """Test that a sync handler and a statement join the session from their worker thread, for exactly that call."""
+    run_sync = anyio.to_thread.run_sync
+    await client.get("/health")  # builds the middleware stack
+    assert anyio.to_thread.run_sync is run_sync
+
+    router = APIRouter()
+
+    @router.get("/joined")
+    def handler():
+        return threading.get_ident() in session.threads
+
+    def statement():
+        with profiling._profile_observer("SELECT 1"):
+            return threading.get_ident() in session.threads
+
+    profile_endpoints([router])
+    session = ProfileSession(interval=1.0)
+    token = profiling._current_session.set(session)
+    try:
+        joined = await anyio.to_thread.run_sync(router.routes[0].endpoint)
+        in_statement = await anyio.to_thread.run_sync(statement)
+        untouched = await anyio.to_thread.run_sync(lambda: threading.get_ident() in session.threads)
+    finally:
+        profiling._current_session.reset(token)
+
+    assert (joined, in_statement, untouched) == (True, True, False)
+    assert set(session.threads) == {threading.get_ident()}
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_admin_token(client, profile_dir):
+    """Test that non-admin callers cannot trigger profiling."""
+    response = await client.get("/api/products", headers={"X-Profile": "cpu"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(profile_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_writes_flamegraph_files(client, profile_dir):
+    """Test that an admin CPU profile produces collapsed, speedscope and summary files."""
+    response = await client.get("/api/products?__profile=cpu", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+
+    profile_id = response.headers["x-profile-id"]
+    names = {p.name for p in profile_dir.iterdir()}
+    assert {f"{profile_id}.folded", f"{profile_id}.speedscope.json", f"{profile_id}.summary.json"} <= names
+
+    speedscope = json.loads((profile_dir / f"{profile_id}.speedscope.json").read_text())
+    assert speedscope["profiles"][0]["name"] == "GET /api/products"
+
+    listing = await client.get("/api/admin/profiles", headers={"X-Admin-Token": "secret"})
+    assert listing.json()[0]["id"] == profile_id
+
+
+@pytest.mark.asyncio
+async def test_alloc_profile_records_route_hotspots(client, profile_dir):
+    """Test that allocation mode writes a report and aggregates hot spots per route."""
+    response = await client.get("/api/suppliers", headers={"X-Profile": "alloc", "X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert (profile_dir / f"{response.headers['x-profile-id']}.alloc.txt").exists()
+    assert "GET /api/suppliers" in profiling.allocation_hotspots
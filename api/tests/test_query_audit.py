@@ -0,0 +1,11 @@
+from src.db.query_audit import run_audit
+
+
+def test_repository_queries_use_indexes():
+    """Test that no repository query needs a full scan or a temp B-tree sort."""
+    report = run_audit()
+
+    failures = [f"{f.source}: {f.problems}" for f in report.findings if not f.ok]
+    assert failures == []
+    assert report.unindexed_foreign_keys == []
+    assert len(report.findings) > 0
@@ -0,0 +1,115 @@
+import pytest
+
+from src.db.connection import execute, fetch_one
+
+# The seed data has suppliers, headquarters, branches and products with id 1 but no orders
+# or deliveries; the `parents` fixture adds one of each for the tables that need them.
+ROUTES = {
+    "suppliers": (
+        "supplierId",
+        lambda ids: {"name": "Integration Supplier", "email": "it@example.com"},
+        {"name": "Renamed Supplier"},
+    ),
+    "headquarters": (
+        "headquartersId",
+        lambda ids: {"name": "Integration HQ", "address": "1 Test Way"},
+        {"name": "Renamed HQ"},
+    ),
+    "branches": (
+        "branchId",
+        lambda ids: {"headquartersId": 1, "name": "Integration Branch"},
+        {"name": "Renamed Branch"},
+    ),
+    "products": (
+        "productId",
+        lambda ids: {"supplierId": 1, "name": "Integration Part", "price": 2.5, "sku": "IT-0001", "unit": "each"},
+        {"price": 3.0},
+    ),
+    "orders": (
+        "orderId",
+        lambda ids: {"branchId": 1, "orderDate": "2026-05-01", "name": "Integration Order"},
+        {"name": "Renamed Order"},
+    ),
+    "order-details": (
+        "orderDetailId",
+        lambda ids: {"orderId": ids["order"], "productId": 1, "quantity": 4, "unitPrice": 2.5},
+        {"quantity": 5},
+    ),
+    "deliveries": (
+        "deliveryId",
+        lambda ids: {"supplierId": 1, "deliveryDate": "2026-05-02", "name": "Integration Delivery"},
+        {"name": "Renamed Delivery"},
+    ),
+    "order-detail-deliveries": (
+        "orderDetailDeliveryId",
+        lambda ids: {"orderDetailId": ids["order_detail"], "deliveryId": ids["delivery"], "quantity": 4},
+        {"quantity": 3},
+    ),
+}
+
+
+@pytest.fixture
+def parents():
+    order_id = execute(
+        "INSERT INTO orders (branch_id, order_date, name) VALUES (1, '2026-04-30', 'Parent Order')"
+    ).lastrowid
+    return {
+        "order": order_id,
+        "order_detail": execute(
+            "INSERT INTO order_details (order_id, product_id, quantity, unit_price) VALUES (?, 1, 4, 2.5)",
+            (order_id,),
+        ).lastrowid,
+        "delivery": execute(
+            "INSERT INTO deliveries (supplier_id, delivery_date, name) VALUES (1, '2026-04-30', 'Parent Delivery')"
+        ).lastrowid,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource", list(ROUTES))
+async def test_crud_round_trip(client, parents, resource):
+    """Test create, read, list, update and delete against the migrated, seeded database."""
+    id_key, create, update = ROUTES[resource]
+    payload = create(parents)
+
+    response = await client.post(f"/api/{resource}", json=payload)
+    assert response.status_code == 201
+    created = response.json()
+    assert {key: created[key] for key in payload} == payload
+    url = f"/api/{resource}/{created[id_key]}"
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.json() == created
+
+    response = await client.get(f"/api/{resource}")
+    assert response.status_code == 200
+    assert created[id_key] in [item[id_key] for item in response.json()]
+
+    response = await client.put(url, json=update)
+    assert response.status_code == 200
+    assert response.json() == {**created, **update}
+
+    response = await client.delete(url)
+    assert response.status_code == 204
+    assert (await client.get(url)).status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resource", list(ROUTES))
+async def test_missing_rows_are_not_found(client, resource):
+    """Test that every router answers 404 for an unknown id."""
+    id_key, _, update = ROUTES[resource]
+
+    assert (await client.get(f"/api/{resource}/999999")).status_code == 404
+    assert (await client.put(f"/api/{resource}/999999", json=update)).status_code == 404
+    assert (await client.delete(f"/api/{resource}/999999")).status_code == 404
+
+
+@pytest.mark.parametrize("attempt", [1, 2])
+def test_writes_are_rolled_back_between_tests(attempt):
+    """Test that a row written by one test is gone in the next, while the seed data stays."""
+    assert fetch_one("SELECT 1 FROM suppliers WHERE name = 'Leaked Supplier'") is None
+    assert fetch_one("SELECT count(*) AS count FROM suppliers")["count"] == 3
+
+    execute("INSERT INTO suppliers (name) VALUES ('Leaked Supplier')")
@@ -0,0 +1,44 @@
+
+import pytest
+
+from src.db.connection import execute, fetch_all, fetch_one
+from src.db.rows import Rows
+
+
+@pytest.fixture(autouse=True)
+def suppliers():
+    """Create two suppliers in the in-memory database."""
+    execute("DELETE FROM suppliers")
+    execute("INSERT INTO suppliers (supplier_id, name, active, verified) VALUES (1, 'Alpha', 1, 0), (2, 'Beta', 0, 1)")
+
+
+def test_dict_rows_are_the_default():
+    """Test that the helpers keep returning plain dicts by default."""
+    assert fetch_one("SELECT supplier_id, name FROM suppliers WHERE supplier_id = 1") == {"supplier_id": 1, "name": "Alpha"}
+
+
+def test_tuple_rows_share_one_column_index():
+    """Test the compact tuple format."""
+    rows = fetch_all("SELECT supplier_id, name FROM suppliers ORDER BY supplier_id", row_format="tuple")
+
+    assert isinstance(rows, Rows)
+    assert rows.columns == ("supplier_id", "name")
+    assert rows[1] == (2, "Beta")
+    assert rows.value(rows[0], "name") == "Alpha"
+    assert rows.column("supplier_id") == [1, 2]
+    assert rows.as_dicts()[0] == {"supplier_id": 1, "name": "Alpha"}
+
+
+def test_records_have_attribute_access():
+    """Test that record rows are namedtuples named after the table."""
+    records = fetch_all("SELECT supplier_id, name FROM suppliers ORDER BY supplier_id", row_format="record", name="suppliers")
+
+    assert type(records[0]).__name__ == "SuppliersRecord"
+    assert records[0].name == "Alpha"
+    assert records[0]._asdict() == {"supplier_id": 1, "name": "Alpha"}
+
+
+def test_bool_converter():
+    """Test the converter applied through column-name type hints."""
+    row = fetch_one('SELECT active AS "active [bool]", verified AS "verified [bool]" FROM suppliers WHERE supplier_id = 2')
+    assert row == {"active": False, "verified": True}
@@ -0,0 +1,73 @@
+import pytest
+
+from src.db.connection import execute
+from src.repositories.search_repo import get_search_repository
+from src.repositories.suppliers_repo import get_suppliers_repository
+
+
+def _found(q: str, types: list[str] | None = None) -> set[tuple[str, int]]:
+    return {(result["type"], result["id"]) for result in get_search_repository().search(q, types)}
+
+
+@pytest.mark.asyncio
+async def test_search_tolerates_typos_and_ranks_best_match_first(client):
+    """Test that misspelled queries still find the row, with the closest name ranked first."""
+    for q in ("whiskrware", "WhiskerWear", "whiskerware sytems"):
+        response = await client.get("/api/search", params={"q": q})
+        assert response.status_code == 200
+        results = response.json()
+        assert results[0]["type"] == "suppliers"
+        assert results[0]["name"] == "WhiskerWare Systems"
+        assert 0 < results[0]["score"] <= 1
+        assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+    # Contacts and emails are searched too
+    response = await client.get("/api/search", params={"q": "Catherine Purston"})
+    assert response.json()[0] == {
+        "type": "headquarters",
+        "id": 1,
+        "name": "CatTech Global HQ",
+        "contactPerson": "Catherine Purrston",
+        "email": "catherine@octocat.com",
+        "score": response.json()[0]["score"],
+    }
+    response = await client.get("/api/search", params={"q": "qqqzzzxxx"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_types_filter_and_validation(client):
+    """Test the types filter, and 422/400 for a short query or an unknown type."""
+    assert {kind for kind, _ in _found("whisker")} == {"suppliers", "branches"}
+    assert {kind for kind, _ in _found("whisker", ["branches"])} == {"branches"}
+    response = await client.get("/api/search", params={"q": "whisker", "types": "suppliers,headquarters"})
+    assert {r["type"] for r in response.json()} <= {"suppliers", "headquarters"}
+    assert response.json()
+
+    assert (await client.get("/api/search", params={"q": "ab"})).status_code == 422
+    response = await client.get("/api/search", params={"q": "whisker", "types": "suppliers,planets"})
+    assert response.status_code == 400
+    assert "planets" in response.json()["detail"]
+
+
+def test_triggers_keep_search_index_in_sync():
+    """Test that inserts, renames, deletes and cascaded deletes update the index."""
+    supplier_id = execute("INSERT INTO suppliers (name, email) VALUES ('Zanzibar Kibble Co', 'z@kibble.test')").lastrowid
+    hq_id = execute("INSERT INTO headquarters (name) VALUES ('Quokka Holdings')").lastrowid
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (?, 'Quokka North')", (hq_id,)).lastrowid
+    assert ("suppliers", supplier_id) in _found("zanzibar")
+    assert _found("quokka") == {("headquarters", hq_id), ("branches", branch_id)}
+
+    execute("UPDATE suppliers SET name = 'Mombasa Kibble Co' WHERE supplier_id = ?", (supplier_id,))
+    assert ("suppliers", supplier_id) not in _found("zanzibar")
+    assert ("suppliers", supplier_id) in _found("mombasa")
+    # Unindexed columns leave the entry alone
+    execute("UPDATE suppliers SET description = 'x' WHERE supplier_id = ?", (supplier_id,))
+    assert ("suppliers", supplier_id) in _found("mombasa")
+    assert [s["supplier_id"] for s in get_suppliers_repository().find_by_name("MOMBASA")] == [supplier_id]
+
+    execute("DELETE FROM suppliers WHERE supplier_id = ?", (supplier_id,))
+    assert _found("mombasa") == set()
+    # Branches go with their headquarters through ON DELETE CASCADE
+    execute("DELETE FROM headquarters WHERE headquarters_id = ?", (hq_id,))
+    assert _found("quokka") == set()
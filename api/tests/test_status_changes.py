@@ -0,0 +1,124 @@
+import pytest
+
+from src.db.connection import execute, fetch_one
+
+
+@pytest.fixture
+def supplier_id():
+    return execute("INSERT INTO suppliers (name) VALUES ('Status Supplier')").lastrowid
+
+
+def _delivery(supplier_id: int, status: str) -> int:
+    return execute(
+        "INSERT INTO deliveries (supplier_id, delivery_date, name, status) VALUES (?, '2026-03-01', 'Truck', ?)",
+        (supplier_id, status),
+    ).lastrowid
+
+
+def _status(delivery_id: int) -> str:
+    return fetch_one("SELECT status FROM deliveries WHERE delivery_id = ?", (delivery_id,))["status"]
+
+
+@pytest.mark.asyncio
+async def test_ids_change_only_rows_allowed_to_transition(client, supplier_id):
+    """Test that rows in a status that cannot move to the target are skipped and reported."""
+    moving = [_delivery(supplier_id, "in_transit") for _ in range(3)]
+    done = _delivery(supplier_id, "delivered")
+
+    response = await client.post(
+        "/api/deliveries/status", json={"status": "delivered", "ids": [*moving, done, 999999]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updatedIds"] == moving
+    assert body["skipped"] == [{"id": done, "status": "delivered"}, {"id": 999999, "status": None}]
+    assert all(_status(delivery_id) == "delivered" for delivery_id in moving)
+
+
+@pytest.mark.asyncio
+async def test_filter_changes_every_matching_row(client, supplier_id, monkeypatch):
+    """Test filter-based changes across several chunks, narrowed by fromStatus."""
+    monkeypatch.setattr("src.repositories.base_repo.STATUS_CHANGE_CHUNK_SIZE", 2)
+    monkeypatch.setattr("src.utils.status_changes.STATUS_CHANGE_CHUNK_SIZE", 2)
+    pending = [_delivery(supplier_id, "pending") for _ in range(5)]
+    in_transit = _delivery(supplier_id, "in_transit")
+
+    response = await client.post(
+        "/api/deliveries/status",
+        json={"status": "cancelled", "fromStatus": "pending", "filter": {"supplierId": supplier_id}},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updatedIds"] == pending
+    assert _status(in_transit) == "in_transit"
+
+
+@pytest.mark.asyncio
+async def test_orders_follow_their_delivery(client, supplier_id):
+    """Test moving the orders linked to a delivery in one call."""
+    delivery_id = _delivery(supplier_id, "delivered")
+    hq_id = execute("INSERT INTO headquarters (name) VALUES ('Status HQ')").lastrowid
+    branch_id = execute("INSERT INTO branches (headquarters_id, name) VALUES (?, 'Status Branch')", (hq_id,)).lastrowid
+    product_id = execute(
+        "INSERT INTO products (supplier_id, name, price, sku, unit) VALUES (?, 'Box', 1.0, ?, 'each')",
+        (supplier_id, f"STS-{supplier_id}"),
+    ).lastrowid
+    order_ids = []
+    for _ in range(2):
+        order_id = execute(
+            "INSERT INTO orders (branch_id, order_date, name, status) VALUES (?, '2026-03-01', 'Order', 'shipped')",
+            (branch_id,),
+        ).lastrowid
+        detail_id = execute(
+            "INSERT INTO order_details (order_id, product_id, quantity, unit_price) VALUES (?, ?, 1, 1.0)",
+            (order_id, product_id),
+        ).lastrowid
+        execute(
+            "INSERT INTO order_detail_deliveries (order_detail_id, delivery_id, quantity) VALUES (?, ?, 1)",
+            (detail_id, delivery_id),
+        )
+        order_ids.append(order_id)
+
+    response = await client.post("/api/orders/status", json={"status": "delivered", "filter": {"deliveryId": delivery_id}})
+
+    assert response.status_code == 200
+    assert response.json()["updatedIds"] == order_ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"status": "teleported", "ids": [1]},
+        {"status": "pending", "ids": [1]},
+        {"status": "delivered", "fromStatus": "pending", "ids": [1]},
+        {"status": "delivered"},
+        {"status": "delivered", "ids": [1], "filter": {"supplierId": 1}},
+    ],
+)
+async def test_invalid_changes_are_rejected(client, supplier_id, payload):
+    """Test unknown statuses, disallowed transitions and missing or conflicting selectors."""
+    response = await client.post("/api/deliveries/status", json=payload)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_and_update_only_accept_workflow_statuses(client, supplier_id):
+    """Test that rows can only be stored in a status the transition endpoints can move."""
+    delivery = {"supplierId": supplier_id, "deliveryDate": "2026-03-01", "name": "Truck"}
+    for status in ("Shipped", "open", "in transit"):
+        response = await client.post("/api/deliveries", json={**delivery, "status": status})
+        assert response.status_code == 422, status
+
+    response = await client.post("/api/deliveries", json={**delivery, "status": "in_transit"})
+    assert response.status_code == 201
+    delivery_id = response.json()["deliveryId"]
+
+    response = await client.put(f"/api/deliveries/{delivery_id}", json={"status": "Delivered"})
+    assert response.status_code == 422
+
+    order = {"branchId": 1, "orderDate": "2026-03-01", "name": "Kibble", "status": "open"}
+    response = await client.post("/api/orders", json=order)
+    assert response.status_code == 422
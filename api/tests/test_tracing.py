@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.db.connection import statement_observers
+from src.main import ROUTERS, create_app
+from src.middleware.tracing import install_tracing
+from src.settings import Settings
+from src.utils import tracing
+from src.utils.tracing import FileSink, SpanExporter, parse_traceparent
+
+PARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def traced_client(tmp_path):
+    """A client for an app traced at `sample_rate`, and a reader for the spans it exported."""
+
+    def make(sample_rate: float = 1.0) -> AsyncClient:
+        app = create_app(Settings(run_migrations=False, seed_database=False))
+        exporter = SpanExporter(FileSink(str(tmp_path / "spans.jsonl")))
+        install_tracing(app, [module.router for module in ROUTERS], exporter, sample_rate)
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    def spans() -> list[dict]:
+        tracing.exporter.flush()
+        path = tmp_path / "spans.jsonl"
+        if not path.exists():
+            return []
+        return [
+            span
+            for line in path.read_text().splitlines()
+            for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        ]
+
+    yield make, spans
+
+    tracing.exporter = None
+    if tracing.statement_span in statement_observers:
+        statement_observers.remove(tracing.statement_span)
+
+
+def test_traceparent_parsing():
+    """Test W3C traceparent validation and the sampled flag."""
+    assert parse_traceparent(PARENT) == ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    assert parse_traceparent(PARENT[:-2] + "00")[2] is False
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("ff" + PARENT[2:]) is None
+    assert parse_traceparent("garbage") is None
+
+
+@pytest.mark.asyncio
+async def test_update_request_is_traced_down_to_each_statement(traced_client):
+    """Test that one request yields request, dependency, repository and SQL spans in one tree."""
+    make, spans = traced_client
+    client = make()
+
+    response = await client.put("/api/products/1", json={"name": "Traced Feeder"}, headers={"traceparent": PARENT})
+    assert response.status_code == 200
+    trace_id, span_id, _ = parse_traceparent(response.headers["traceparent"])
+
+    exported = spans()
+    assert {span["traceId"] for span in exported} == {trace_id} == {"4bf92f3577b34da6a3ce929d0e0e4736"}
+    by_id = {span["spanId"]: span for span in exported}
+    request = by_id[span_id]
+    assert request["name"] == "PUT /api/products/{product_id}"
+    assert request["parentSpanId"] == "00f067aa0ba902b7"
+
+    def children(parent: dict) -> list[dict]:
+        return sorted((s for s in exported if s["parentSpanId"] == parent["spanId"]), key=lambda s: s["startTimeUnixNano"])
+
+    assert [s["name"] for s in children(request)] == ["Depends get_products_repository", "ProductsRepository.update"]
+    update = children(request)[1]
+    # update = find, UPDATE, find: the statements are attributed to the nested calls
+    assert [s["name"] for s in children(update)] == [
+        "ProductsRepository.find_by_id", "SQL UPDATE", "ProductsRepository.find_by_id"
+    ]
+    statement = children(children(update)[0])[0]
+    attributes = {a["key"]: a["value"]["stringValue"] for a in statement["attributes"]}
+    assert attributes["db.statement"].startswith("SELECT")
+    assert statement["kind"] == tracing.SPAN_KIND_CLIENT
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_export_nothing(traced_client):
+    """Test that the caller's unsampled flag and a zero sample rate both leave requests untraced."""
+    make, spans = traced_client
+    client = make(sample_rate=0.0)
+
+    response = await client.get("/api/products")
+    assert "traceparent" not in response.headers
+    response = await client.get("/api/products", headers={"traceparent": PARENT[:-2] + "00"})
+    assert "traceparent" not in response.headers
+    assert spans() == []
+
+    # A sampled parent is honoured whatever the local rate
+    response = await client.get("/api/products", headers={"traceparent": PARENT})
+    assert "traceparent" in response.headers
+    assert spans()